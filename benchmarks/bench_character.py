@@ -0,0 +1,125 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark: Character record vs plain dict
+
+Compares memory per character and stat access throughput for the
+slotted Character record and the 12-key dict create_character used to
+build, and the time of a headless battle (which reads the character's
+stats through attributes when it is a Character) with either form.
+Memory is measured for new characters and for characters holding a few
+items and quests.
+
+Run from the project root:
+    python benchmarks/bench_character.py
+"""
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import combat_system
+
+COUNT = 10000
+BATTLES = 5000
+ACTIONS = ["attack"] * 50
+
+def make_dict(i):
+    """Build a character the way create_character used to"""
+    return {
+        "name": f"Hero{i}",
+        "class": "Warrior",
+        "level": 1,
+        "health": 120,
+        "max_health": 120,
+        "strength": 15,
+        "magic": 5,
+        "experience": 0,
+        "gold": 100,
+        "inventory": [],
+        "active_quests": [],
+        "completed_quests": []
+    }
+
+def make_record(i):
+    """Build a Character record with the same fields"""
+    return character_manager.Character(make_dict(i))
+
+def played(factory):
+    """Wrap a factory so each character holds some items and quests"""
+    def make(i):
+        character = factory(i)
+        character["inventory"].extend(["health_potion", "health_potion", "iron_sword"])
+        character["active_quests"].append("dragon_slayer")
+        character["completed_quests"].extend(["first_steps", "goblin_hunter"])
+        return character
+    return make
+
+def bytes_per_character(factory):
+    """Measure the average traced allocation per character"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    characters = [factory(i) for i in range(COUNT)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del characters
+    return (after - before) / COUNT
+
+def accesses_per_second(statement, character):
+    """Time a stat access statement and return accesses per second"""
+    number = 1000000
+    seconds = timeit.timeit(statement, globals={"c": character}, number=number)
+    return number / seconds
+
+def battle_microseconds(characters, repeat=15):
+    """
+    Best time of one headless orc battle for each character, in microseconds
+    
+    The runs for the characters are interleaved so that noise from other
+    processes hits them alike.
+    """
+    def battle(character):
+        character["health"] = character["max_health"]
+        enemy = combat_system.create_enemy("orc")
+        combat_system.run_headless_battle(character, enemy, ACTIONS, seed=1)
+
+    best = [None] * len(characters)
+    for _ in range(repeat):
+        for i, character in enumerate(characters):
+            elapsed = timeit.timeit(lambda: battle(character), number=BATTLES)
+            best[i] = elapsed if best[i] is None else min(best[i], elapsed)
+    return [elapsed / BATTLES * 1e6 for elapsed in best]
+
+if __name__ == "__main__":
+    print("=== CHARACTER RECORD BENCHMARK ===")
+    print(f"Characters: {COUNT}")
+
+    for label, dict_factory, record_factory in [
+        ("new", make_dict, make_record),
+        ("with items and quests", played(make_dict), played(make_record))
+    ]:
+        dict_bytes = bytes_per_character(dict_factory)
+        record_bytes = bytes_per_character(record_factory)
+        print(f"\n{label}:")
+        print(f"  dict:      {dict_bytes:8.0f} bytes/character")
+        print(f"  Character: {record_bytes:8.0f} bytes/character "
+              f"({dict_bytes / record_bytes:.2f}x smaller)")
+    print()
+
+    plain = make_dict(0)
+    record = make_record(0)
+    rows = [
+        ("dict['health']", accesses_per_second("c['health']", plain)),
+        ("Character['health']", accesses_per_second("c['health']", record)),
+        ("Character.health", accesses_per_second("c.health", record))
+    ]
+    for label, rate in rows:
+        print(f"{label:22} {rate / 1e6:6.1f} M accesses/s")
+
+    dict_battle, record_battle = battle_microseconds([make_dict(0), make_record(0)])
+    print(f"\nHeadless battle, dict:      {dict_battle:6.2f} us")
+    print(f"Headless battle, Character: {record_battle:6.2f} us "
+          f"({dict_battle / record_battle:.2f}x)")
@@ -0,0 +1,80 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark: CatalogWatcher reload vs a full load
+
+Edits one block of a large quest file and compares picking up the change
+with CatalogWatcher.poll (which only parses blocks it has not seen) with
+loading the whole file again, then times a poll of an unchanged file.
+Also compares starting a watcher from a fresh compiled cache with
+load_quests(use_cache=True).
+
+Run from the project root:
+    python benchmarks/bench_hot_reload.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from bench_parallel_catalog import write_quest_file
+
+QUESTS = 200000
+EDITS = 3
+
+def edit_one_quest(filename, n):
+    """Change one quest's title and move the file's mtime forward"""
+    with open(filename, encoding="utf-8") as f:
+        text = f.read()
+    text = text.replace(f"TITLE: Quest number {n}\n", f"TITLE: Edited quest {n}\n", 1)
+    stat = os.stat(filename)
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+
+def timed(call):
+    """Run call; returns (result, seconds)"""
+    start = time.perf_counter()
+    result = call()
+    return result, time.perf_counter() - start
+
+if __name__ == "__main__":
+    print("=== HOT RELOAD BENCHMARK ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "quests.txt")
+        write_quest_file(filename, QUESTS)
+        print(f"{QUESTS} quests, {os.path.getsize(filename) / (1 << 20):.1f} MB, "
+              f"one block edited per reload\n")
+
+        _, full = timed(lambda: game_data.load_quests(filename))
+        watcher, first = timed(lambda: game_data.CatalogWatcher(filename))
+        print(f"load_quests          {full:6.2f} s")
+        print(f"CatalogWatcher()     {first:6.2f} s")
+
+        for n in range(EDITS):
+            edit_one_quest(filename, n * 1000)
+            diff, elapsed = timed(watcher.poll)
+            print(f"poll after edit      {elapsed:6.2f} s  "
+                  f"({len(diff.changed)} changed)")
+
+        _, idle = timed(watcher.poll)
+        print(f"poll, no change      {idle * 1e6:6.1f} us\n")
+
+        # Both runs write the cache; time the second, warm start
+        game_data.load_quests(filename, use_cache=True)
+        game_data.CatalogWatcher(filename, use_cache=True)
+        _, cached = timed(lambda: game_data.load_quests(filename, use_cache=True))
+        watcher, cached_watcher = timed(
+            lambda: game_data.CatalogWatcher(filename, use_cache=True)
+        )
+        print(f"load_quests, cached  {cached:6.2f} s")
+        print(f"watcher, cached      {cached_watcher:6.2f} s")
+
+        edit_one_quest(filename, 7)
+        diff, elapsed = timed(watcher.poll)
+        print(f"poll after edit      {elapsed:6.2f} s  "
+              f"({len(diff.changed)} changed)")
@@ -0,0 +1,128 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark: use_item and equip_weapon with pre-parsed item effects
+
+Times use_item and an equip/unequip cycle with items from load_items,
+whose effects are parsed ItemEffect objects, against the previous code
+path, which split the "stat:value" string and called int() on every use
+(reproduced here with parse_item_effect and apply_stat_effect). The
+last line times only applying and taking back the effect, without the
+inventory and character bookkeeping around it.
+
+Run from the project root:
+    python benchmarks/bench_item_effects.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import game_data
+import inventory_system
+
+USES = 50000
+REPEAT = 9
+
+def use_item_reparsing(character, item_id, item_data):
+    """use_item as it was before effects were parsed at load"""
+    if not inventory_system.has_item(character, item_id):
+        raise inventory_system.ItemNotFoundError(f"{item_id} not found in inventory.")
+    if item_data["type"] != "consumable":
+        raise inventory_system.InvalidItemTypeError(f"{item_id} is not a consumable.")
+    stat, value = inventory_system.parse_item_effect(item_data["effect"])
+    inventory_system.apply_stat_effect(character, stat, value)
+    inventory_system.remove_item_from_inventory(character, item_id)
+    return f"Used {item_data.get('name', item_id)} and gained {value} {stat}."
+
+def equip_cycle_reparsing(character, item_id, item_data):
+    """equip_weapon then unequip_weapon as they were, parsing the string twice"""
+    if not inventory_system.has_item(character, item_id):
+        raise inventory_system.ItemNotFoundError(f"{item_id} not found.")
+    if item_data["type"] != "weapon":
+        raise inventory_system.InvalidItemTypeError(f"{item_id} is not a weapon.")
+    stat, value = inventory_system.parse_item_effect(item_data["effect"])
+    inventory_system.apply_stat_effect(character, stat, value)
+    character["equipped_weapon"] = item_id
+    inventory_system.remove_item_from_inventory(character, item_id)
+
+    weapon_data = character["item_data"][character["equipped_weapon"]]
+    stat, value = inventory_system.parse_item_effect(weapon_data["effect"])
+    inventory_system.apply_stat_effect(character, stat, -value)
+    if inventory_system.get_inventory_space_remaining(character) == 0:
+        raise inventory_system.InventoryFullError("No space to unequip weapon.")
+    inventory_system.add_item_to_inventory(character, item_id)
+    character["equipped_weapon"] = None
+
+def equip_cycle(character, item_id, item_data):
+    """equip_weapon followed by unequip_weapon"""
+    inventory_system.equip_weapon(character, item_id, item_data)
+    inventory_system.unequip_weapon(character)
+
+def time_uses(use, item_id, item_data):
+    """Microseconds per use_item call, inventory refill included"""
+    character = character_manager.create_character("Bench", "Warrior")
+    character["max_health"] = 10 ** 9
+
+    def step():
+        inventory_system.add_item_to_inventory(character, item_id)
+        use(character, item_id, item_data)
+
+    return min(timeit.repeat(step, number=USES, repeat=REPEAT)) / USES * 1e6
+
+def time_equips(cycle, item_id, items):
+    """Microseconds per equip/unequip cycle"""
+    character = character_manager.create_character("Bench", "Warrior")
+    character["item_data"] = items
+    inventory_system.add_item_to_inventory(character, item_id)
+    item_data = items[item_id]
+    return min(timeit.repeat(
+        lambda: cycle(character, item_id, item_data), number=USES, repeat=REPEAT
+    )) / USES * 1e6
+
+def time_effect_only():
+    """Microseconds to apply and take back a weapon effect on a plain dict"""
+    character = {"strength": 10}
+    text = "strength:5"
+    effect = game_data.parse_effect(text)
+
+    def reparsing():
+        stat, value = inventory_system.parse_item_effect(text)
+        inventory_system.apply_stat_effect(character, stat, value)
+        stat, value = inventory_system.parse_item_effect(text)
+        inventory_system.apply_stat_effect(character, stat, -value)
+
+    def preparsed():
+        inventory_system.apply_item_effect(character, effect)
+        inventory_system.apply_item_effect(character, effect, -1)
+
+    return [min(timeit.repeat(run, number=USES, repeat=REPEAT)) / USES * 1e6
+            for run in (reparsing, preparsed)]
+
+def with_text_effects(items):
+    """Copy of an item catalog with each effect back in its string form"""
+    return {
+        item_id: dict(item, effect=str(item["effect"])) for item_id, item in items.items()
+    }
+
+if __name__ == "__main__":
+    print("=== ITEM EFFECT BENCHMARK ===")
+    items = game_data.load_items("data/items.txt")
+    text_items = with_text_effects(items)
+    print(f"{USES} calls each, best of {REPEAT}\n")
+
+    before = time_uses(use_item_reparsing, "health_potion", text_items["health_potion"])
+    after = time_uses(inventory_system.use_item, "health_potion", items["health_potion"])
+    print(f"use_item, parse string    {before:6.2f} us")
+    print(f"use_item, ItemEffect      {after:6.2f} us  ({before / after:.2f}x)")
+
+    before = time_equips(equip_cycle_reparsing, "iron_sword", text_items)
+    after = time_equips(equip_cycle, "iron_sword", items)
+    print(f"equip+unequip, parse      {before:6.2f} us")
+    print(f"equip+unequip, ItemEffect {after:6.2f} us  ({before / after:.2f}x)")
+
+    before, after = time_effect_only()
+    print(f"effect only, parse        {before:6.2f} us")
+    print(f"effect only, ItemEffect   {after:6.2f} us  ({before / after:.2f}x)")
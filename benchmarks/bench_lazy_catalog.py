@@ -0,0 +1,70 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark: LazyCatalog vs load_quests
+
+Compares opening a large quest file as a LazyCatalog with loading it
+into a dict: time to open, memory held afterwards (tracemalloc), and
+the cost of a first and a cached lookup.
+
+Run from the project root:
+    python benchmarks/bench_lazy_catalog.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from bench_parallel_catalog import write_quest_file
+
+QUESTS = 200000
+LOOKUPS = 50
+
+def measure(load):
+    """
+    Run load twice: once timed, once under tracemalloc
+    
+    Returns: (result, seconds, bytes still allocated by the result)
+    """
+    start = time.perf_counter()
+    load()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    result = load()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, current
+
+if __name__ == "__main__":
+    print("=== LAZY CATALOG BENCHMARK ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "quests.txt")
+        write_quest_file(filename, QUESTS)
+        print(f"{QUESTS} quests, {os.path.getsize(filename) / (1 << 20):.1f} MB\n")
+
+        eager, eager_time, eager_memory = measure(lambda: game_data.load_quests(filename))
+        del eager
+        lazy, lazy_time, lazy_memory = measure(
+            lambda: game_data.load_quests(filename, lazy=True)
+        )
+
+        print(f"load_quests   {eager_time:6.2f} s  {eager_memory / (1 << 20):7.1f} MB")
+        print(f"LazyCatalog   {lazy_time:6.2f} s  {lazy_memory / (1 << 20):7.1f} MB")
+
+        step = QUESTS // LOOKUPS
+        ids = [f"quest_{i}" for i in range(0, QUESTS, step)]
+        start = time.perf_counter()
+        for quest_id in ids:
+            lazy[quest_id]
+        first = (time.perf_counter() - start) / len(ids)
+        cached = timeit.timeit(lambda: lazy[ids[0]], number=100000) / 100000
+
+        print(f"\nFirst lookup  {first * 1e6:7.1f} us")
+        print(f"Cached lookup {cached * 1e6:7.2f} us")
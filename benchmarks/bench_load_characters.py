@@ -0,0 +1,72 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark: Bulk character loading
+
+Writes COUNT synthetic save files and times loading all of them with a
+plain load_character loop, with load_characters on a thread pool, and
+with load_characters on a process pool.
+
+Run from the project root:
+    python benchmarks/bench_load_characters.py [count]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+COUNT = 50000
+
+def write_saves(save_directory, count):
+    """Write count save files directly (no fsync, to keep setup quick)"""
+    names = []
+    for i in range(count):
+        character = character_manager.create_character(f"Hero{i}", "Mage")
+        character["inventory"].extend(["health_potion"] * (i % 5))
+        character["completed_quests"].extend(f"quest_{q}" for q in range(i % 20))
+        filename = os.path.join(save_directory, f"Hero{i}_save.txt")
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(character_manager._format_save_text(character))
+        names.append(character["name"])
+    return names
+
+def timed(label, load, names):
+    """Run load(names), check every character loaded, and print the rate"""
+    start = time.perf_counter()
+    loaded = load(names)
+    elapsed = time.perf_counter() - start
+    assert loaded == len(names)
+    print(f"{label:24} {elapsed:6.2f} s ({len(names) / elapsed:8.0f} saves/s)")
+    return elapsed
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else COUNT
+    print("=== BULK LOAD BENCHMARK ===")
+    print(f"Save files: {count}, CPUs: {os.cpu_count()}")
+
+    with tempfile.TemporaryDirectory() as save_directory:
+        names = write_saves(save_directory, count)
+
+        def sequential(names):
+            return sum(1 for name in names
+                       if character_manager.load_character(name, save_directory))
+
+        def threads(names):
+            return sum(1 for _, character, _ in
+                       character_manager.load_characters(names, save_directory)
+                       if character is not None)
+
+        def processes(names):
+            return sum(1 for _, character, _ in
+                       character_manager.load_characters(
+                           names, save_directory, use_processes=True)
+                       if character is not None)
+
+        base = timed("load_character loop", sequential, names)
+        timed("load_characters threads", threads, names)
+        elapsed = timed("load_characters processes", processes, names)
+        print(f"process pool speedup: {base / elapsed:.2f}x")
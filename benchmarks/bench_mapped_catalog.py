@@ -0,0 +1,92 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark: Memory per worker, dict catalog vs MappedCatalog
+
+Starts WORKERS fresh processes that each open the same quest catalog,
+either with load_quests (a private dict of dicts) or with
+open_mapped_catalog (a shared memory map), and look up LOOKUPS random
+quests. Each worker reports how much its RSS, PSS (shared pages split
+between the processes using them) and private memory grew, read from
+/proc/self/smaps_rollup, so this needs Linux.
+
+Run from the project root:
+    python benchmarks/bench_mapped_catalog.py
+"""
+
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from bench_parallel_catalog import write_quest_file
+
+QUESTS = 200000
+WORKERS = 4
+LOOKUPS = 1000
+
+def memory_kb():
+    """Get (rss, pss, private) of this process in kB"""
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                values[parts[0].rstrip(":")] = int(parts[1])
+    private = values["Private_Clean"] + values["Private_Dirty"]
+    return values["Rss"], values["Pss"], private
+
+def worker(filename, mapped, barrier, seed):
+    """Open the catalog, do random lookups, report memory growth"""
+    before = memory_kb()
+    start = time.perf_counter()
+    if mapped:
+        catalog = game_data.open_mapped_catalog(filename)
+    else:
+        catalog = game_data.load_quests(filename)
+    opened = time.perf_counter() - start
+
+    rng = random.Random(seed)
+    for _ in range(LOOKUPS):
+        catalog[f"quest_{rng.randrange(QUESTS)}"]
+
+    # Measure while every worker holds its catalog
+    barrier.wait()
+    after = memory_kb()
+    barrier.wait()
+    return opened, [a - b for a, b in zip(after, before)]
+
+def run(filename, mapped):
+    """Run WORKERS workers; returns their results"""
+    context = multiprocessing.get_context("spawn")
+    with context.Manager() as manager:
+        barrier = manager.Barrier(WORKERS)
+        with context.Pool(WORKERS) as pool:
+            return pool.starmap(
+                worker, [(filename, mapped, barrier, seed) for seed in range(WORKERS)]
+            )
+
+if __name__ == "__main__":
+    print("=== MAPPED CATALOG BENCHMARK ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "quests.txt")
+        write_quest_file(filename, QUESTS)
+        game_data.open_mapped_catalog(filename).close()
+        compiled = os.path.getsize(filename + game_data.MAPPED_CATALOG_SUFFIX)
+        print(f"{QUESTS} quests, text {os.path.getsize(filename) / (1 << 20):.1f} MB, "
+              f"compiled {compiled / (1 << 20):.1f} MB, {WORKERS} workers, "
+              f"{LOOKUPS} lookups each\n")
+
+        print("catalog        open s   RSS MB   PSS MB   private MB   (growth per worker)")
+        for label, mapped in [("dict", False), ("MappedCatalog", True)]:
+            results = run(filename, mapped)
+            opened = sum(result[0] for result in results) / WORKERS
+            rss, pss, private = (
+                sum(result[1][i] for result in results) / WORKERS / 1024 for i in range(3)
+            )
+            print(f"{label:13} {opened:7.3f} {rss:8.1f} {pss:8.1f} {private:12.1f}")
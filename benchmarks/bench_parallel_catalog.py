@@ -0,0 +1,69 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark: Sequential vs parallel catalog loading
+
+Writes a quest file with QUESTS blocks and times load_quests against
+load_quests_parallel with different worker counts. The speedup is bound
+by the number of CPUs and by pickling the records back to the parent.
+
+Run from the project root:
+    python benchmarks/bench_parallel_catalog.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+
+QUESTS = 200000
+
+QUEST_BLOCK = (
+    "QUEST_ID: quest_{i}\n"
+    "TITLE: Quest number {i}\n"
+    "DESCRIPTION: Generated by the content pipeline for load testing\n"
+    "REWARD_XP: {xp}\n"
+    "REWARD_GOLD: {gold}\n"
+    "REQUIRED_LEVEL: {level}\n"
+    "PREREQUISITE: NONE\n"
+)
+
+def write_quest_file(filename, count):
+    """Write count quest blocks separated by blank lines"""
+    with open(filename, "w", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(QUEST_BLOCK.format(i=i, xp=i % 500, gold=i % 90, level=i % 30 + 1))
+            f.write("\n")
+
+def best_time(load, repeat=3):
+    """Fastest of repeat runs, in seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+if __name__ == "__main__":
+    print("=== PARALLEL CATALOG BENCHMARK ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "quests.txt")
+        write_quest_file(filename, QUESTS)
+        size = os.path.getsize(filename) / (1 << 20)
+        print(f"{QUESTS} quests, {size:.1f} MB, {os.cpu_count()} CPUs\n")
+
+        sequential = best_time(lambda: game_data.load_quests(filename))
+        print(f"load_quests            {sequential:6.2f} s")
+
+        counts = sorted({1, 2, os.cpu_count() or 1})
+        for workers in counts:
+            elapsed = best_time(
+                lambda: game_data.load_quests_parallel(filename, workers=workers)
+            )
+            print(f"parallel, {workers:2d} workers   {elapsed:6.2f} s "
+                  f"({sequential / elapsed:.2f}x)")
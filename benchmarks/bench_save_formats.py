@@ -0,0 +1,64 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark: Text vs binary save format
+
+Saves late-game characters in both formats and compares file size and
+decode time: one with a big inventory only, and one that also has a long
+quest history.
+
+Run from the project root:
+    python benchmarks/bench_save_formats.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+INVENTORY_SIZE = 5000
+DISTINCT_ITEMS = 40
+COMPLETED_QUESTS = 2000
+
+def make_character(completed_quests=COMPLETED_QUESTS):
+    """Build a late-game character"""
+    character = character_manager.create_character("Veteran", "Warrior")
+    character["inventory"].extend(
+        f"item_{i % DISTINCT_ITEMS:03d}" for i in range(INVENTORY_SIZE)
+    )
+    character["completed_quests"].extend(
+        f"quest_{i:05d}" for i in range(completed_quests)
+    )
+    character["active_quests"].extend(["dragon_slayer", "lost_relic"])
+    character["equipped_weapon"] = "iron_sword"
+    return character
+
+def decodes_per_second(function, data):
+    """Time function(data) and return calls per second"""
+    number = 200
+    seconds = timeit.timeit(lambda: function(data), number=number)
+    return number / seconds
+
+def compare(label, character):
+    """Print size and decode speed of both formats for character"""
+    text = character_manager._format_save_text(character)
+    binary = character_manager.encode_binary_save(character)
+    assert character_manager.decode_binary_save(binary)[0] == character
+
+    text_size = len(text.encode("utf-8"))
+    text_rate = decodes_per_second(
+        lambda data: character_manager._parse_save_lines(data.splitlines()), text
+    )
+    binary_rate = decodes_per_second(character_manager.decode_binary_save, binary)
+
+    print(label)
+    print(f"  text:   {text_size:8d} bytes {text_rate:8.0f} decodes/s")
+    print(f"  binary: {len(binary):8d} bytes {binary_rate:8.0f} decodes/s "
+          f"({text_size / len(binary):.1f}x smaller, {binary_rate / text_rate:.1f}x faster)")
+
+if __name__ == "__main__":
+    print("=== SAVE FORMAT BENCHMARK ===")
+    compare(f"{INVENTORY_SIZE} items ({DISTINCT_ITEMS} distinct)", make_character(0))
+    compare(f"{INVENTORY_SIZE} items + {COMPLETED_QUESTS} completed quests", make_character())
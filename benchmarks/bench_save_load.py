@@ -0,0 +1,90 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark: Save file loading
+
+Writes COUNT save files and times loading all of them with the
+schema-driven load_character and with a copy of the loader it replaced
+(split each line, build a data dict, convert fields by hand).
+
+Run from the project root:
+    python benchmarks/bench_save_load.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+COUNT = 10000
+
+def legacy_load_character(character_name, save_directory):
+    """The loader before SAVE_SCHEMA, kept here for comparison"""
+    filename = os.path.join(save_directory, f"{character_name}_save.txt")
+    with open(filename, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+
+    data = {}
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        key, value = line.split(":", 1)
+        data[key.strip().lower()] = value.strip()
+
+    def parse_list(value):
+        return [] if value == "" else [x for x in value.split(",")]
+
+    return character_manager.Character({
+        "name": data["name"],
+        "class": data["class"],
+        "level": int(data["level"]),
+        "health": int(data["health"]),
+        "max_health": int(data["max_health"]),
+        "strength": int(data["strength"]),
+        "magic": int(data["magic"]),
+        "experience": int(data["experience"]),
+        "gold": int(data["gold"]),
+        "inventory": character_manager.Inventory(parse_list(data.get("inventory", ""))),
+        "active_quests": character_manager.QuestSet(parse_list(data.get("active_quests", ""))),
+        "completed_quests": character_manager.QuestSet(parse_list(data.get("completed_quests", "")))
+    })
+
+def write_saves(save_directory):
+    """Write COUNT save files with a few items and quests each"""
+    characters = []
+    for i in range(COUNT):
+        character = character_manager.create_character(f"Hero{i}", "Rogue")
+        character["inventory"].extend(["health_potion", "iron_sword", "health_potion"])
+        character["completed_quests"].extend(["first_steps", "goblin_hunter"])
+        character["equipped_armor"] = "leather_armor"
+        characters.append(character)
+    character_manager.save_characters(characters, save_directory)
+    return [character["name"] for character in characters]
+
+def time_loader(loader, names, save_directory):
+    """Load every name with loader and return the best of three runs"""
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        for name in names:
+            loader(name, save_directory)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+if __name__ == "__main__":
+    print("=== SAVE LOAD BENCHMARK ===")
+    print(f"Save files: {COUNT}")
+
+    with tempfile.TemporaryDirectory() as save_directory:
+        names = write_saves(save_directory)
+        legacy = time_loader(legacy_load_character, names, save_directory)
+        schema = time_loader(character_manager.load_character, names, save_directory)
+
+    print(f"legacy loader: {legacy:6.3f} s ({COUNT / legacy:8.0f} files/s)")
+    print(f"schema loader: {schema:6.3f} s ({COUNT / schema:8.0f} files/s, "
+          f"{legacy / schema:.2f}x)")
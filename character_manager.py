@@ -10,6 +10,21 @@ This module handles character creation, loading, and saving.
 """
 
 import os
+import ast
+import math
+import zlib
+import atexit
+import struct
+import sqlite3
+import tempfile
+import itertools
+import threading
+import concurrent.futures
+import game_data
+from collections import namedtuple
+from collections.abc import MutableMapping
+from inventory_system import Inventory
+from quest_handler import QuestSet
 from custom_exceptions import (
     InvalidCharacterClassError,
     CharacterNotFoundError,
@@ -18,6 +33,269 @@ from custom_exceptions import (
     CharacterDeadError
 )
 
+# ============================================================================
+# CHARACTER RECORD
+# ============================================================================
+
+# Fields stored directly on a Character, in save file order
+CHARACTER_FIELDS = (
+    "name", "class", "level", "health", "max_health",
+    "strength", "magic", "experience", "gold",
+    "inventory", "active_quests", "completed_quests",
+    "equipped_weapon", "equipped_armor"
+)
+
+_CHARACTER_FIELD_SET = frozenset(CHARACTER_FIELDS)
+
+class Character(MutableMapping):
+    """
+    Compact character record
+    
+    Stores the standard character fields in __slots__ instead of a per
+    instance dict. With the Inventory and QuestSet containers, which
+    keep short contents in plain lists and share one empty tuple while
+    empty, a new character takes about 420 bytes against about 700 for
+    the dict, and one holding a few items and quests about 680 against
+    780 (see benchmarks/bench_character.py). It still behaves like the dictionary create_character used to
+    return: character["health"], .get(), .items(), "key" in character,
+    setdefault() and so on all work, and it compares equal to a dict with
+    the same contents.
+    
+    Any key that is not a standard field (for example item_data, or a stat
+    added by an item effect) is kept in a small overflow dict.
+    
+    Subscripting goes through Python code and is about 3x slower than on a
+    dict, so hot loops read fields as attributes (character.health),
+    which is faster than a dict lookup; the battle loop in combat_system
+    does this.
+    "class" is a keyword, so use character["class"] for that one.
+    
+    Every change made through character[key] = value (or del) bumps an
+    internal counter; see version. Lists assigned to inventory or the
+    quest fields are converted to Inventory/QuestSet so their changes are
+    counted too. Writing attributes directly is not tracked; call
+    mark_changed() after doing so.
+    """
+
+    # __weakref__ lets caches such as quest_handler.QuestIndex refer to a
+    # character without keeping it alive
+    __slots__ = CHARACTER_FIELDS + ("_extra", "_version", "__weakref__")
+
+    def __init__(self, data=(), **kwargs):
+        self._extra = None
+        self._version = 0
+        self.update(data, **kwargs)
+
+    @property
+    def version(self):
+        """
+        Change token for this character
+        
+        Returns: Tuple that is different after any tracked change
+        """
+        return (
+            self._version,
+            getattr(self.get("inventory"), "changes", 0),
+            getattr(self.get("active_quests"), "changes", 0),
+            getattr(self.get("completed_quests"), "changes", 0)
+        )
+
+    @classmethod
+    def _from_fields(cls, values, extra=None):
+        """
+        Build a record from already-typed standard fields
+        
+        Used by the save loader; skips the per-key checks of __setitem__.
+        extra holds any other keys (such as saved extra stats).
+        """
+        character = cls.__new__(cls)
+        character._extra = dict(extra) if extra else None
+        character._version = 0
+        for key, value in values.items():
+            setattr(character, key, value)
+        return character
+
+    def mark_changed(self):
+        """Record a change that was made in place (e.g. inside item_data)"""
+        self._version += 1
+
+    def set_unsaved(self, key, value):
+        """
+        Set an extra key that is never saved, without bumping the version
+        
+        For runtime attachments such as item_data, so swapping them does
+        not look like a change to autosave or other version watchers.
+        
+        Raises: KeyError if key is a standard (saved) field
+        """
+        if key in _CHARACTER_FIELD_SET:
+            raise KeyError(key)
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __getitem__(self, key):
+        if key in _CHARACTER_FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        if key in _CHARACTER_FIELD_SET:
+            if type(value) is list:
+                if key == "inventory":
+                    value = Inventory(value)
+                elif key in ("active_quests", "completed_quests"):
+                    value = QuestSet(value)
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+        self._version += 1
+
+    def __delitem__(self, key):
+        if key in _CHARACTER_FIELD_SET:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        else:
+            if self._extra is None:
+                raise KeyError(key)
+            del self._extra[key]
+        self._version += 1
+
+    def __contains__(self, key):
+        if key in _CHARACTER_FIELD_SET:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self):
+        for field in CHARACTER_FIELDS:
+            if hasattr(self, field):
+                yield field
+        if self._extra:
+            yield from list(self._extra)
+
+    def __len__(self):
+        count = 0
+        for field in CHARACTER_FIELDS:
+            if hasattr(self, field):
+                count += 1
+        if self._extra:
+            count += len(self._extra)
+        return count
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def copy(self):
+        """Return a shallow copy, like dict.copy()"""
+        return Character(self)
+
+    def __repr__(self):
+        return f"Character({dict(self)!r})"
+
+# ============================================================================
+# SAVE FILE SCHEMA
+# ============================================================================
+
+def _encode_text(value):
+    return str(value)
+
+def _decode_optional(value):
+    # Older saves wrote str(None) for an empty equipment slot
+    return None if value in ("", "None") else value
+
+def _encode_optional(value):
+    return "" if value is None else str(value)
+
+def _decode_list(value):
+    if not value:
+        return []
+    if value[0] == "[":
+        # Older saves wrote str(list): ['health_potion', 'iron_sword']
+        items = ast.literal_eval(value)
+        if not isinstance(items, list) or not all(isinstance(x, str) for x in items):
+            raise ValueError("expected a list of ids")
+        return items
+    return value.split(",")
+
+def _encode_list(value):
+    return ",".join(value)
+
+def _decode_inventory(value):
+    return Inventory(_decode_list(value))
+
+def _decode_quests(value):
+    return QuestSet(_decode_list(value))
+
+# One save file line: character field, KEY written in the file, decode and
+# encode functions, and whether the field must be present. Decoders get
+# the stripped text after the colon and raise ValueError on bad input.
+SaveField = namedtuple("SaveField", "name key decode encode required")
+
+# Save file layout, in the order lines are written. Keys that are not in
+# the schema are not saved, except extra stats (see _extra_stats).
+SAVE_SCHEMA = (
+    SaveField("name", "NAME", str, _encode_text, True),
+    SaveField("class", "CLASS", str, _encode_text, True),
+    SaveField("level", "LEVEL", int, _encode_text, True),
+    SaveField("health", "HEALTH", int, _encode_text, True),
+    SaveField("max_health", "MAX_HEALTH", int, _encode_text, True),
+    SaveField("strength", "STRENGTH", int, _encode_text, True),
+    SaveField("magic", "MAGIC", int, _encode_text, True),
+    SaveField("experience", "EXPERIENCE", int, _encode_text, True),
+    SaveField("gold", "GOLD", int, _encode_text, True),
+    SaveField("inventory", "INVENTORY", _decode_inventory, _encode_list, False),
+    SaveField("active_quests", "ACTIVE_QUESTS", _decode_quests, _encode_list, False),
+    SaveField("completed_quests", "COMPLETED_QUESTS", _decode_quests, _encode_list, False),
+    SaveField("equipped_weapon", "EQUIPPED_WEAPON", _decode_optional, _encode_optional, False),
+    SaveField("equipped_armor", "EQUIPPED_ARMOR", _decode_optional, _encode_optional, False)
+)
+
+# Decoder table used by the loader: KEY -> SaveField
+_SAVE_DECODERS = {field.key: field for field in SAVE_SCHEMA}
+_SAVE_FIELDS = {field.name: field for field in SAVE_SCHEMA}
+_SAVE_REQUIRED = frozenset(field.name for field in SAVE_SCHEMA if field.required)
+
+# Extra stats (integer keys outside the standard fields, e.g. "luck" added
+# by an item effect) are saved as "STAT.<name>: <value>" lines
+SAVE_STAT_PREFIX = "STAT."
+
+def _extra_stats(character):
+    """
+    Get the extra stats of a character that are saved
+    
+    Returns: Dictionary {name: int} of keys outside the standard fields
+             whose value is an int and whose name is an identifier;
+             anything else (item_data, ...) is not saved
+    """
+    if isinstance(character, Character):
+        extra = character._extra or {}
+    else:
+        extra = character
+    return {
+        key: value for key, value in extra.items()
+        if type(value) is int and key not in _CHARACTER_FIELD_SET
+        and isinstance(key, str) and key.isidentifier()
+    }
+
+# Defaults for optional list fields that older saves may leave out
+_SAVE_DEFAULTS = {
+    "inventory": Inventory,
+    "active_quests": QuestSet,
+    "completed_quests": QuestSet
+}
+
 # ============================================================================
 # CHARACTER MANAGEMENT FUNCTIONS
 # ============================================================================
@@ -26,21 +304,21 @@ def create_character(name, character_class):
     """
     Create a new character with stats based on class
     
-    Valid classes: Warrior, Mage, Rogue, Cleric
+    Valid classes: Warrior, Mage, Rogue, Cleric (base stats come from
+    data/classes.txt, see game_data.get_class_prototypes)
     
-    Returns: Dictionary with character data including:
+    Returns: Character record (a dict-like object) including:
             - name, class, level, health, max_health, strength, magic
             - experience, gold, inventory, active_quests, completed_quests
     
-    Raises: InvalidCharacterClassError if class is not valid
+    Raises:
+        InvalidCharacterClassError if class is not valid
+        MissingDataFileError if data/classes.txt is missing
+        InvalidDataFormatError if data/classes.txt is malformed
+        CorruptedDataError if data/classes.txt cannot be read
     """
     # TODO: Implement character creation
-    valid_classes = {
-        "Warrior": {"health": 120, "strength": 15, "magic": 5},
-        "Mage": {"health": 80, "strength": 8, "magic": 20},
-        "Rogue": {"health": 90, "strength": 12, "magic": 10},
-        "Cleric": {"health": 100, "strength": 10, "magic": 15}
-    }
+    valid_classes = game_data.get_class_prototypes()
 
     if character_class not in valid_classes:
         raise InvalidCharacterClassError(
@@ -50,7 +328,7 @@ def create_character(name, character_class):
 
     stats = valid_classes[character_class]
 
-    return {
+    return Character._from_fields({
         "name": name,
         "class": character_class,
         "level": 1,
@@ -60,10 +338,10 @@ def create_character(name, character_class):
         "magic": stats["magic"],
         "experience": 0,
         "gold": 100,
-        "inventory": [],
-        "active_quests": [],
-        "completed_quests": []
-    }
+        "inventory": Inventory(),
+        "active_quests": QuestSet(),
+        "completed_quests": QuestSet()
+    })
 
     # Validate character_class first
     # Example base stats:
@@ -75,11 +353,28 @@ def create_character(name, character_class):
     # - level=1, experience=0, gold=100
     # - inventory=[], active_quests=[], completed_quests=[]
 
-def save_character(character, save_directory="data/save_games"):
+def get_character_version(character):
+    """
+    Get a token that changes whenever the character changes
+    
+    Compare two tokens to decide whether a save is needed. Gold, XP,
+    stats, inventory and quest changes (add_gold, gain_experience,
+    add_item_to_inventory, accept_quest, ...) all change the token.
+    
+    Returns: Version tuple, or None for plain dicts (always treat as changed)
+    """
+    if isinstance(character, Character):
+        return character.version
+    return None
+
+def save_character(character, save_directory="data/save_games", sync_directory=True,
+                   journal_id=None, save_format=None):
     """
     Save character to file
     
-    Filename format: {character_name}_save.txt
+    Filename format: {character_name}_save.txt, or {character_name}_save.bin
+    for the binary format (save_format="binary", or SAVE_FORMAT; see
+    encode_binary_save)
     
     File format:
     NAME: character_name
@@ -94,103 +389,243 @@ def save_character(character, save_directory="data/save_games"):
     INVENTORY: item1,item2,item3
     ACTIVE_QUESTS: quest1,quest2
     COMPLETED_QUESTS: quest1,quest2
+    EQUIPPED_WEAPON: iron_sword
+    EQUIPPED_ARMOR: 
+    
+    Only the fields in SAVE_SCHEMA are written (not item_data), followed
+    by one "STAT.<name>: <value>" line per extra stat (an integer key
+    outside the standard fields, such as one added by an item effect).
+    Equipment lines are only written if the character has those fields;
+    an empty slot is written as an empty value.
+    
+    The file is written to a temp file in the same directory, fsynced and
+    moved over the old save with os.replace, so a crash mid-write leaves
+    the previous save intact. If sync_directory is True the directory is
+    fsynced too, so the rename itself survives a power loss.
+    
+    journal_id is written as a JOURNAL line by SaveJournal so that
+    load_character knows which journal file belongs to this snapshot.
+    
+    save_directory may also name a save store instead (see get_save_store).
     
     Returns: True if successful
-    Raises: PermissionError, IOError (let them propagate or handle)
+    Raises: SaveFileCorruptedError if the file cannot be written
     """
+    store = get_save_store(save_directory)
+    if store is not None:
+        return store.save(character)
+
+    save_format = save_format or SAVE_FORMAT
+    if save_format not in SAVE_FORMATS:
+        raise ValueError(f"Unknown save format: {save_format}")
+    if save_format == "binary":
+        data = encode_binary_save(character, journal_id)
+    else:
+        data = _format_save_text(character, journal_id)
+
     os.makedirs(save_directory, exist_ok=True)
-    filename = os.path.join(save_directory, f"{character['name']}_save.txt")
+    name = character["name"]
+    filename = os.path.join(save_directory, name + SAVE_FORMATS[save_format])
 
     try:
-        with open(filename, "w", encoding="utf-8") as f:
-            for key, value in character.items():
-                key_str = key.upper()  # required by tests
-                f.write(f"{key_str}: {value}\n")
+        _write_file_atomic(filename, data)
+        # Drop the save in the other format so it cannot shadow this one
+        for other, suffix in SAVE_FORMATS.items():
+            if other != save_format:
+                try:
+                    os.remove(os.path.join(save_directory, name + suffix))
+                except FileNotFoundError:
+                    pass
+        if sync_directory:
+            _fsync_directory(save_directory)
         return True
     except Exception as e:
         raise SaveFileCorruptedError(str(e))
     
-    except Exception as e:
-        raise SaveFileCorruptedError(str(e))
-    
     # TODO: Implement save functionality
     # Create save_directory if it doesn't exist
     # Handle any file I/O errors appropriately
     # Lists should be saved as comma-separated values
 
+def _format_save_text(character, journal_id=None):
+    """Format character in the save file format (see SAVE_SCHEMA)"""
+    lines = []
+    for field in SAVE_SCHEMA:
+        if field.name in character:
+            lines.append(f"{field.key}: {field.encode(character[field.name])}\n")
+    for name, value in _extra_stats(character).items():
+        lines.append(f"{SAVE_STAT_PREFIX}{name}: {value}\n")
+    if journal_id:
+        lines.append(f"JOURNAL: {journal_id}\n")
+    return "".join(lines)
+
+def save_characters(characters, save_directory="data/save_games"):
+    """
+    Save many characters at once (for example, everyone changed this tick)
+    
+    Each file is still written atomically and fsynced, but the directory
+    is fsynced only once at the end instead of once per file. A save store
+    writes all of them in one transaction.
+    
+    Returns: Number of characters saved
+    Raises: SaveFileCorruptedError if any file cannot be written
+    """
+    store = get_save_store(save_directory)
+    if store is not None:
+        return store.save_many(characters)
+
+    count = 0
+    for character in characters:
+        save_character(character, save_directory, sync_directory=False)
+        count += 1
+
+    if count:
+        try:
+            _fsync_directory(save_directory)
+        except Exception as e:
+            raise SaveFileCorruptedError(str(e))
+    return count
+
 def load_character(character_name, save_directory="data/save_games"):
     """
     Load character from save file
     
     Args:
         character_name: Name of character to load
-        save_directory: Directory containing save files
+        save_directory: Directory containing save files (or a save store)
     
-    Returns: Character dictionary
+    Returns: Character record
     Raises: 
         CharacterNotFoundError if save file doesn't exist
         SaveFileCorruptedError if file exists but can't be read
         InvalidSaveDataError if data format is wrong
     """
+    store = get_save_store(save_directory)
+    if store is not None:
+        return store.load(character_name)
+
+    character, journal_id = _read_save_file(character_name, save_directory)
+    if journal_id:
+        records, _ = _read_journal(
+            _journal_filename(character_name, save_directory), journal_id
+        )
+        for record in records:
+            apply_journal_record(character, record)
+    return character
+
+def _read_save_file(character_name, save_directory):
+    """
+    Read a snapshot save file without replaying its journal
+    
+    Returns: Tuple (character, journal_id or None)
+    """
     # TODO: Implement load functionality
-    filename = os.path.join(save_directory, f"{character_name}_save.txt")
+    for save_format in _save_format_order():
+        filename = os.path.join(save_directory, character_name + SAVE_FORMATS[save_format])
+        try:
+            return _read_save_path(filename, save_format)
+        except CharacterNotFoundError:
+            continue
+    raise CharacterNotFoundError(f"No save found for {character_name}.")
 
-    if not os.path.exists(filename):
-        raise CharacterNotFoundError(f"No save found for {character_name}.")
+def _save_format_order():
+    """
+    Save formats in the order load_character looks for them
+    
+    SAVE_FORMAT comes first. There is only ever a file in both formats if
+    the game stopped inside a save_character call that switched formats,
+    before it removed the old file; that save was never completed, so
+    reading either file is as good as the game stopping just before it.
+    """
+    return [SAVE_FORMAT] + [f for f in SAVE_FORMATS if f != SAVE_FORMAT]
 
+def _read_save_path(filename, save_format):
+    """
+    Read and decode one snapshot file
+    
+    Returns: Tuple (character, journal_id or None)
+    """
     try:
-        with open(filename, "r", encoding="utf-8") as f:
-            lines = f.readlines()
+        if save_format == "binary":
+            with open(filename, "rb") as f:
+                data = f.read()
+        else:
+            with open(filename, "r", encoding="utf-8") as f:
+                data = f.read()
+    except FileNotFoundError:
+        raise CharacterNotFoundError(f"No save file {filename}.")
     except Exception as e:
         raise SaveFileCorruptedError(str(e))
 
-    data = {}
-
-    try:
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
+    if save_format == "binary":
+        return decode_binary_save(data)
+    return _parse_save_lines(data.splitlines())
 
-            if ": " not in line:
-                raise InvalidSaveDataError("Invalid line in save file.")
+def _parse_save_lines(lines):
+    """
+    Parse the lines of a save file
+    
+    Lines are decoded with the SAVE_SCHEMA decoder table. STAT.<name>
+    lines become extra stats. Lines with other keys are skipped, except
+    the JOURNAL id.
+    
+    Returns: Tuple (character, journal_id or None)
+    Raises: InvalidSaveDataError if a line or field is not valid, or a
+            required field is missing
+    """
+    decoders = _SAVE_DECODERS
+    values = {}
+    extra = {}
+    journal_id = None
 
-            key, value = line.split(": ", 1)
-            key = key.strip().lower()
-            data[key] = value.strip()
-    except InvalidSaveDataError:
-        raise
-    except Exception as e:
-        raise SaveFileCorruptedError(str(e))
+    for line in lines:
+        key, separator, value = line.partition(":")
+        field = decoders.get(key)
+        if field is None:
+            if not separator:
+                if line.strip():
+                    raise InvalidSaveDataError("Invalid line in save file.")
+                continue
+            if key.startswith(SAVE_STAT_PREFIX):
+                name = key[len(SAVE_STAT_PREFIX):].strip()
+                try:
+                    extra[name] = int(value)
+                except ValueError as e:
+                    raise InvalidSaveDataError(f"Invalid value for {name}: {e}")
+                continue
+            key = key.strip().upper()
+            if key == "JOURNAL":
+                journal_id = value.strip()
+                continue
+            field = decoders.get(key)
+            if field is None:
+                continue
+        try:
+            values[field.name] = field.decode(value.strip())
+        except (ValueError, SyntaxError) as e:
+            raise InvalidSaveDataError(f"Invalid value for {field.name}: {e}")
 
-    # Convert lists saved as strings
-    def parse_list(value):
-        return [] if value == "" else [x for x in value.split(",")]
-
-    character = {
-        "name": data["name"],
-        "class": data["class"],
-        "level": int(data["level"]),
-        "health": int(data["health"]),
-        "max_health": int(data["max_health"]),
-        "strength": int(data["strength"]),
-        "magic": int(data["magic"]),
-        "experience": int(data["experience"]),
-        "gold": int(data["gold"]),
-        "inventory": parse_list(data.get("inventory", "")),
-        "active_quests": parse_list(data.get("active_quests", "")),
-        "completed_quests": parse_list(data.get("completed_quests", ""))
-    }
+    if not _SAVE_REQUIRED <= values.keys():
+        for field in SAVE_SCHEMA:
+            if field.required and field.name not in values:
+                raise InvalidSaveDataError(f"Missing field: {field.name}")
+    for name, default in _SAVE_DEFAULTS.items():
+        if name not in values:
+            values[name] = default()
 
-    return character
+    return Character._from_fields(values, extra), journal_id
 
 
 def list_saved_characters(save_directory="data/save_games"):
     """
     Get list of all saved character names
     
-    Returns: List of character names (without _save.txt extension)
+    Returns: List of character names (without _save.txt/_save.bin extension)
     """
+    store = get_save_store(save_directory)
+    if store is not None:
+        return store.list_names()
+
     # TODO: Implement this function
     if not os.path.exists(save_directory):
         return []
@@ -200,11 +635,14 @@ def list_saved_characters(save_directory="data/save_games"):
         for fn in os.listdir(save_directory):
             if fn.endswith("_save.txt"):
                 entries.append(fn[:-9])  # remove "_save.txt"
+            elif fn.endswith("_save.bin"):
+                entries.append(fn[:-9])
     except Exception:
         # If directory can't be read, return empty list rather than crashing
         return []
 
-    return entries
+    # A character saved in both formats is listed once
+    return list(dict.fromkeys(entries))
     # Return empty list if directory doesn't exist
     # Extract character names from filenames
 
@@ -215,17 +653,1135 @@ def delete_character(character_name, save_directory="data/save_games"):
     Returns: True if deleted successfully
     Raises: CharacterNotFoundError if character doesn't exist
     """
-    filename = os.path.join(save_directory, f"{character_name}_save.txt")
+    store = get_save_store(save_directory)
+    if store is not None:
+        return store.delete(character_name)
 
-    if not os.path.exists(filename):
+    removed = False
+    for suffix in SAVE_FORMATS.values():
+        try:
+            os.remove(os.path.join(save_directory, character_name + suffix))
+            removed = True
+        except FileNotFoundError:
+            pass
+    if not removed:
         raise CharacterNotFoundError(f"{character_name} does not exist.")
 
-    os.remove(filename)
+    try:
+        os.remove(_journal_filename(character_name, save_directory))
+    except FileNotFoundError:
+        pass
     return True
 
     # TODO: Implement character deletion
     # Verify file exists before attempting deletion
 
+# ============================================================================
+# BINARY SAVE FORMAT
+# ============================================================================
+
+# Save file suffix for each save format
+SAVE_FORMATS = {"text": "_save.txt", "binary": "_save.bin"}
+
+# Format used by save_character when no save_format is given
+SAVE_FORMAT = "text"
+
+BINARY_SAVE_MAGIC = b"QCSB"
+# 2: extra stats after the optional strings
+BINARY_SAVE_VERSION = 2
+
+# magic, schema version, flags
+_BINARY_HEADER = struct.Struct("<4sHB")
+
+# Flag: the ID tables are zlib-compressed
+BINARY_FLAG_COMPRESSED = 1
+
+# Only try compressing ID tables at least this big
+_BINARY_COMPRESS_MIN_BYTES = 256
+
+# Stats in the order they are written, as zigzag varints
+_BINARY_INT_FIELDS = (
+    "level", "health", "max_health", "strength", "magic", "experience", "gold"
+)
+
+# Tags for optional strings (equipment slots, journal id)
+_BINARY_MISSING, _BINARY_NONE, _BINARY_TEXT = 0, 1, 2
+
+def encode_binary_save(character, journal_id=None):
+    """
+    Encode character in the binary save format
+    
+    Layout (all integers little-endian):
+        header      4-byte magic "QCSB", uint16 schema version, uint8 flags
+        stats       level .. gold as zigzag varints
+        name, class varint length + UTF-8 bytes
+        optionals   equipped_weapon, equipped_armor, journal id: a varint
+                    tag (0 = not set, 1 = None, 2 = text follows)
+        extra stats varint count, then a name and a zigzag varint value
+                    for each (version 2 and later)
+        inventory   ID table of the distinct items, then one uint32 count
+                    per item
+        quests      ID tables for active_quests and completed_quests
+    
+    An ID table is a varint count, a varint byte length and the IDs joined
+    with NUL bytes, so each ID is stored once and the table decodes with
+    a single split. If the tables are big and zlib makes them smaller,
+    they are stored compressed and BINARY_FLAG_COMPRESSED is set.
+    
+    Returns: bytes
+    Raises: InvalidSaveDataError if a required field is missing
+    """
+    out = bytearray()
+    try:
+        for field in _BINARY_INT_FIELDS:
+            value = character[field]
+            _write_varint(out, value * 2 if value >= 0 else -value * 2 - 1)
+        _write_text(out, character["name"])
+        _write_text(out, character["class"])
+    except KeyError as e:
+        raise InvalidSaveDataError(f"Missing field: {e.args[0]}")
+
+    for value in (character.get("equipped_weapon", _MISSING),
+                  character.get("equipped_armor", _MISSING),
+                  journal_id or _MISSING):
+        if value is _MISSING:
+            _write_varint(out, _BINARY_MISSING)
+        elif value is None:
+            _write_varint(out, _BINARY_NONE)
+        else:
+            _write_varint(out, _BINARY_TEXT)
+            _write_text(out, value)
+
+    stats = _extra_stats(character)
+    _write_varint(out, len(stats))
+    for name, value in stats.items():
+        _write_text(out, name)
+        _write_varint(out, value * 2 if value >= 0 else -value * 2 - 1)
+
+    tables = bytearray()
+    counts = _item_counts(character.get("inventory", ()))
+    _write_id_table(tables, counts)
+    tables += struct.pack(f"<{len(counts)}I", *counts.values())
+    _write_id_table(tables, list(character.get("active_quests", ())))
+    _write_id_table(tables, list(character.get("completed_quests", ())))
+
+    flags = 0
+    if len(tables) >= _BINARY_COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(tables)
+        if len(compressed) < len(tables):
+            tables = compressed
+            flags |= BINARY_FLAG_COMPRESSED
+
+    header = _BINARY_HEADER.pack(BINARY_SAVE_MAGIC, BINARY_SAVE_VERSION, flags)
+    return header + bytes(out) + bytes(tables)
+
+def decode_binary_save(data):
+    """
+    Decode a binary save (see encode_binary_save)
+    
+    Returns: Tuple (character, journal_id or None)
+    Raises: InvalidSaveDataError if the data is not a valid binary save
+    """
+    try:
+        magic, version, flags = _BINARY_HEADER.unpack_from(data, 0)
+        if magic != BINARY_SAVE_MAGIC:
+            raise InvalidSaveDataError("Not a binary save file.")
+        if version > BINARY_SAVE_VERSION:
+            raise InvalidSaveDataError(f"Unsupported binary save version {version}.")
+        position = _BINARY_HEADER.size
+
+        values = {}
+        for field in _BINARY_INT_FIELDS:
+            value, position = _read_varint(data, position)
+            values[field] = value >> 1 if not value & 1 else -((value + 1) >> 1)
+        values["name"], position = _read_text(data, position)
+        values["class"], position = _read_text(data, position)
+
+        optionals = []
+        for _ in range(3):
+            tag, position = _read_varint(data, position)
+            if tag == _BINARY_TEXT:
+                value, position = _read_text(data, position)
+            elif tag == _BINARY_NONE:
+                value = None
+            elif tag == _BINARY_MISSING:
+                value = _MISSING
+            else:
+                raise ValueError(f"bad optional tag {tag}")
+            optionals.append(value)
+        for field, value in zip(("equipped_weapon", "equipped_armor"), optionals):
+            if value is not _MISSING:
+                values[field] = value
+        journal_id = optionals[2] if optionals[2] is not _MISSING else None
+
+        extra = {}
+        if version >= 2:
+            count, position = _read_varint(data, position)
+            for _ in range(count):
+                name, position = _read_text(data, position)
+                value, position = _read_varint(data, position)
+                extra[name] = value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+        if flags & BINARY_FLAG_COMPRESSED:
+            decompressor = zlib.decompressobj()
+            data = decompressor.decompress(data[position:])
+            if not decompressor.eof or decompressor.unused_data:
+                raise ValueError("bad compressed ID tables")
+            position = 0
+
+        item_ids, position = _read_id_table(data, position)
+        counts = struct.unpack_from(f"<{len(item_ids)}I", data, position)
+        position += 4 * len(item_ids)
+        values["inventory"] = Inventory.from_counts(zip(item_ids, counts))
+
+        for field in ("active_quests", "completed_quests"):
+            quest_ids, position = _read_id_table(data, position)
+            values[field] = QuestSet(quest_ids)
+
+        if position != len(data):
+            raise ValueError("trailing bytes")
+    except InvalidSaveDataError:
+        raise
+    except (struct.error, zlib.error, IndexError, ValueError, UnicodeDecodeError) as e:
+        raise InvalidSaveDataError(f"Corrupted binary save: {e}")
+
+    return Character._from_fields(values, extra), journal_id
+
+def convert_save_file(source, destination):
+    """
+    Convert a save file between the text and binary formats
+    
+    The format of each file is chosen by its extension (.bin is binary,
+    anything else is text). The JOURNAL id is kept, so a converted
+    snapshot still replays its journal.
+    
+    Returns: Character record that was converted
+    Raises:
+        CharacterNotFoundError if source doesn't exist
+        SaveFileCorruptedError if a file can't be read or written
+        InvalidSaveDataError if source is not a valid save
+    """
+    character, journal_id = _read_save_path(source, _save_format_for(source))
+    if _save_format_for(destination) == "binary":
+        data = encode_binary_save(character, journal_id)
+    else:
+        data = _format_save_text(character, journal_id)
+    try:
+        _write_file_atomic(destination, data)
+    except Exception as e:
+        raise SaveFileCorruptedError(str(e))
+    return character
+
+def _save_format_for(filename):
+    """Save format implied by a file name's extension"""
+    return "binary" if filename.endswith(".bin") else "text"
+
+def _write_varint(out, value):
+    """Append an unsigned LEB128 varint"""
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _read_varint(data, position):
+    """Read an unsigned LEB128 varint; returns (value, new position)"""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+def _write_text(out, text):
+    encoded = str(text).encode("utf-8")
+    _write_varint(out, len(encoded))
+    out += encoded
+
+def _read_text(data, position):
+    length, position = _read_varint(data, position)
+    end = position + length
+    if end > len(data):
+        raise ValueError("truncated text")
+    return data[position:end].decode("utf-8"), end
+
+def _write_id_table(out, ids):
+    encoded = "\0".join(ids).encode("utf-8")
+    if encoded.count(b"\0") != max(len(ids) - 1, 0):
+        raise InvalidSaveDataError("IDs cannot contain NUL characters.")
+    _write_varint(out, len(ids))
+    _write_varint(out, len(encoded))
+    out += encoded
+
+def _read_id_table(data, position):
+    count, position = _read_varint(data, position)
+    length, position = _read_varint(data, position)
+    end = position + length
+    if end > len(data):
+        raise ValueError("truncated ID table")
+    if not count:
+        return [], end
+    ids = data[position:end].decode("utf-8").split("\0")
+    if len(ids) != count:
+        raise ValueError("ID table count does not match")
+    return ids, end
+
+# ============================================================================
+# BULK LOADING
+# ============================================================================
+
+# Errors load_characters reports per name instead of raising
+_LOAD_ERRORS = (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError)
+
+def load_characters(names, save_directory="data/save_games", workers=None,
+                    use_processes=False, chunk_size=None):
+    """
+    Load many characters in parallel
+    
+    Names are split into chunks that are loaded by a thread pool (file
+    reads overlap), or with use_processes=True by a process pool so that
+    parsing runs on every CPU as well. Results are yielded as each chunk
+    finishes, so they do not come back in the order of names.
+    
+    A save that is missing or cannot be read does not stop the batch: its
+    error is yielded in place of the character.
+    
+    Save stores are read one name at a time in the calling thread, since
+    they are a single database file.
+    
+    Args:
+        names: Character names to load
+        save_directory: Directory containing save files (or a save store)
+        workers: Number of threads/processes (default: executor default)
+        use_processes: Use a process pool instead of threads
+        chunk_size: Names per task (default 64 for threads, 512 for processes)
+    
+    Yields: Tuples (name, character, error), where exactly one of
+            character and error is None. error is a CharacterNotFoundError,
+            SaveFileCorruptedError or InvalidSaveDataError.
+    """
+    if get_save_store(save_directory) is not None:
+        yield from _load_character_batch(names, save_directory)
+        return
+
+    if use_processes:
+        workers = workers or os.cpu_count() or 1
+        executor = concurrent.futures.ProcessPoolExecutor(workers)
+        chunk_size = chunk_size or 512
+    else:
+        # Same default as ThreadPoolExecutor
+        workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        executor = concurrent.futures.ThreadPoolExecutor(workers, "load-characters")
+        chunk_size = chunk_size or 64
+    max_pending = 2 * workers
+
+    names = iter(names)
+    pending = set()
+    try:
+        while True:
+            # Keep a bounded number of chunks in flight
+            while len(pending) < max_pending:
+                chunk = list(itertools.islice(names, chunk_size))
+                if not chunk:
+                    break
+                pending.add(executor.submit(_load_character_batch, chunk, save_directory))
+            if not pending:
+                break
+
+            done, pending = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                yield from future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+def _load_character_batch(names, save_directory):
+    """
+    Load each name, catching per-name load errors
+    
+    Module-level so process pool workers can run it.
+    
+    Returns: List of (name, character, error) tuples
+    """
+    results = []
+    for name in names:
+        try:
+            results.append((name, load_character(name, save_directory), None))
+        except _LOAD_ERRORS as e:
+            results.append((name, None, e))
+    return results
+
+# ============================================================================
+# BACKGROUND SAVES
+# ============================================================================
+
+def snapshot_character(character):
+    """
+    Copy a character so it can be saved while the game keeps changing it
+    
+    The inventory and quest lists are copied; other values (numbers,
+    strings, the shared item catalog) are not mutated in place by the
+    game and are shared.
+    
+    Returns: Character record
+    """
+    snapshot = Character(character)
+    for field in ("inventory", "active_quests", "completed_quests"):
+        if field in snapshot:
+            snapshot[field] = list(snapshot[field])
+    return snapshot
+
+class SaveWriter:
+    """
+    Background thread that writes character saves
+    
+    submit() hands over a snapshot and returns immediately. If several
+    snapshots of the same character are waiting, only the newest is
+    written. Writes that fail are reported by raising the error from the
+    next submit() or flush() call.
+    """
+
+    def __init__(self, save_function=None):
+        self.save_function = save_function or save_character
+        self._pending = {}
+        self._errors = []
+        self._writing = False
+        self._closed = False
+        self._thread = None
+        self._condition = threading.Condition()
+
+    def submit(self, character, save_directory="data/save_games"):
+        """
+        Queue a snapshot of character to be saved
+        
+        The snapshot is queued even if an earlier write failed; that
+        failure is then raised here.
+        
+        Raises: The error from an earlier failed write, if any
+        """
+        snapshot = snapshot_character(character)
+        with self._condition:
+            if self._closed:
+                raise SaveFileCorruptedError("Save writer is closed.")
+            self._pending[(save_directory, snapshot["name"])] = snapshot
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="save-writer", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify_all()
+        self._raise_errors()
+
+    def flush(self, timeout=None):
+        """
+        Wait until every queued snapshot has been written
+        
+        Returns: True if everything was written, False on timeout
+        Raises: The error from a failed write, if any
+        """
+        with self._condition:
+            done = self._condition.wait_for(
+                lambda: not self._pending and not self._writing, timeout
+            )
+        self._raise_errors()
+        return done
+
+    def close(self):
+        """Flush remaining saves and stop the thread"""
+        try:
+            self.flush()
+        finally:
+            with self._condition:
+                self._closed = True
+                self._condition.notify_all()
+            if self._thread is not None:
+                self._thread.join()
+
+    def _raise_errors(self):
+        """Raise (and clear) the first error recorded by the thread"""
+        with self._condition:
+            if not self._errors:
+                return
+            error = self._errors[0]
+            self._errors.clear()
+        raise error
+
+    def _run(self):
+        """Thread body: write batches of pending snapshots until closed"""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                batch = self._pending
+                self._pending = {}
+                self._writing = True
+
+            directories = set()
+            errors = []
+            for (save_directory, name), snapshot in batch.items():
+                try:
+                    self.save_function(snapshot, save_directory, sync_directory=False)
+                    if get_save_store(save_directory) is None:
+                        directories.add(save_directory)
+                except Exception as e:
+                    errors.append(e)
+
+            # One directory fsync per batch instead of one per file
+            for directory in directories:
+                _fsync_directory(directory)
+
+            with self._condition:
+                self._errors.extend(errors)
+                self._writing = False
+                self._condition.notify_all()
+
+# The shared writer used by the game
+_save_writer = None
+
+def get_save_writer():
+    """
+    Get the shared SaveWriter, creating it on first use
+    
+    The shared writer is flushed automatically at interpreter exit. If
+    JOURNAL_SAVES is set it saves through a SaveJournal.
+    
+    Returns: SaveWriter
+    """
+    global _save_writer
+
+    if _save_writer is None:
+        _save_writer = SaveWriter(SaveJournal().save if JOURNAL_SAVES else None)
+        atexit.register(_save_writer.close)
+    return _save_writer
+
+# ============================================================================
+# SAVE JOURNAL
+# ============================================================================
+
+# Journal a new full snapshot after this many delta records
+JOURNAL_COMPACT_RECORDS = 200
+
+# Use the journal for the shared save writer (see get_save_writer)
+JOURNAL_SAVES = True
+
+# Fields journaled as "+N"/"-N" deltas, and fields journaled with "set"
+_JOURNAL_INT_FIELDS = (
+    "level", "health", "max_health", "strength", "magic", "experience", "gold"
+)
+_JOURNAL_TEXT_FIELDS = ("class", "equipped_weapon", "equipped_armor")
+
+# Marks a field that is not set at all (as opposed to set to None)
+_MISSING = object()
+
+# Journal op for each list field
+_JOURNAL_LIST_OPS = {
+    "inventory": "inv",
+    "active_quests": "quest",
+    "completed_quests": "quest_done"
+}
+_JOURNAL_LIST_FIELDS = {op: field for field, op in _JOURNAL_LIST_OPS.items()}
+
+class SaveJournal:
+    """
+    Append-only save journal
+    
+    The first save of a character writes a full snapshot
+    ({name}_save.txt). Later saves only append the fields that changed
+    since the previous save to {name}_save.journal, one record per line:
+    
+        3d1ba2f0 gold +25
+        9a41c07e inv +health_potion
+        51be2e8d quest_done +goblin_hunter
+    
+    After JOURNAL_COMPACT_RECORDS records the journal is compacted: a new
+    snapshot is written and the journal starts over. load_character
+    replays the journal on top of the snapshot.
+    
+    Each record starts with a CRC32 of the rest of the line. A record that
+    was only partly written when the game crashed fails the check and is
+    ignored (along with anything after it), and the next save cuts it off
+    before appending.
+    
+    The snapshot names its journal with a random JOURNAL id, written in the
+    journal's first line. A journal whose id does not match the snapshot
+    is stale (for example the snapshot was rewritten by save_character)
+    and is never replayed.
+    
+    Not thread-safe; use it from one thread (e.g. as a SaveWriter's
+    save_function).
+    """
+
+    def __init__(self, compact_every=JOURNAL_COMPACT_RECORDS):
+        self.compact_every = compact_every
+        # (save_directory, name) -> state of the files on disk, see _open
+        self._states = {}
+
+    def save(self, character, save_directory="data/save_games", sync_directory=True):
+        """
+        Save character by appending to its journal
+        
+        Has the same signature as save_character, so it can be passed to
+        SaveWriter.
+        
+        Returns: True if successful
+        Raises: SaveFileCorruptedError if the files cannot be written
+        """
+        if get_save_store(save_directory) is not None:
+            # Stores update a single row; there is no file to journal
+            return save_character(character, save_directory)
+
+        key = (save_directory, character["name"])
+        state = self._states.get(key)
+        if state is None or state["stamp"] != _journal_stamp(*key):
+            state = self._open(*key)
+        if state is None or state["records"] >= self.compact_every:
+            return self.compact(character, save_directory, sync_directory)
+
+        records = diff_character(state["character"], character)
+        if not records:
+            return True
+
+        text = "".join(_format_journal_record(record) for record in records)
+        try:
+            with open(state["filename"], "ab") as f:
+                f.write(text.encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            raise SaveFileCorruptedError(str(e))
+
+        state["character"] = snapshot_character(character)
+        state["records"] += len(records)
+        state["stamp"] = _journal_stamp(*key)
+        return True
+
+    def compact(self, character, save_directory="data/save_games", sync_directory=True):
+        """
+        Write a full snapshot of character and start a new, empty journal
+        
+        The snapshot is written first: if the game stops between the two
+        writes, the old journal no longer matches the snapshot's id and is
+        ignored.
+        
+        Returns: True if successful
+        Raises: SaveFileCorruptedError if the files cannot be written
+        """
+        name = character["name"]
+        journal_id = os.urandom(6).hex()
+        filename = _journal_filename(name, save_directory)
+
+        save_character(character, save_directory, sync_directory=False,
+                       journal_id=journal_id)
+        try:
+            _write_file_atomic(filename, f"JOURNAL {journal_id}\n")
+            if sync_directory:
+                _fsync_directory(save_directory)
+        except Exception as e:
+            raise SaveFileCorruptedError(str(e))
+
+        self._states[(save_directory, name)] = {
+            "character": snapshot_character(character),
+            "filename": filename,
+            "records": 0,
+            "stamp": _journal_stamp(save_directory, name)
+        }
+        return True
+
+    def forget(self, character_name, save_directory="data/save_games"):
+        """Drop the cached state for a character (e.g. after deleting it)"""
+        self._states.pop((save_directory, character_name), None)
+
+    def _open(self, save_directory, character_name):
+        """
+        Rebuild a character's journal state from the files on disk
+        
+        Cuts off a torn last record so new records can be appended.
+        
+        Returns: State dictionary, or None if a new snapshot is needed
+        """
+        try:
+            character, journal_id = _read_save_file(character_name, save_directory)
+        except Exception:
+            return None
+        if not journal_id:
+            return None
+
+        filename = _journal_filename(character_name, save_directory)
+        records, end = _read_journal(filename, journal_id)
+        if end is None:
+            return None
+        try:
+            for record in records:
+                apply_journal_record(character, record)
+            if os.path.getsize(filename) != end:
+                with open(filename, "r+b") as f:
+                    f.truncate(end)
+        except Exception:
+            return None
+
+        return {
+            "character": character,
+            "filename": filename,
+            "records": len(records),
+            "stamp": _journal_stamp(save_directory, character_name)
+        }
+
+def diff_character(old, new):
+    """
+    List the journal records that turn old into new
+    
+    The standard character fields and the extra stats are compared;
+    other extra keys such as item_data are not saved. Extra stats are
+    journaled with their new value, e.g. ("stat", "luck 3").
+    
+    Returns: List of (op, argument) tuples, e.g. ("gold", "+25")
+    """
+    records = []
+
+    for field in _JOURNAL_INT_FIELDS + _JOURNAL_TEXT_FIELDS:
+        before = old.get(field, _MISSING)
+        after = new.get(field, _MISSING)
+        if before == after:
+            continue
+        if after is _MISSING:
+            records.append(("del", field))
+        elif type(before) is int and type(after) is int:
+            records.append((field, f"{after - before:+d}"))
+        else:
+            records.append(("set", f"{field} {_SAVE_FIELDS[field].encode(after)}"))
+
+    before = _extra_stats(old)
+    after = _extra_stats(new)
+    if before != after:
+        records.extend(("del", name) for name in before if name not in after)
+        records.extend(
+            ("stat", f"{name} {value}") for name, value in after.items()
+            if before.get(name) != value
+        )
+
+    before = _item_counts(old.get("inventory", ()))
+    after = _item_counts(new.get("inventory", ()))
+    if before != after:
+        for item_id in before:
+            records.extend([("inv", "-" + item_id)] * (before[item_id] - after.get(item_id, 0)))
+        for item_id in after:
+            records.extend([("inv", "+" + item_id)] * (after[item_id] - before.get(item_id, 0)))
+
+    for field in ("active_quests", "completed_quests"):
+        before = list(old.get(field, ()))
+        after = list(new.get(field, ()))
+        if before == after:
+            continue
+        op = _JOURNAL_LIST_OPS[field]
+        kept = set(after)
+        remaining = [quest_id for quest_id in before if quest_id in kept]
+        if after[:len(remaining)] == remaining:
+            # Only removals and appends
+            records.extend((op, "-" + q) for q in before if q not in kept)
+            records.extend((op, "+" + q) for q in after[len(remaining):])
+        else:
+            # Reordered: rebuild the whole list
+            records.extend((op, "-" + q) for q in before)
+            records.extend((op, "+" + q) for q in after)
+
+    return records
+
+def apply_journal_record(character, record):
+    """
+    Apply one journal record to character
+    
+    Raises: InvalidSaveDataError if the record is not understood
+    """
+    op, argument = record
+    try:
+        if op in _JOURNAL_INT_FIELDS:
+            character[op] += int(argument)
+        elif op in _JOURNAL_LIST_FIELDS:
+            field = _JOURNAL_LIST_FIELDS[op]
+            if argument[0] == "+":
+                character[field].append(argument[1:])
+            elif argument[0] == "-":
+                character[field].remove(argument[1:])
+            else:
+                raise ValueError(argument)
+        elif op == "set":
+            field, value = argument.split(" ", 1)
+            if field not in _JOURNAL_INT_FIELDS and field not in _JOURNAL_TEXT_FIELDS:
+                raise ValueError(field)
+            character[field] = _SAVE_FIELDS[field].decode(value)
+        elif op == "stat":
+            name, value = argument.split(" ", 1)
+            if name in _CHARACTER_FIELD_SET or not name.isidentifier():
+                raise ValueError(name)
+            character[name] = int(value)
+        elif op == "del":
+            character.pop(argument, None)
+        else:
+            raise ValueError(op)
+    except Exception as e:
+        raise InvalidSaveDataError(f"Invalid journal record '{op} {argument}': {e}")
+
+def _item_counts(inventory):
+    """Count copies of each item in an Inventory or list"""
+    if isinstance(inventory, Inventory):
+        return inventory.counts()
+    counts = {}
+    for item_id in inventory:
+        counts[item_id] = counts.get(item_id, 0) + 1
+    return counts
+
+def _journal_filename(character_name, save_directory):
+    """Path of a character's journal file"""
+    return os.path.join(save_directory, f"{character_name}_save.journal")
+
+def _journal_stamp(save_directory, character_name):
+    """
+    Cheap fingerprint of a character's snapshot and journal files
+    
+    If it changes between two SaveJournal.save calls, something else
+    wrote the files and the cached state must be rebuilt.
+    """
+    filenames = [os.path.join(save_directory, character_name + suffix)
+                 for suffix in SAVE_FORMATS.values()]
+    filenames.append(_journal_filename(character_name, save_directory))
+
+    stamp = []
+    for filename in filenames:
+        try:
+            st = os.stat(filename)
+        except OSError:
+            stamp.append(None)
+            continue
+        stamp.append((st.st_ino, st.st_size, st.st_mtime_ns))
+    return tuple(stamp)
+
+def _format_journal_record(record):
+    """Format a record as a journal line with its checksum"""
+    body = f"{record[0]} {record[1]}"
+    return f"{zlib.crc32(body.encode('utf-8')):08x} {body}\n"
+
+def _read_journal(filename, journal_id):
+    """
+    Read the complete records of a journal file
+    
+    Reading stops at the first torn or damaged record.
+    
+    Returns: Tuple (records, end offset of the last good record), or
+             ([], None) if the file is missing or belongs to another snapshot
+    """
+    try:
+        with open(filename, "rb") as f:
+            data = f.read()
+    except OSError:
+        return [], None
+
+    header = f"JOURNAL {journal_id}\n".encode("utf-8")
+    if not data.startswith(header):
+        return [], None
+
+    records = []
+    end = len(header)
+    while end < len(data):
+        newline = data.find(b"\n", end)
+        if newline == -1:
+            break
+        try:
+            checksum, body = data[end:newline].decode("utf-8").split(" ", 1)
+            if int(checksum, 16) != zlib.crc32(body.encode("utf-8")):
+                break
+            op, argument = body.split(" ", 1)
+        except ValueError:
+            break
+        records.append((op, argument))
+        end = newline + 1
+    return records, end
+
+# ============================================================================
+# SAVE STORES
+# ============================================================================
+
+# Save locations with these extensions are SQLite databases, not directories
+SAVE_STORE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+# Open stores, by absolute path
+_save_stores = {}
+_save_stores_lock = threading.Lock()
+
+class SQLiteSaveStore:
+    """
+    Save store that keeps every character in one SQLite database
+    
+    Each character is one row keyed (and indexed) by name, holding the same
+    text as a save file. Listing names is a single index scan instead of
+    a directory scan, and save_many writes any number of characters in one
+    transaction.
+    
+    The database uses WAL mode, so loading and listing do not wait for
+    writes, with synchronous=FULL so a committed save survives a power
+    loss like a fsynced save file does. The connection is shared between
+    threads (the background SaveWriter and the game) behind a lock.
+    
+    Any object with the same save/save_many/load/list_names/delete methods
+    can be passed where a save directory is expected.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(filename)
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(filename, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=FULL")
+            with self._connection:
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS characters ("
+                    "name TEXT PRIMARY KEY, data TEXT NOT NULL) WITHOUT ROWID"
+                )
+        except (OSError, sqlite3.Error) as e:
+            raise SaveFileCorruptedError(f"{filename}: {e}")
+
+    def save(self, character):
+        """
+        Save one character
+        
+        Returns: True if successful
+        Raises: SaveFileCorruptedError if the database cannot be written
+        """
+        self.save_many([character])
+        return True
+
+    def save_many(self, characters):
+        """
+        Save many characters in a single transaction
+        
+        Returns: Number of characters saved
+        Raises: SaveFileCorruptedError if the database cannot be written
+        """
+        rows = [(character["name"], _format_save_text(character))
+                for character in characters]
+        try:
+            with self._lock, self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO characters (name, data) VALUES (?, ?)",
+                    rows
+                )
+        except sqlite3.Error as e:
+            raise SaveFileCorruptedError(f"{self.filename}: {e}")
+        return len(rows)
+
+    def load(self, character_name):
+        """
+        Load one character
+        
+        Returns: Character record
+        Raises:
+            CharacterNotFoundError if the character is not in the store
+            SaveFileCorruptedError if the database cannot be read
+            InvalidSaveDataError if the saved data is not valid
+        """
+        try:
+            with self._lock:
+                row = self._connection.execute(
+                    "SELECT data FROM characters WHERE name = ?", (character_name,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            raise SaveFileCorruptedError(f"{self.filename}: {e}")
+
+        if row is None:
+            raise CharacterNotFoundError(f"No save found for {character_name}.")
+        character, _ = _parse_save_lines(row[0].splitlines())
+        return character
+
+    def list_names(self):
+        """
+        Get the names of all saved characters, sorted
+        
+        Returns: List of character names
+        """
+        try:
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT name FROM characters ORDER BY name"
+                ).fetchall()
+        except sqlite3.Error:
+            return []
+        return [name for (name,) in rows]
+
+    def delete(self, character_name):
+        """
+        Delete one character
+        
+        Returns: True if deleted successfully
+        Raises: CharacterNotFoundError if character doesn't exist
+        """
+        try:
+            with self._lock, self._connection:
+                deleted = self._connection.execute(
+                    "DELETE FROM characters WHERE name = ?", (character_name,)
+                ).rowcount
+        except sqlite3.Error as e:
+            raise SaveFileCorruptedError(f"{self.filename}: {e}")
+
+        if not deleted:
+            raise CharacterNotFoundError(f"{character_name} does not exist.")
+        return True
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._connection.close()
+
+def get_save_store(location):
+    """
+    Get the save store for a save location
+    
+    A location ending in one of SAVE_STORE_EXTENSIONS opens (once) an
+    SQLiteSaveStore. A store object is returned as is. Any other location
+    is a directory of save files.
+    
+    Returns: Save store, or None for a save directory
+    Raises: SaveFileCorruptedError if the database cannot be opened
+    """
+    if not isinstance(location, (str, os.PathLike)):
+        return location
+
+    location = os.fspath(location)
+    if not location.lower().endswith(SAVE_STORE_EXTENSIONS):
+        return None
+
+    path = os.path.abspath(location)
+    with _save_stores_lock:
+        store = _save_stores.get(path)
+        if store is None:
+            if not _save_stores:
+                atexit.register(close_save_stores)
+            store = _save_stores[path] = SQLiteSaveStore(path)
+    return store
+
+def close_save_stores():
+    """Close every store opened by get_save_store"""
+    with _save_stores_lock:
+        for store in _save_stores.values():
+            store.close()
+        _save_stores.clear()
+
+def migrate_save_files(save_directory="data/save_games",
+                       database="data/save_games.db"):
+    """
+    Import every save file in save_directory into a save store
+    
+    Journals are replayed, so the store gets each character's latest
+    state. All characters are written in one transaction. The save files
+    are left in place.
+    
+    Args:
+        save_directory: Directory containing _save.txt files
+        database: Save store location (e.g. a .db path)
+    
+    Returns: Tuple (number of characters imported, names that failed to load)
+    Raises: SaveFileCorruptedError if the store cannot be written
+    """
+    characters = []
+    failed = []
+    for name in sorted(list_saved_characters(save_directory)):
+        try:
+            characters.append(load_character(name, save_directory))
+        except Exception:
+            failed.append(name)
+
+    store = get_save_store(database)
+    if store is None:
+        raise SaveFileCorruptedError(f"{database} is not a save store.")
+    return store.save_many(characters), failed
+
+# ============================================================================
+# FILE HELPERS
+# ============================================================================
+
+def _write_file_atomic(filename, text):
+    """
+    Replace filename with text (str or bytes) without ever leaving a
+    partial file
+    
+    Writes to a temp file next to filename, fsyncs it, then renames it
+    over filename. The temp file is removed if anything fails.
+    """
+    directory = os.path.dirname(filename) or "."
+    fd, temp_path = tempfile.mkstemp(
+        dir=directory, prefix="." + os.path.basename(filename) + ".", suffix=".tmp"
+    )
+    try:
+        if isinstance(text, bytes):
+            f = os.fdopen(fd, "wb")
+        else:
+            f = os.fdopen(fd, "w", encoding="utf-8")
+        with f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file as owner-only; keep the permissions of
+        # the file being replaced, or use what open() would have given
+        os.chmod(temp_path, _replacement_mode(filename))
+        os.replace(temp_path, filename)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+def _replacement_mode(filename):
+    """Permission bits for a new version of filename"""
+    try:
+        return os.stat(filename).st_mode & 0o7777
+    except OSError:
+        return 0o666 & ~_current_umask()
+
+def _current_umask():
+    """
+    Get the process umask
+    
+    Read from /proc where possible, because os.umask can only be read by
+    setting it, which would race with other threads creating files.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+    mask = os.umask(0o022)
+    os.umask(mask)
+    return mask
+
+def _fsync_directory(directory):
+    """
+    Flush a directory entry so renames inside it are durable
+    
+    Silently does nothing on platforms that cannot open directories.
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
 # ============================================================================
 # CHARACTER OPERATIONS
 # ============================================================================
@@ -242,31 +1798,64 @@ def gain_experience(character, xp_amount):
     - Increase magic by 2
     - Restore health to max_health
     
+    Big grants are applied in one step: levels_for_experience works out how
+    many levels the XP buys, and the stat gains are multiplied by that.
+    
     Raises: CharacterDeadError if character health is 0
     """
     if character["health"] <= 0:
         raise CharacterDeadError("Cannot gain XP while dead.")
 
-    character["experience"] += xp_amount
-
-    leveled_up = False
+    experience = character["experience"] + xp_amount
+    level = character["level"]
+    levels = levels_for_experience(level, experience)
 
-    while character["experience"] >= character["level"] * 100:
-        character["experience"] -= character["level"] * 100
-        character["level"] += 1
-        character["max_health"] += 10
-        character["strength"] += 2
-        character["magic"] += 2
-        character["health"] = character["max_health"]
-        leveled_up = True
+    character["experience"] = experience - level_up_cost(level, levels)
+    if not levels:
+        return False
 
-    return leveled_up
+    character["level"] = level + levels
+    character["max_health"] += 10 * levels
+    character["strength"] += 2 * levels
+    character["magic"] += 2 * levels
+    character["health"] = character["max_health"]
+    return True
     # TODO: Implement experience gain and leveling
     # Check if character is dead first
     # Add experience
     # Check for level up (can level up multiple times)
     # Update stats on level up
 
+def level_up_cost(level, levels):
+    """
+    XP needed to go up levels levels starting at level
+    
+    100 * (level + (level + 1) + ... + (level + levels - 1))
+    """
+    return 100 * (levels * level + levels * (levels - 1) // 2)
+
+def levels_for_experience(level, experience):
+    """
+    How many levels experience buys starting at level
+    
+    Solves level_up_cost(level, k) <= experience for the largest k:
+    50k^2 + 50(2*level - 1)k <= experience, a quadratic in k. The integer
+    square root gives k to within one, and the two loops below fix the
+    rounding exactly.
+    
+    Returns: Number of levels (0 if experience is below the next threshold)
+    """
+    if experience < level * 100:
+        return 0
+
+    b = 2 * level - 1
+    levels = max(0, (math.isqrt(int(25 * b * b + 2 * experience)) // 5 - b) // 2)
+    while level_up_cost(level, levels + 1) <= experience:
+        levels += 1
+    while levels and level_up_cost(level, levels) > experience:
+        levels -= 1
+    return levels
+
 def add_gold(character, amount):
     """
     Add gold to character's inventory
@@ -363,8 +1952,11 @@ def validate_character_data(character):
         if not isinstance(character[field], int):
             raise InvalidSaveDataError(f"Field {field} must be an integer.")
 
-    for field in ["inventory", "active_quests", "completed_quests"]:
-        if not isinstance(character[field], list):
+    if not isinstance(character["inventory"], (list, Inventory)):
+        raise InvalidSaveDataError("Field inventory must be a list.")
+
+    for field in ["active_quests", "completed_quests"]:
+        if not isinstance(character[field], (list, QuestSet)):
             raise InvalidSaveDataError(f"Field {field} must be a list.")
 
     return True
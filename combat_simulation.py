@@ -0,0 +1,337 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Combat Simulation Module
+
+Monte-Carlo battle simulator for balance tuning.
+
+simulate() runs many battles of one class against one enemy type at once,
+with every battle's health stored in NumPy arrays and each turn applied
+as array operations. simulate_grid() does the same for a whole
+class x enemy x level grid in one pass. simulate_reference() plays the same battles one at
+a time through combat_system.SimpleBattle, so results can be cross-checked
+on small runs.
+
+NumPy is only needed for simulate() and simulate_grid().
+"""
+
+import math
+import random
+
+import character_manager
+import combat_system
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Player actions a simulation policy can choose every turn
+SIMULATION_ACTIONS = ("attack", "special")
+
+# Outcome codes used in the result arrays
+ONGOING, WIN, LOSS, ESCAPED, TIMEOUT = 0, 1, 2, 3, 4
+
+# ============================================================================
+# SIMULATION SETUP
+# ============================================================================
+
+class SimulationPolicy:
+    """
+    Headless battle policy used by the simulator
+    
+    Uses the same action every turn, but tries to run away once health
+    drops below flee_below * max_health.
+    """
+
+    def __init__(self, action="special", flee_below=0.0):
+        if action not in SIMULATION_ACTIONS:
+            raise ValueError(f"Unknown simulation action: {action}")
+        self.action = action
+        self.flee_below = flee_below
+
+    def choose_action(self, battle):
+        """Pick this turn's action for battle"""
+        character = battle.character
+        if character["health"] < self.flee_below * character["max_health"]:
+            return "run"
+        return self.action
+
+def create_leveled_character(character_class, level):
+    """
+    Create a character and level it up to level through gain_experience
+    
+    Returns: Character record at full health
+    Raises: InvalidCharacterClassError if class is not valid
+    """
+    character = character_manager.create_character("Simulated", character_class)
+    character_manager.gain_experience(
+        character, character_manager.level_up_cost(1, level - 1)
+    )
+    return character
+
+# ============================================================================
+# VECTORIZED SIMULATION
+# ============================================================================
+
+def simulate(character_class, enemy_type, level=1, battles=1000000,
+             action="special", flee_below=0.0, max_turns=200,
+             seconds_per_turn=6.0, seed=None):
+    """
+    Simulate many battles at once with NumPy
+    
+    Each turn matches SimpleBattle: the player acts (basic attack via
+    calculate_damage, the class special ability, or a 50% escape attempt
+    when fleeing), then the enemy attacks if the battle is still going.
+    
+    Args:
+        character_class: Warrior, Mage, Rogue or Cleric
+        enemy_type: Enemy type for create_enemy
+        level: Character level
+        battles: Number of battles to run
+        action: "attack" or "special", used every turn
+        flee_below: Try to escape when health < flee_below * max_health
+        max_turns: Battles still going after this many turns time out
+        seconds_per_turn: Play time of one turn, for per-minute rates
+        seed: Optional seed for numpy's random generator
+    
+    Returns: Result dictionary (see summarize_results)
+    Raises: ImportError if NumPy is not installed
+    """
+    results = simulate_grid([character_class], [enemy_type], [level], battles,
+                            action, flee_below, max_turns, seconds_per_turn, seed)
+    return results[(character_class, enemy_type, level)]
+
+def simulate_grid(character_classes, enemy_types, levels, battles=100000,
+                  action="special", flee_below=0.0, max_turns=200,
+                  seconds_per_turn=6.0, seed=None):
+    """
+    Simulate every class x enemy x level combination in one pass
+    
+    The stats of each combination are repeated once per battle, so the
+    turn loop runs once over all combinations' battles together.
+    
+    Args:
+        character_classes: Classes to simulate
+        enemy_types: Enemy types to simulate
+        levels: Character levels to simulate
+        battles: Number of battles per combination
+        (other arguments as for simulate)
+    
+    Returns: Dictionary {(class, enemy_type, level): result dictionary}
+    Raises: ImportError if NumPy is not installed
+    """
+    if np is None:
+        raise ImportError("simulate() requires NumPy; use simulate_reference()")
+
+    if action not in SIMULATION_ACTIONS:
+        raise ValueError(f"Unknown simulation action: {action}")
+
+    combinations = [
+        (character_class, enemy_type, level)
+        for character_class in character_classes
+        for enemy_type in enemy_types
+        for level in levels
+    ]
+    enemies = []
+    stats = []
+    for character_class, enemy_type, level in combinations:
+        character = create_leveled_character(character_class, level)
+        enemy = combat_system.create_enemy(enemy_type)
+        enemies.append(enemy)
+        stats.append(_battle_stats(character, enemy, action, flee_below))
+
+    # One row per combination, one column per stat, repeated per battle
+    stats = np.repeat(np.array(stats, dtype=np.int32), battles, axis=0)
+    outcomes, turns = _run_battles(stats, max_turns, np.random.default_rng(seed))
+    outcomes = outcomes.reshape(len(combinations), battles)
+    turns = turns.reshape(len(combinations), battles)
+
+    results = {}
+    for index, combination in enumerate(combinations):
+        results[combination] = summarize_results(
+            outcomes[index], turns[index], enemies[index], seconds_per_turn,
+            np.bincount(turns[index]).tolist()
+        )
+    return results
+
+def _battle_stats(character, enemy, action, flee_below):
+    """
+    Per-turn numbers of one class/enemy matchup for _run_battles
+    
+    Returns: Tuple (player health, max health, enemy health, player damage,
+             needs luck, heal, enemy damage, flee health), all integers
+    """
+    char_class = character["class"].lower()
+    strength = character["strength"]
+    max_health = character["max_health"]
+
+    damage = max(1, strength - enemy["strength"] // 4)
+    needs_luck = 0
+    heal = 0
+    if action == "special":
+        if char_class == "warrior":
+            damage = strength * 2
+        elif char_class == "mage":
+            damage = character["magic"] * 2
+        elif char_class == "rogue":
+            damage = strength * 3
+            needs_luck = 1
+        elif char_class == "cleric":
+            damage = 0
+            heal = 30
+
+    # Health is whole, so health < flee_below * max_health exactly when
+    # health < the rounded-up threshold
+    return (character["health"], max_health, enemy["health"], damage,
+            needs_luck, heal, max(1, enemy["strength"] - strength // 4),
+            math.ceil(flee_below * max_health))
+
+def _run_battles(stats, max_turns, rng):
+    """
+    Play every battle in stats (one _battle_stats row per battle) at once
+    
+    Battles still in progress keep their stats as columns of one array,
+    which is shrunk in a single step when some of them finish.
+    
+    Returns: Tuple (outcome codes, turn counts), one entry per battle
+    """
+    battles = len(stats)
+    state = np.ascontiguousarray(stats.T)
+    active = np.arange(battles)
+    outcomes = np.full(battles, TIMEOUT, dtype=np.int8)
+    turns = np.full(battles, max_turns, dtype=np.int64)
+
+    for turn in range(1, max_turns + 1):
+        if active.size == 0:
+            break
+
+        (p_health, max_health, e_health, damage, needs_luck, heal,
+         enemy_damage, flee_health) = state
+        lucky = rng.random(active.size) < 0.5
+
+        # Player turn (rogue critical strikes and escapes need a lucky roll)
+        fleeing = p_health < flee_health
+        acting = ~fleeing
+        escaped = fleeing & lucky
+
+        np.subtract(e_health, damage, out=e_health, where=acting & (lucky >= needs_luck))
+        np.add(p_health, heal, out=p_health, where=acting)
+        np.minimum(p_health, max_health, out=p_health)
+
+        won = e_health <= 0
+
+        # Enemy turn
+        attacked = ~(won | escaped)
+        np.subtract(p_health, enemy_damage, out=p_health, where=attacked)
+        lost = attacked & (p_health <= 0)
+
+        finished = won | escaped | lost
+        if finished.any():
+            ended = active[finished]
+            outcomes[ended] = np.select(
+                [won[finished], escaped[finished]], [WIN, ESCAPED], LOSS
+            )
+            turns[ended] = turn
+            still_going = ~finished
+            active = active[still_going]
+            state = state.compress(still_going, axis=1)
+
+    return outcomes, turns
+
+# ============================================================================
+# SCALAR REFERENCE
+# ============================================================================
+
+def simulate_reference(character_class, enemy_type, level=1, battles=1000,
+                       action="special", flee_below=0.0, max_turns=200,
+                       seconds_per_turn=6.0, seed=None):
+    """
+    Simulate battles one at a time through SimpleBattle
+    
+    Takes the same arguments as simulate() and returns the same result
+    dictionary. Slow, but uses the real combat code, so it is the
+    reference for checking simulate() on small runs.
+    """
+    policy = SimulationPolicy(action, flee_below)
+    rng = random.Random(seed)
+    codes = {"player": WIN, "enemy": LOSS, "escaped": ESCAPED, "timeout": TIMEOUT}
+
+    outcomes = []
+    turns = []
+    histogram = [0] * (max_turns + 1)
+    enemy = None
+
+    for _ in range(battles):
+        character = create_leveled_character(character_class, level)
+        enemy = combat_system.create_enemy(enemy_type)
+        battle = combat_system.SimpleBattle(character, enemy, policy=policy, rng=rng)
+
+        result = battle.start_battle(max_turns=max_turns)
+        outcomes.append(codes[result["winner"]])
+        turns.append(battle.turn_counter)
+        histogram[battle.turn_counter] += 1
+
+    return summarize_results(outcomes, turns, enemy, seconds_per_turn, histogram)
+
+# ============================================================================
+# RESULTS
+# ============================================================================
+
+def summarize_results(outcomes, turns, enemy, seconds_per_turn, histogram):
+    """
+    Build the result dictionary shared by simulate and simulate_reference
+    
+    Returns: Dictionary with:
+            - battles, win_rate, loss_rate, escape_rate, timeout_rate
+            - mean_turns, turn_histogram (index = turns, value = battles)
+            - xp_per_battle, gold_per_battle
+            - xp_per_minute, gold_per_minute
+    """
+    battles = len(outcomes)
+    counts = {WIN: 0, LOSS: 0, ESCAPED: 0, TIMEOUT: 0}
+    if np is not None and not isinstance(outcomes, list):
+        for code, count in enumerate(np.bincount(outcomes, minlength=5).tolist()):
+            if code in counts:
+                counts[code] = count
+        total_turns = int(turns.sum())
+    else:
+        for code in outcomes:
+            counts[code] += 1
+        total_turns = sum(turns)
+
+    wins = counts[WIN]
+    minutes = total_turns * seconds_per_turn / 60
+    total_xp = wins * enemy["xp_reward"]
+    total_gold = wins * enemy["gold_reward"]
+
+    while len(histogram) > 1 and histogram[-1] == 0:
+        histogram = histogram[:-1]
+
+    return {
+        "battles": battles,
+        "win_rate": wins / battles,
+        "loss_rate": counts[LOSS] / battles,
+        "escape_rate": counts[ESCAPED] / battles,
+        "timeout_rate": counts[TIMEOUT] / battles,
+        "mean_turns": total_turns / battles,
+        "turn_histogram": histogram,
+        "xp_per_battle": total_xp / battles,
+        "gold_per_battle": total_gold / battles,
+        "xp_per_minute": total_xp / minutes if minutes else 0.0,
+        "gold_per_minute": total_gold / minutes if minutes else 0.0
+    }
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== COMBAT SIMULATION TEST ===")
+
+    for character_class in ["Warrior", "Mage", "Rogue", "Cleric"]:
+        result = simulate(character_class, "orc", level=3, battles=1000000,
+                          flee_below=0.25, seed=1)
+        print(f"{character_class:8} vs orc (lvl 3): "
+              f"win {result['win_rate']:.3f}, "
+              f"turns {result['mean_turns']:.2f}, "
+              f"{result['xp_per_minute']:.1f} XP/min")
@@ -9,6 +9,8 @@ AI Usage: used to check for errors and formatting.
 Handles combat mechanics
 """
 import random
+import game_data
+from character_manager import Character
 from custom_exceptions import (
     InvalidTargetError,
     CombatNotActiveError,
@@ -29,43 +31,18 @@ def create_enemy(enemy_type):
     - orc: health=80, strength=12, magic=5, xp_reward=50, gold_reward=25
     - dragon: health=200, strength=25, magic=15, xp_reward=200, gold_reward=100
     
+    Enemy stats come from data/enemies.txt (see
+    game_data.get_enemy_prototypes); each call copies the prototype.
+    
     Returns: Enemy dictionary
     Raises: InvalidTargetError if enemy_type not recognized
     """
-    enemy_type = enemy_type.lower()
-    enemies = {
-        "goblin": {
-            "name": "Goblin",
-            "health": 50,
-            "max_health": 50,
-            "strength": 8,
-            "magic": 2,
-            "xp_reward": 25,
-            "gold_reward": 10
-        },
-        "orc": {
-            "name": "Orc",
-            "health": 80,
-            "max_health": 80,
-            "strength": 12,
-            "magic": 5,
-            "xp_reward": 50,
-            "gold_reward": 25
-        },
-        "dragon": {
-            "name": "Dragon",
-            "health": 200,
-            "max_health": 200,
-            "strength": 25,
-            "magic": 15,
-            "xp_reward": 200,
-            "gold_reward": 100
-        }
-    }
-    if enemy_type not in enemies:
-        raise InvalidTargetError(f"Unknown enemy type: {enemy_type}")
+    enemies = game_data.get_enemy_prototypes()
+    prototype = enemies.get(enemy_type.lower())
+    if prototype is None:
+        raise InvalidTargetError(f"Unknown enemy type: {enemy_type.lower()}")
 
-    return enemies[enemy_type].copy()
+    return prototype.copy()
 
     # TODO: Implement enemy creation
     # Return dictionary with: name, health, max_health, strength, magic, xp_reward, gold_reward
@@ -96,63 +73,120 @@ def get_random_enemy_for_level(character_level):
 # COMBAT SYSTEM
 # ============================================================================
 
+# Player actions by menu number and by name
+ACTION_CHOICES = {
+    "1": "1", "attack": "1",
+    "2": "2", "special": "2",
+    "3": "3", "run": "3"
+}
+
 class SimpleBattle:
     """
     Simple turn-based combat system
     
     Manages combat between character and enemy
+    
+    By default the player is prompted with input() and the battle is
+    printed. Passing a policy makes the battle headless: the policy picks
+    each action and nothing is printed. Battle messages can be sent to
+    event_sink instead, as dictionaries.
     """
     
-    def __init__(self, character, enemy):
-        """Initialize battle with character and enemy"""
+    def __init__(self, character, enemy, policy=None, event_sink=None, rng=None):
+        """
+        Initialize battle with character and enemy
+        
+        Args:
+            character: Character dictionary
+            enemy: Enemy dictionary
+            policy: Optional object with choose_action(battle), or a list
+                    of actions; makes the battle headless
+            event_sink: Optional callable that receives each battle event
+            rng: Optional random.Random; defaults to the random module
+        """
         self.character = character
         self.enemy = enemy
         self.combat_active = True
         self.turn_counter = 1
+        if isinstance(policy, (list, tuple)):
+            policy = ScriptedPolicy(policy)
+        self.policy = policy
+        self.event_sink = event_sink
+        self.rng = rng if rng is not None else random
         # TODO: Implement initialization
         # Store character and enemy
         # Set combat_active flag
         # Initialize turn counter
     
-    def start_battle(self):
+    def start_battle(self, max_turns=None):
         """
         Start the combat loop
         
+        If max_turns is set, a battle still going after that many turns
+        ends with winner 'timeout'.
+        
         Returns: Dictionary with battle results:
-                {'winner': 'player'|'enemy', 'xp_gained': int, 'gold_gained': int}
+                {'winner': 'player'|'enemy'|'escaped'|'timeout',
+                 'xp_gained': int, 'gold_gained': int}
         
         Raises: CharacterDeadError if character is already dead
         """
-        if self.character["health"] <= 0:
+        character = self.character
+        if type(character) is Character:
+            health = character.health
+        else:
+            health = character["health"]
+        if health <= 0:
             raise CharacterDeadError("Character is dead before battle starts.")
 
-        display_battle_log("Battle begins!")
+        self.log("Battle begins!")
+        result = None
 
         while self.combat_active:
-            display_combat_stats(self.character, self.enemy)
+            if self.policy is None:
+                display_combat_stats(self.character, self.enemy)
 
             self.player_turn()
             result = self.check_battle_end()
             if result:
                 break
 
+            if not self.combat_active:
+                self.emit("end", "escaped")
+                return {
+                    "winner": "escaped",
+                    "xp_gained": 0,
+                    "gold_gained": 0
+                }
+
             self.enemy_turn()
             result = self.check_battle_end()
             if result:
                 break
 
+            if max_turns is not None and self.turn_counter >= max_turns:
+                self.combat_active = False
+                self.emit("end", "timeout")
+                return {
+                    "winner": "timeout",
+                    "xp_gained": 0,
+                    "gold_gained": 0
+                }
+
             self.turn_counter += 1
 
         if result == "player":
             rewards = get_victory_rewards(self.enemy)
-            display_battle_log("You won the battle!")
+            self.log("You won the battle!")
+            self.emit("end", "player")
             return {
                 "winner": "player",
                 "xp_gained": rewards["xp"],
                 "gold_gained": rewards["gold"]
             }
 
-        display_battle_log("You were defeated...")
+        self.log("You were defeated...")
+        self.emit("end", "enemy")
         return {
             "winner": "enemy",
             "xp_gained": 0,
@@ -178,35 +212,41 @@ class SimpleBattle:
         if not self.combat_active:
             raise CombatNotActiveError("Battle is not active.")
 
-        print("\n--- PLAYER TURN ---")
-        print("1. Basic Attack")
-        print("2. Special Ability")
-        print("3. Run")
+        if self.policy is None:
+            print("\n--- PLAYER TURN ---")
+            print("1. Basic Attack")
+            print("2. Special Ability")
+            print("3. Run")
 
-        choice = input("Choose action: ").strip()
+            choice = input("Choose action: ").strip()
+        else:
+            choice = str(self.policy.choose_action(self)).strip().lower()
+
+        choice = ACTION_CHOICES.get(choice, choice)
+        self.emit("action", choice)
 
         if choice == "1":
             dmg = self.calculate_damage(self.character, self.enemy)
             self.apply_damage(self.enemy, dmg)
-            display_battle_log(f"You deal {dmg} damage!")
+            self.log(f"You deal {dmg} damage!")
         
         elif choice == "2":
             try:
-                message = use_special_ability(self.character, self.enemy)
-                display_battle_log(message)
+                message = use_special_ability(self.character, self.enemy, self.rng)
+                self.log(message)
             except AbilityOnCooldownError:
-                display_battle_log("Ability is on cooldown!")
+                self.log("Ability is on cooldown!")
 
         elif choice == "3":
             escaped = self.attempt_escape()
             if escaped:
-                display_battle_log("You escaped successfully!")
+                self.log("You escaped successfully!")
                 return
             else:
-                display_battle_log("Escape failed!")
+                self.log("Escape failed!")
 
         else:
-            display_battle_log("Invalid choice. You lose your turn!")
+            self.log("Invalid choice. You lose your turn!")
 
         # TODO: Implement player turn
         # Check combat is active
@@ -225,10 +265,11 @@ class SimpleBattle:
         if not self.combat_active:
             raise CombatNotActiveError("Battle is not active.")
 
-        print("\n--- ENEMY TURN ---")
+        if self.policy is None:
+            print("\n--- ENEMY TURN ---")
         dmg = self.calculate_damage(self.enemy, self.character)
         self.apply_damage(self.character, dmg)
-        display_battle_log(f"{self.enemy['name']} attacks for {dmg} damage!")
+        self.log(f"{self.enemy['name']} attacks for {dmg} damage!")
 
         # TODO: Implement enemy turn
         # Check combat is active
@@ -242,10 +283,21 @@ class SimpleBattle:
         Damage formula: attacker['strength'] - (defender['strength'] // 4)
         Minimum damage: 1
         
+        Character records are read through their attributes, which is
+        faster than subscripting them.
+        
         Returns: Integer damage amount
         """
-        dmg = attacker["strength"] - (defender["strength"] // 4)
-        return max(1, dmg)
+        if type(attacker) is Character:
+            strength = attacker.strength
+        else:
+            strength = attacker["strength"]
+        if type(defender) is Character:
+            armor = defender.strength // 4
+        else:
+            armor = defender["strength"] // 4
+        dmg = strength - armor
+        return dmg if dmg > 1 else 1
         # TODO: Implement damage calculation
     
     def apply_damage(self, target, damage):
@@ -254,6 +306,11 @@ class SimpleBattle:
         
         Reduces health, prevents negative health
         """
+        if type(target) is Character:
+            health = target.health - damage
+            target.health = health if health > 0 else 0
+            target.mark_changed()
+            return
         target["health"] -= damage
         if target["health"] < 0:
             target["health"] = 0
@@ -268,7 +325,12 @@ class SimpleBattle:
         if self.enemy["health"] <= 0:
             self.combat_active = False
             return "player"
-        if self.character["health"] <= 0:
+        character = self.character
+        if type(character) is Character:
+            health = character.health
+        else:
+            health = character["health"]
+        if health <= 0:
             self.combat_active = False
             return "enemy"
         return None
@@ -282,7 +344,7 @@ class SimpleBattle:
         
         Returns: True if escaped, False if failed
         """
-        success = random.random() < 0.5
+        success = self.rng.random() < 0.5
         if success:
             self.combat_active = False
         return success
@@ -290,11 +352,82 @@ class SimpleBattle:
         # Use random number or simple calculation
         # If successful, set combat_active to False
 
+    def log(self, message):
+        """
+        Report a battle message
+        
+        Printed in interactive mode, sent to event_sink as a "log" event
+        if one is set, and dropped otherwise.
+        """
+        if self.event_sink is not None:
+            self.emit("log", message)
+        elif self.policy is None:
+            display_battle_log(message)
+
+    def emit(self, event_type, value):
+        """Send a structured event to event_sink, if one is set"""
+        if self.event_sink is not None:
+            self.event_sink({
+                "type": event_type,
+                "turn": self.turn_counter,
+                "value": value,
+                "player_health": self.character["health"],
+                "enemy_health": self.enemy["health"]
+            })
+
+# ============================================================================
+# HEADLESS BATTLES
+# ============================================================================
+
+class ScriptedPolicy:
+    """
+    Battle policy that plays a precomputed list of actions
+    
+    Actions may be menu numbers ("1", "2", "3") or names ("attack",
+    "special", "run"). Once the list runs out, default is used.
+    """
+
+    def __init__(self, actions, default="attack"):
+        self.actions = list(actions)
+        self.default = default
+        self.position = 0
+
+    def choose_action(self, battle):
+        """Return the next scripted action"""
+        if self.position < len(self.actions):
+            action = self.actions[self.position]
+            self.position += 1
+            return action
+        return self.default
+
+def run_headless_battle(character, enemy, policy, seed=None, event_sink=None):
+    """
+    Run a battle with no input() and no printing
+    
+    Given the same seed and actions, the result matches an interactive
+    battle played after random.seed(seed).
+    
+    Args:
+        character: Character dictionary
+        enemy: Enemy dictionary
+        policy: Policy object or list of actions (see SimpleBattle)
+        seed: Optional seed for this battle's random numbers
+        event_sink: Optional callable that receives battle events
+    
+    Returns: Battle result dictionary from start_battle
+    Raises: CharacterDeadError if character is already dead
+    """
+    battle = SimpleBattle(
+        character, enemy, policy=policy, event_sink=event_sink,
+        rng=random.Random(seed)
+    )
+    return battle.start_battle()
+
 # ============================================================================
 # SPECIAL ABILITIES
 # ============================================================================
 
-def use_special_ability(character, enemy):
+def use_special_ability(character, enemy, rng=None):
     """
     Use character's class-specific special ability
     
@@ -304,6 +437,8 @@ def use_special_ability(character, enemy):
     - Rogue: Critical Strike (3x strength damage, 50% chance)
     - Cleric: Heal (restore 30 health)
     
+    rng is an optional random.Random used for chance-based abilities.
+    
     Returns: String describing what happened
     Raises: AbilityOnCooldownError if ability was used recently
     """
@@ -316,7 +451,7 @@ def use_special_ability(character, enemy):
         return mage_fireball(character, enemy)
 
     elif char_class == "rogue":
-        return rogue_critical_strike(character, enemy)
+        return rogue_critical_strike(character, enemy, rng)
 
     elif char_class == "cleric":
         return cleric_heal(character)
@@ -344,9 +479,9 @@ def mage_fireball(character, enemy):
     # TODO: Implement fireball
     # Double magic damage
 
-def rogue_critical_strike(character, enemy):
+def rogue_critical_strike(character, enemy, rng=None):
     """Rogue special ability"""
-    if random.random() < 0.5:
+    if (rng or random).random() < 0.5:
         dmg = character["strength"] * 3
         enemy["health"] -= dmg
         return f"Critical Strike! Massive {dmg} damage!"
@@ -9,18 +9,106 @@ AI Usage: used to check for errors and understanding sections of code.
 This module handles loading and validating game data from text files.
 """
 
+import io
 import os
+import re
+import mmap
+import zlib
+import types
+import array
+import struct
+import hashlib
+import pickle
+import tempfile
+import functools
+import itertools
+import threading
+import concurrent.futures
+from collections import OrderedDict, namedtuple
+from collections.abc import Mapping
 from custom_exceptions import (
     InvalidDataFormatError,
     MissingDataFileError,
     CorruptedDataError
 )
 
+# Bump whenever the parsed record layout changes so old caches are rebuilt
+# (2: item effects are stored as ItemEffect objects)
+CATALOG_CACHE_VERSION = 2
+CATALOG_CACHE_SUFFIX = ".cache"
+
+# Bytes of a data file each worker parses in load_quests_parallel and
+# load_items_parallel; files no bigger than this are parsed in-process
+PARALLEL_CHUNK_SIZE = 1 << 20
+
+# Parsed records a LazyCatalog keeps before dropping the least recently used
+LAZY_CATALOG_CACHE_SIZE = 256
+
+# Compiled catalogs opened with mmap (see MappedCatalog)
+MAPPED_CATALOG_SUFFIX = ".mcat"
+MAPPED_CATALOG_MAGIC = b"QCMC"
+MAPPED_CATALOG_FORMAT = 1
+
+# The game's own data directory, so class and enemy tables load no matter
+# which directory the game is started from
+DATA_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+CLASSES_FILE = os.path.join(DATA_DIRECTORY, "classes.txt")
+ENEMIES_FILE = os.path.join(DATA_DIRECTORY, "enemies.txt")
+
+# Built-in class and enemy tables, written by create_default_data_files
+DEFAULT_CLASSES = (
+    "CLASS: Warrior\n"
+    "HEALTH: 120\n"
+    "STRENGTH: 15\n"
+    "MAGIC: 5\n\n"
+
+    "CLASS: Mage\n"
+    "HEALTH: 80\n"
+    "STRENGTH: 8\n"
+    "MAGIC: 20\n\n"
+
+    "CLASS: Rogue\n"
+    "HEALTH: 90\n"
+    "STRENGTH: 12\n"
+    "MAGIC: 10\n\n"
+
+    "CLASS: Cleric\n"
+    "HEALTH: 100\n"
+    "STRENGTH: 10\n"
+    "MAGIC: 15\n"
+)
+
+DEFAULT_ENEMIES = (
+    "ENEMY_ID: goblin\n"
+    "NAME: Goblin\n"
+    "HEALTH: 50\n"
+    "STRENGTH: 8\n"
+    "MAGIC: 2\n"
+    "XP_REWARD: 25\n"
+    "GOLD_REWARD: 10\n\n"
+
+    "ENEMY_ID: orc\n"
+    "NAME: Orc\n"
+    "HEALTH: 80\n"
+    "STRENGTH: 12\n"
+    "MAGIC: 5\n"
+    "XP_REWARD: 50\n"
+    "GOLD_REWARD: 25\n\n"
+
+    "ENEMY_ID: dragon\n"
+    "NAME: Dragon\n"
+    "HEALTH: 200\n"
+    "STRENGTH: 25\n"
+    "MAGIC: 15\n"
+    "XP_REWARD: 200\n"
+    "GOLD_REWARD: 100\n"
+)
+
 # ============================================================================
 # DATA LOADING FUNCTIONS
 # ============================================================================
 
-def load_quests(filename="data/quests.txt"):
+def load_quests(filename="data/quests.txt", use_cache=False, lazy=False):
     """
     Load quest data from file
     
@@ -33,38 +121,21 @@ def load_quests(filename="data/quests.txt"):
     REQUIRED_LEVEL: 1
     PREREQUISITE: previous_quest_id (or NONE)
     
+    If use_cache is True, a compiled copy stored next to the file is used
+    when it is still fresh (see load_cached_catalog). If lazy is True, a
+    LazyCatalog is returned instead, which parses each quest on first use.
+    
     Returns: Dictionary of quests {quest_id: quest_data_dict}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
-    if not os.path.exists(filename):
-        raise MissingDataFileError(f"Missing file: {filename}")
-
-    try:
-        with open(filename, "r", encoding="utf-8") as f:
-            content = f.read().strip()
-    except Exception:
-        raise CorruptedDataError("Error reading quests file")
-
-    if not content:
-        raise CorruptedDataError("Quest file is empty or corrupted")
-
-    quests = {}
-    blocks = content.split("\n\n")
+    if lazy:
+        return LazyCatalog(filename, "quest")
+    if use_cache:
+        return load_cached_catalog(filename, "quests", load_quests)
 
-    for block in blocks:
-        lines = [line.strip() for line in block.split("\n") if line.strip()]
-        quest = parse_quest_block(lines)
-        validate_quest_data(quest)
-        quests[quest["quest_id"]] = quest
+    return _index_catalog(_iter_records(filename, "quest"), filename, "quest")
 
-    return quests
-    # TODO: Implement this function
-    # Must handle:
-    # - FileNotFoundError → raise MissingDataFileError
-    # - Invalid format → raise InvalidDataFormatError
-    # - Corrupted/unreadable data → raise CorruptedDataError
-
-def load_items(filename="data/items.txt"):
+def load_items(filename="data/items.txt", use_cache=False, lazy=False):
     """
     Load item data from file
     
@@ -72,37 +143,1156 @@ def load_items(filename="data/items.txt"):
     ITEM_ID: unique_item_name
     NAME: Item Display Name
     TYPE: weapon|armor|consumable
-    EFFECT: stat_name:value (e.g., strength:5 or health:20)
+    EFFECT: stat_name:value (e.g., strength:5 or health:20), or several
+            separated by commas (e.g., strength:5,magic:2)
     COST: 100
     DESCRIPTION: Item description
     
+    If use_cache is True, a compiled copy stored next to the file is used
+    when it is still fresh (see load_cached_catalog). If lazy is True, a
+    LazyCatalog is returned instead, which parses each item on first use.
+    Each item's effect is parsed into an ItemEffect and checked here.
+    
+    Returns: Dictionary of items {item_id: item_data_dict}
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    if lazy:
+        return LazyCatalog(filename, "item")
+    if use_cache:
+        return load_cached_catalog(filename, "items", load_items)
+
+    return _index_catalog(_iter_records(filename, "item"), filename, "item")
+
+def load_classes(filename=CLASSES_FILE):
+    """
+    Load character class base stats from file
+    
+    Expected format per class (separated by blank lines):
+    CLASS: Warrior
+    HEALTH: 120
+    STRENGTH: 15
+    MAGIC: 5
+    
+    Returns: Dictionary of classes {class_name: class_data_dict}
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    classes = {}
+    for start_line, lines in _iter_blocks(filename, "class"):
+        record = _parse_record(
+            parse_stat_block, validate_class_data, lines, filename, start_line
+        )
+        if record["class"] in classes:
+            raise InvalidDataFormatError(
+                f"{filename} line {start_line}: duplicate class {record['class']}"
+            )
+        classes[record["class"]] = record
+    return classes
+
+def load_enemies(filename=ENEMIES_FILE):
+    """
+    Load enemy definitions from file
+    
+    Expected format per enemy (separated by blank lines):
+    ENEMY_ID: goblin
+    NAME: Goblin
+    HEALTH: 50
+    STRENGTH: 8
+    MAGIC: 2
+    XP_REWARD: 25
+    GOLD_REWARD: 10
+    
+    Enemy IDs are case-insensitive and stored lowercase. max_health is set
+    to HEALTH.
+    
+    Returns: Dictionary of enemies {enemy_id: enemy_data_dict}
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    enemies = {}
+    for start_line, lines in _iter_blocks(filename, "enemy"):
+        record = _parse_record(
+            parse_stat_block, validate_enemy_data, lines, filename, start_line
+        )
+        enemy_id = record.pop("enemy_id").lower()
+        if enemy_id in enemies:
+            raise InvalidDataFormatError(
+                f"{filename} line {start_line}: duplicate enemy {enemy_id}"
+            )
+        enemy = {
+            "name": record["name"],
+            "health": record["health"],
+            "max_health": record["health"]
+        }
+        enemy.update(record)
+        enemies[enemy_id] = enemy
+    return enemies
+
+def iter_quests(filename="data/quests.txt"):
+    """
+    Stream quests from file one block at a time
+    
+    The file is read line by line, so memory use stays flat no matter
+    how large the file is. Each quest is parsed and validated as soon
+    as its block ends.
+    
+    Yields: Quest dictionaries in file order
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    for _, quest in _iter_records(filename, "quest"):
+        yield quest
+
+def iter_items(filename="data/items.txt"):
+    """
+    Stream items from file one block at a time
+    
+    Yields: Item dictionaries in file order
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    for _, item in _iter_records(filename, "item"):
+        yield item
+
+def load_cached_catalog(filename, kind, loader):
+    """
+    Load a catalog through its compiled cache file
+    
+    The cache lives at filename + CATALOG_CACHE_SUFFIX and is keyed on the
+    source path, size, mtime and a SHA-256 of its contents. A fresh cache
+    is returned without parsing. A stale, corrupt or truncated cache is
+    ignored and rebuilt atomically from the text file.
+    
+    Args:
+        filename: Path to the text data file
+        kind: Catalog name stored in the cache key ("quests" or "items")
+        loader: Function that parses filename into a catalog dict
+    
+    Returns: Catalog dictionary
+    Raises: Same exceptions as loader
+    """
+    cache_path = filename + CATALOG_CACHE_SUFFIX
+
+    try:
+        key = _catalog_cache_key(filename, kind)
+    except OSError:
+        return loader(filename)
+
+    cached = _read_catalog_cache(cache_path, key)
+    if cached is not None:
+        return cached
+
+    catalog = loader(filename)
+
+    # Only store the result if the file did not change while parsing it
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return catalog
+    if stat.st_size == key["size"] and stat.st_mtime_ns == key["mtime_ns"]:
+        _write_catalog_cache(cache_path, key, catalog)
+
+    return catalog
+
+# ============================================================================
+# PARALLEL LOADING
+# ============================================================================
+
+def load_quests_parallel(filename="data/quests.txt", workers=None,
+                         chunk_size=PARALLEL_CHUNK_SIZE):
+    """
+    Load quest data, parsing chunks of the file in worker processes
+    
+    Gives the same result and the same errors (with the same line
+    numbers) as load_quests; see _iter_parallel_records.
+    
+    Args:
+        filename: Path to the quest file
+        workers: Number of processes (default: one per CPU)
+        chunk_size: Approximate bytes per chunk
+    
+    Returns: Dictionary of quests {quest_id: quest_data_dict}
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    records = _iter_parallel_records(filename, "quest", workers, chunk_size)
+    return _index_catalog(records, filename, "quest")
+
+def load_items_parallel(filename="data/items.txt", workers=None,
+                        chunk_size=PARALLEL_CHUNK_SIZE):
+    """
+    Load item data, parsing chunks of the file in worker processes
+    
+    Gives the same result and the same errors as load_items.
+    
     Returns: Dictionary of items {item_id: item_data_dict}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
+    records = _iter_parallel_records(filename, "item", workers, chunk_size)
+    return _index_catalog(records, filename, "item")
+
+def _iter_parallel_records(filename, label, workers, chunk_size):
+    """
+    Parse a catalog file in chunks and yield its records in file order
+    
+    The file is split into byte ranges that end on blank lines, so no
+    block spans two chunks. Each chunk is parsed and validated in a
+    ProcessPoolExecutor with line numbers counted from the start of the
+    chunk. Results are consumed in chunk order and each chunk's line
+    count is added up, so line numbers (and the first error reported)
+    match a sequential load.
+    
+    Yields: Tuples of (line number, record)
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Missing file: {filename}")
+
+    try:
+        chunks = _chunk_ranges(filename, chunk_size)
+    except OSError:
+        raise CorruptedDataError(f"Error reading {label}s file")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(chunks))
+
+    first_line = 1
+    found = False
+    for records, line_count, error in _parse_chunks(filename, label, chunks, workers):
+        for line, record in records:
+            found = True
+            yield first_line + line - 1, record
+
+        if error is not None:
+            kind, line, message = error
+            line += first_line - 1
+            if kind == "read":
+                raise CorruptedDataError(
+                    f"Error reading {label}s file {filename} near line {line}"
+                )
+            raise InvalidDataFormatError(f"{filename} line {line}: {message}")
+
+        first_line += line_count
+
+    if not found:
+        raise CorruptedDataError(f"{label.capitalize()} file is empty or corrupted")
+
+def _parse_chunks(filename, label, chunks, workers):
+    """
+    Parse every chunk of a catalog file, in worker processes if workers > 1
+    
+    The executor only lives for this call. Chunks after the first one that
+    reports an error are cancelled, since a load stops at that error.
+    
+    Returns: List of _parse_chunk results in chunk order
+    Raises: CorruptedDataError if the worker processes cannot be started
+    """
+    starts = [start for start, _ in chunks]
+    ends = [end for _, end in chunks]
+    names = itertools.repeat(filename)
+    labels = itertools.repeat(label)
+
+    if workers <= 1:
+        results = []
+        for result in map(_parse_chunk, names, labels, starts, ends):
+            results.append(result)
+            if result[2] is not None:
+                break
+        return results
+
+    results = []
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            for result in executor.map(_parse_chunk, names, labels, starts, ends,
+                                       itertools.repeat(True)):
+                results.append(result)
+                if result[2] is not None:
+                    executor.shutdown(cancel_futures=True)
+                    break
+    except OSError:
+        raise CorruptedDataError(f"Error reading {label}s file")
+
+    return results
+
+def _chunk_ranges(filename, chunk_size):
+    """
+    Split a data file into byte ranges that each end after a blank line
+    
+    Returns: List of (start, end) byte offsets covering the whole file
+    Raises: OSError if the file cannot be read
+    """
+    size = os.path.getsize(filename)
+    bounds = [0]
+
+    with open(filename, "rb") as f:
+        target = chunk_size
+        while target < size:
+            f.seek(target)
+            f.readline()
+            line = f.readline()
+            while line.strip():
+                line = f.readline()
+            position = f.tell()
+            if position >= size:
+                break
+            bounds.append(position)
+            target = position + chunk_size
+
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+def _parse_chunk(filename, label, start, end, share_keys=False):
+    """
+    Parse the blocks in bytes [start, end) of a catalog file
+    
+    Runs in a worker process. Line numbers are counted from the start of
+    the chunk, and an error is returned instead of raised so the parent
+    can report it with the line number in the whole file.
+    
+    With share_keys, all records use the same field name strings, which
+    pickle then sends once per chunk instead of once per record.
+    
+    Returns: Tuple of (list of (line, record), number of lines, error)
+             where error is None or (kind, line, message)
+    """
+    parse_block, validate, _ = _CATALOG_FORMATS[label]
+
+    try:
+        with open(filename, "rb") as f:
+            f.seek(start)
+            data = f.read(end - start)
+    except OSError:
+        return [], 0, ("read", 1, None)
+
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError as e:
+        return [], 0, ("read", data.count(b"\n", 0, e.start) + 1, None)
+
+    records = []
+    keys = {}
+    block = []
+    start_line = 0
+    line_number = 0
+
+    # StringIO translates newlines like reading the file in text mode
+    lines = io.StringIO(text, newline=None)
+    for line_number, raw_line in enumerate(itertools.chain(lines, [""]), start=1):
+        line = raw_line.strip()
+        if line:
+            if not block:
+                start_line = line_number
+            block.append(line)
+        elif block:
+            record, error = _try_parse_record(parse_block, validate, block, start_line)
+            if error is not None:
+                return records, 0, ("format",) + error
+            if share_keys:
+                record = {
+                    keys.setdefault(key, key): value for key, value in record.items()
+                }
+            records.append((start_line, record))
+            block = []
+
+    return records, line_number - 1, None
+
+# ============================================================================
+# LAZY CATALOG
+# ============================================================================
+
+class LazyCatalog(Mapping):
+    """
+    Read-only quest or item catalog that parses records on first use
+    
+    Opening the catalog only scans the file for QUEST_ID / ITEM_ID lines
+    and remembers where each block starts and ends. A record is parsed
+    and validated the first time it is looked up, and the most recently
+    used cache_size records are kept. Lookups of other records read their
+    block from disk again.
+    
+    It works anywhere a quest_data_dict is expected: membership and len()
+    never parse anything, and iterating values() or items() parses every
+    record in file order.
+    
+    Records are shared with the cache, so treat them as read-only. The
+    file must not change while the catalog is open.
+    """
+
+    def __init__(self, filename, record_type="quest",
+                 cache_size=LAZY_CATALOG_CACHE_SIZE):
+        """
+        Args:
+            filename: Path to the quest or item file
+            record_type: "quest" or "item"
+            cache_size: Number of parsed records to keep
+        
+        Raises:
+            MissingDataFileError if the file does not exist
+            InvalidDataFormatError if a block has no id or an id repeats
+            CorruptedDataError if the file is empty or cannot be read
+        """
+        if record_type not in _CATALOG_FORMATS:
+            raise ValueError(f"Unknown record type: {record_type}")
+
+        self.filename = filename
+        self.record_type = record_type
+        self.cache_size = cache_size
+        self._parse_block, self._validate, self._id_field = _CATALOG_FORMATS[record_type]
+        self._index, self._starts, self._lines = _scan_block_offsets(
+            filename, record_type, self._id_field
+        )
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getitem__(self, record_id):
+        """
+        Get a record, parsing it if it is not cached
+        
+        Raises:
+            KeyError if record_id is not in the catalog
+            InvalidDataFormatError if the record is malformed
+            CorruptedDataError if the file changed since it was opened
+        """
+        with self._lock:
+            record = self._cache.get(record_id)
+            if record is not None:
+                self._cache.move_to_end(record_id)
+                return record
+
+        position = self._index[record_id]
+        record = self._read_record(
+            record_id, self._starts[position], self._starts[position + 1],
+            self._lines[position]
+        )
+
+        with self._lock:
+            self._cache[record_id] = record
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return record
+
+    def __contains__(self, record_id):
+        return record_id in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __repr__(self):
+        return f"LazyCatalog({self.filename!r}, {self.record_type!r})"
+
+    def cached_count(self):
+        """Number of parsed records currently cached"""
+        return len(self._cache)
+
+    def _read_record(self, record_id, start, end, start_line):
+        try:
+            with open(self.filename, "rb") as f:
+                f.seek(start)
+                text = f.read(end - start).decode("utf-8")
+        except (OSError, UnicodeDecodeError):
+            raise CorruptedDataError(
+                f"Error reading {self.record_type}s file {self.filename} "
+                f"near line {start_line}"
+            )
+
+        # StringIO translates newlines like reading the file in text mode;
+        # the blank lines after the block are read too and skipped here
+        lines = [line.strip() for line in io.StringIO(text, newline=None)]
+        lines = [line for line in lines if line]
+        record = _parse_record(
+            self._parse_block, self._validate, lines, self.filename, start_line
+        )
+        if record[self._id_field] != record_id:
+            raise CorruptedDataError(f"{self.filename} changed since it was opened")
+        return record
+
+# One or more blank lines between blocks, and blank lines at the start
+_BLOCK_SEPARATOR = re.compile(rb"\n(?:[ \t\r\f\v]*\n)+")
+_LEADING_BLANK_LINES = re.compile(rb"(?:[ \t\r\f\v]*\n)*")
+
+def _scan_block_offsets(filename, label, id_field):
+    """
+    Find every block of a catalog file and the id it defines
+    
+    Blocks and id lines are found with regular expressions over the raw
+    bytes, so the scan loops once per block rather than once per line.
+    The id is looked for on the first line of a block before searching
+    the rest of it.
+    
+    Returns: Tuple of (index, starts, lines) where index maps each id to
+             its position in file order, starts holds each block's byte
+             offset (plus the file size at the end) and lines holds each
+             block's first line number
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
     if not os.path.exists(filename):
         raise MissingDataFileError(f"Missing file: {filename}")
 
     try:
-        with open(filename, "r", encoding="utf-8") as f:
-            content = f.read().strip()
+        with open(filename, "rb") as f:
+            data = f.read()
+    except OSError:
+        raise CorruptedDataError(f"Error reading {label}s file")
+
+    id_line = re.compile(
+        rb"^[ \t]*" + re.escape(id_field.encode()) + rb"[ \t]*: (.*)$",
+        re.MULTILINE | re.IGNORECASE
+    )
+    index = {}
+    starts = array.array("q")
+    lines = array.array("q")
+
+    start = _LEADING_BLANK_LINES.match(data).end()
+    line_number = data.count(b"\n", 0, start) + 1
+    separators = [match.span() for match in _BLOCK_SEPARATOR.finditer(data, start)]
+    separators.append((len(data) - 1, len(data)))
+
+    for end, next_start in separators:
+        end += 1
+        match = id_line.match(data, start, end)
+        if match is None and data[start:end].strip():
+            matches = list(id_line.finditer(data, start, end))
+            if not matches:
+                raise InvalidDataFormatError(
+                    f"{filename} line {line_number}: Missing {label} field: {id_field}"
+                )
+            match = matches[-1]
+
+        if match is not None:
+            try:
+                block_id = match.group(1).strip().decode("utf-8")
+            except UnicodeDecodeError:
+                raise CorruptedDataError(
+                    f"Error reading {label}s file {filename} near line {line_number}"
+                )
+            if block_id in index:
+                raise InvalidDataFormatError(
+                    f"{filename} line {line_number}: duplicate {label} {block_id}"
+                )
+            index[block_id] = len(starts)
+            starts.append(start)
+            lines.append(line_number)
+
+        line_number += data.count(b"\n", start, next_start)
+        start = next_start
+
+    if not index:
+        raise CorruptedDataError(f"{label.capitalize()} file is empty or corrupted")
+
+    starts.append(len(data))
+    return index, starts, lines
+
+# ============================================================================
+# MAPPED CATALOG
+# ============================================================================
+
+# magic, format, layout version, field count, id field, record count,
+# hash table slots, heap size, source size, source mtime_ns
+_MAPPED_HEADER = struct.Struct("<4sHHHHIIIqq")
+
+def open_mapped_catalog(filename, record_type="quest"):
+    """
+    Open a quest or item file through its compiled, memory-mapped form
+    
+    The compiled file lives at filename + MAPPED_CATALOG_SUFFIX. It is
+    rebuilt if it is missing, unreadable, or was built from a different
+    size or mtime of filename. Every process that opens it maps the same
+    file, so they share one copy in the page cache.
+    
+    Returns: MappedCatalog
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    compiled = filename + MAPPED_CATALOG_SUFFIX
+
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        raise MissingDataFileError(f"Missing file: {filename}")
+
+    try:
+        catalog = MappedCatalog(compiled)
+    except (OSError, CorruptedDataError):
+        catalog = None
+
+    if catalog is not None:
+        if catalog.source_stamp == (stat.st_size, stat.st_mtime_ns):
+            return catalog
+        catalog.close()
+
+    compile_mapped_catalog(filename, compiled, record_type)
+    return MappedCatalog(compiled)
+
+def compile_mapped_catalog(filename, destination, record_type="quest"):
+    """
+    Parse a quest or item file and write it as a compiled catalog
+    
+    Layout (little-endian):
+    - header (_MAPPED_HEADER), then a uint32 length and the field table:
+      one "name kind" line per field, kind "i" (int64), "s" (string) or
+      "e" (ItemEffect, stored as its text form)
+    - fixed-width records: a uint64 bitmask of the fields present, then
+      8 bytes per field: an int64, or uint32 heap offset + uint32 length
+    - hash table: uint32 slots holding record index + 1 (0 = empty),
+      probed linearly from crc32(utf-8 id)
+    - string heap: UTF-8 strings, each distinct string stored once
+    
+    The file is written to a temp file and moved into place.
+    
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    if record_type not in _CATALOG_FORMATS:
+        raise ValueError(f"Unknown record type: {record_type}")
+    id_field = _CATALOG_FORMATS[record_type][2]
+
+    stat = os.stat(filename)
+    catalog = _index_catalog(_iter_records(filename, record_type), filename, record_type)
+    records = list(catalog.values())
+
+    # Fields in first-seen order, with the id first
+    kinds = {id_field: "s"}
+    for record in records:
+        for key, value in record.items():
+            if isinstance(value, ItemEffect):
+                kind = "e"
+            else:
+                kind = "i" if isinstance(value, int) else "s"
+            if kinds.setdefault(key, kind) != kind:
+                raise InvalidDataFormatError(
+                    f"{filename}: field {key} mixes numbers and text"
+                )
+    fields = list(kinds)
+    if len(fields) > 64:
+        raise InvalidDataFormatError(f"{filename}: too many fields ({len(fields)})")
+
+    record_struct = _mapped_record_struct([kinds[name] for name in fields])
+    heap = bytearray()
+    heap_offsets = {}
+    packed = bytearray()
+
+    for record in records:
+        mask = 0
+        values = []
+        for position, name in enumerate(fields):
+            value = record.get(name)
+            if name in record:
+                mask |= 1 << position
+            if kinds[name] == "i":
+                values.append(value or 0)
+                continue
+            if value is None:
+                values.extend((0, 0))
+                continue
+            data = str(value).encode("utf-8")
+            offset = heap_offsets.get(data)
+            if offset is None:
+                offset = heap_offsets[data] = len(heap)
+                heap += data
+            values.extend((offset, len(data)))
+        try:
+            packed += record_struct.pack(mask, *values)
+        except struct.error:
+            raise InvalidDataFormatError(
+                f"{filename}: number out of range in {record[id_field]}"
+            )
+
+    table_size = 8
+    while table_size < 2 * len(records):
+        table_size *= 2
+    table = [0] * table_size
+    for index, record in enumerate(records):
+        slot = zlib.crc32(record[id_field].encode("utf-8")) & (table_size - 1)
+        while table[slot]:
+            slot = (slot + 1) & (table_size - 1)
+        table[slot] = index + 1
+
+    field_table = "\n".join(f"{name} {kinds[name]}" for name in fields).encode("utf-8")
+    header = _MAPPED_HEADER.pack(
+        MAPPED_CATALOG_MAGIC, MAPPED_CATALOG_FORMAT, CATALOG_CACHE_VERSION,
+        len(fields), 0, len(records), table_size, len(heap),
+        stat.st_size, stat.st_mtime_ns
+    )
+    prefix = header + struct.pack("<I", len(field_table)) + field_table
+    prefix += b"\0" * (-len(prefix) % 8)
+
+    directory = os.path.dirname(destination) or "."
+    fd, temp_path = tempfile.mkstemp(
+        dir=directory, prefix=os.path.basename(destination) + ".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(prefix)
+            f.write(packed)
+            f.write(struct.pack(f"<{table_size}I", *table))
+            f.write(heap)
+        os.replace(temp_path, destination)
     except Exception:
-        raise CorruptedDataError("Error reading items file")
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+def _mapped_record_struct(kinds):
+    """Struct for one compiled record with fields of the given kinds"""
+    return struct.Struct("<Q" + "".join("q" if kind == "i" else "II" for kind in kinds))
+
+class MappedCatalog(Mapping):
+    """
+    Read-only catalog backed by a memory-mapped compiled file
+    
+    Lookups hash the id into the file's table, so they are O(1) and only
+    touch the pages of that record. Records are decoded on each access
+    into a new dictionary. Nothing else is read into the process, so any
+    number of processes can hold the same catalog for the cost of one
+    page-cache copy.
+    
+    Build the file with compile_mapped_catalog, or use
+    open_mapped_catalog to keep it in step with the text file.
+    """
 
-    if not content:
-        raise CorruptedDataError("Item file is empty or corrupted")
+    def __init__(self, filename):
+        """
+        Raises:
+            OSError if the file cannot be opened
+            CorruptedDataError if it is not a compiled catalog of this
+            format and layout version
+        """
+        self.filename = filename
+        with open(filename, "rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise CorruptedDataError(f"Compiled catalog {filename} is empty")
 
-    items = {}
-    blocks = content.split("\n\n")
+        try:
+            self._open()
+        except (struct.error, ValueError, UnicodeDecodeError):
+            self.close()
+            raise CorruptedDataError(f"Compiled catalog {filename} is corrupted")
+        except CorruptedDataError:
+            self.close()
+            raise
 
-    for block in blocks:
-        lines = [line.strip() for line in block.split("\n") if line.strip()]
-        item = parse_item_block(lines)
-        validate_item_data(item)
-        items[item["item_id"]] = item
+    def _open(self):
+        (magic, file_format, layout, field_count, id_position, count, table_size,
+         heap_size, source_size, source_mtime) = _MAPPED_HEADER.unpack_from(self._map)
+        if (magic != MAPPED_CATALOG_MAGIC or file_format != MAPPED_CATALOG_FORMAT
+                or layout != CATALOG_CACHE_VERSION):
+            raise CorruptedDataError(
+                f"{self.filename} is not a compiled catalog of this version"
+            )
 
-    return items
-    # TODO: Implement this function
-    # Must handle same exceptions as load_quests
+        offset = _MAPPED_HEADER.size
+        (table_length,) = struct.unpack_from("<I", self._map, offset)
+        offset += 4
+        field_table = self._map[offset:offset + table_length].decode("utf-8")
+        offset += table_length
+        offset += -offset % 8
+
+        fields = [line.split(" ") for line in field_table.split("\n")]
+        if len(fields) != field_count:
+            raise CorruptedDataError(f"Compiled catalog {self.filename} is corrupted")
+        self._struct = _mapped_record_struct([kind for _, kind in fields])
+
+        # (name, bit, position in the unpacked record, is stored in the heap)
+        self._plan = []
+        self._effect_fields = [name for name, kind in fields if kind == "e"]
+        position = 1
+        for bit, (name, kind) in enumerate(fields):
+            self._plan.append((name, 1 << bit, position, kind != "i"))
+            position += 1 if kind == "i" else 2
+        self._all_fields = (1 << len(fields)) - 1
+        self._count = count
+        self._records = offset
+        self._table = offset + count * self._struct.size
+        self._table_size = table_size
+        heap_start = self._table + 4 * table_size
+        if heap_start + heap_size != len(self._map) or table_size & (table_size - 1):
+            raise CorruptedDataError(f"Compiled catalog {self.filename} is truncated")
+
+        self._heap = heap_start
+        self._id_slot = self._records + 8 + 8 * id_position
+        self.source_stamp = (source_size, source_mtime)
+
+    def close(self):
+        """Unmap the file; the catalog cannot be used afterwards"""
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    def __getitem__(self, record_id):
+        index = self._find(record_id)
+        if index < 0:
+            raise KeyError(record_id)
+        return self._decode(index)
+
+    def __contains__(self, record_id):
+        return self._find(record_id) >= 0
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self._read_id(index)
+
+    def __len__(self):
+        return self._count
+
+    def __repr__(self):
+        return f"MappedCatalog({self.filename!r})"
+
+    def _find(self, record_id):
+        """
+        Get the index of record_id's record, or -1
+        
+        Raises: CorruptedDataError if the hash table points past the
+                records or has no empty slot
+        """
+        if not isinstance(record_id, str):
+            return -1
+        key = record_id.encode("utf-8")
+        mask = self._table_size - 1
+        slot = zlib.crc32(key) & mask
+
+        # compile_mapped_catalog leaves at least half the slots empty
+        for _ in range(self._table_size):
+            (entry,) = struct.unpack_from("<I", self._map, self._table + 4 * slot)
+            if not entry:
+                return -1
+            if entry > self._count:
+                raise CorruptedDataError(
+                    f"Compiled catalog {self.filename} is corrupted"
+                )
+            offset, length = struct.unpack_from(
+                "<II", self._map, self._id_slot + (entry - 1) * self._struct.size
+            )
+            offset += self._heap
+            if length == len(key) and self._map[offset:offset + length] == key:
+                return entry - 1
+            slot = (slot + 1) & mask
+
+        raise CorruptedDataError(f"Compiled catalog {self.filename} is corrupted")
+
+    def _read_id(self, index):
+        offset, length = struct.unpack_from(
+            "<II", self._map, self._id_slot + index * self._struct.size
+        )
+        offset += self._heap
+        return self._map[offset:offset + length].decode("utf-8")
+
+    def _decode(self, index):
+        values = self._struct.unpack_from(
+            self._map, self._records + index * self._struct.size
+        )
+        present = values[0]
+        data = self._map
+        heap = self._heap
+        record = {}
+
+        for name, bit, position, is_text in self._plan:
+            if present & bit:
+                if is_text:
+                    start = heap + values[position]
+                    end = start + values[position + 1]
+                    record[name] = data[start:end].decode("utf-8")
+                else:
+                    record[name] = values[position]
+        for name in self._effect_fields:
+            if name in record:
+                record[name] = parse_effect(record[name])
+        return record
+
+# ============================================================================
+# HOT RELOAD
+# ============================================================================
+
+# Ids that a reload added, removed and changed, each a tuple in file order
+CatalogDiff = namedtuple("CatalogDiff", "added removed changed")
+
+class CatalogWatcher:
+    """
+    Keeps a quest or item catalog in step with its file
+    
+    poll() compares the file's size and mtime with the last load. When
+    they changed, the file is split into blocks again and each block is
+    hashed; blocks whose hash was seen in the previous load reuse the
+    previous record object, so only new or edited blocks are parsed, and
+    unchanged records keep their identity.
+    
+    The new catalog is a new dict that replaces self.catalog in a single
+    assignment, so readers see either the old or the new catalog. Each
+    subscriber is then called with (catalog, CatalogDiff). The diff is
+    empty if only the order of the blocks changed. If nothing changed,
+    self.catalog stays the same object and no one is called.
+    
+    If reading, parsing or validate fails, the previous catalog is kept
+    and the error is raised; the file is tried again once it changes.
+    
+    With use_cache, the first load goes through the same compiled cache
+    as load_cached_catalog. The watcher stores its block hashes in the
+    cache, so a fresh cache starts the watcher without parsing or hashing
+    any block, and the first reload still reparses only edited blocks.
+    """
+
+    def __init__(self, filename, record_type="quest", validate=None,
+                 use_cache=False):
+        """
+        Load the catalog for the first time
+        
+        Args:
+            filename: Path to the quest or item file
+            record_type: "quest" or "item"
+            validate: Optional callable(catalog) that raises to reject a
+                      load (for example a prerequisite cycle check)
+            use_cache: Start from (and refresh) the compiled cache file
+        
+        Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+        """
+        if record_type not in _CATALOG_FORMATS:
+            raise ValueError(f"Unknown record type: {record_type}")
+
+        self.filename = filename
+        self.record_type = record_type
+        self.validate = validate
+        self.catalog = {}
+        self._records_by_hash = {}
+        self._stamp = None
+        self._subscribers = []
+        self._lock = threading.Lock()
+        if use_cache:
+            self._load_through_cache()
+        else:
+            self.reload()
+
+    def subscribe(self, callback):
+        """Call callback(catalog, diff) after every reload that changes the catalog"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """Stop calling callback after reloads"""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _load_through_cache(self):
+        """
+        First load from the compiled cache, or parse and write the cache
+        
+        A cache written by load_cached_catalog has no block hashes, so
+        the file is parsed once and the cache is rewritten with them.
+        """
+        cache_path = self.filename + CATALOG_CACHE_SUFFIX
+        try:
+            key = _catalog_cache_key(self.filename, self.record_type + "s")
+        except OSError:
+            self.reload()
+            return
+
+        cached = _read_catalog_cache(cache_path, key, with_hashes=True)
+        if cached is not None:
+            catalog, block_hashes = cached
+            if self.validate is not None:
+                self.validate(catalog)
+            self.catalog = catalog
+            self._records_by_hash = dict(zip(block_hashes, catalog.values()))
+            self._stamp = (key["size"], key["mtime_ns"])
+            return
+
+        self.reload()
+        # Only store the result if the file did not change while parsing it
+        if self._stamp == (key["size"], key["mtime_ns"]):
+            _write_catalog_cache(
+                cache_path, key, self.catalog, list(self._records_by_hash)
+            )
+
+    def poll(self):
+        """
+        Reload the catalog if its file changed since the last load
+        
+        Returns: CatalogDiff, or None if the file did not change
+        Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+        """
+        try:
+            stat = os.stat(self.filename)
+        except OSError:
+            raise MissingDataFileError(f"Missing file: {self.filename}")
+
+        if (stat.st_size, stat.st_mtime_ns) == self._stamp:
+            return None
+        return self.reload()
+
+    def reload(self):
+        """
+        Reload the catalog now, reparsing only blocks that changed
+        
+        Returns: CatalogDiff (empty if no record changed)
+        Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+        """
+        with self._lock:
+            try:
+                stat = os.stat(self.filename)
+            except OSError:
+                raise MissingDataFileError(f"Missing file: {self.filename}")
+            # Remember the stamp first, so a bad file is not reparsed on
+            # every poll; a later edit changes the stamp again
+            self._stamp = (stat.st_size, stat.st_mtime_ns)
+
+            old_catalog = self.catalog
+            records_by_hash = {}
+            parse_block, validate, _ = _CATALOG_FORMATS[self.record_type]
+
+            def records():
+                for start_line, lines in _iter_blocks(self.filename, self.record_type):
+                    digest = hashlib.blake2b(
+                        "\n".join(lines).encode("utf-8"), digest_size=16
+                    ).digest()
+                    record = self._records_by_hash.get(digest)
+                    if record is None:
+                        record = _parse_record(
+                            parse_block, validate, lines, self.filename, start_line
+                        )
+                    records_by_hash[digest] = record
+                    yield start_line, record
+
+            catalog = _index_catalog(records(), self.filename, self.record_type)
+            if self.validate is not None:
+                self.validate(catalog)
+
+            diff = CatalogDiff(
+                tuple(key for key in catalog if key not in old_catalog),
+                tuple(key for key in old_catalog if key not in catalog),
+                tuple(
+                    key for key, record in catalog.items()
+                    if key in old_catalog and old_catalog[key] is not record
+                )
+            )
+            self._records_by_hash = records_by_hash
+            changed = any(diff) or list(catalog) != list(old_catalog)
+            if changed:
+                self.catalog = catalog
+
+        if changed:
+            for callback in list(self._subscribers):
+                callback(catalog, diff)
+        return diff
+
+# ============================================================================
+# ITEM EFFECTS
+# ============================================================================
+
+class ItemEffect(tuple):
+    """
+    Parsed item effect
+    
+    An immutable tuple of (stat, value) modifiers: "strength:5,magic:2"
+    becomes ItemEffect((("strength", 5), ("magic", 2))). str() gives the
+    text form back. parse_item_block stores one of these as an item's
+    "effect", so equipping or using the item applies the numbers directly
+    instead of splitting the string each time.
+    """
+
+    __slots__ = ()
+
+    def __str__(self):
+        return ",".join(f"{stat}:{value}" for stat, value in self)
+
+    def __repr__(self):
+        return f"ItemEffect({str(self)!r})"
+
+    def describe(self):
+        """Human-readable form, e.g. "5 strength and 2 magic" """
+        if len(self) == 1:
+            stat, value = self[0]
+            return f"{value} {stat}"
+        return " and ".join(f"{value} {stat}" for stat, value in self)
+
+def parse_effect(effect_string):
+    """
+    Parse an item effect string
+    
+    Args:
+        effect_string: "stat_name:value", or several of them separated by
+                       commas (e.g. "strength:5,magic:2")
+    
+    Results are cached, so items with the same effect share one object.
+    Stat names must be identifiers, like the extra stats a save keeps.
+    
+    Returns: ItemEffect
+    Raises: InvalidDataFormatError if effect_string is not a string, a
+            modifier is malformed, its value is not an integer, or a stat
+            appears twice
+    """
+    # Checked before the cache, which cannot hash a list or dict
+    if not isinstance(effect_string, str):
+        raise InvalidDataFormatError(f"Invalid item effect: {effect_string!r}")
+    return _parse_effect_string(effect_string)
+
+@functools.lru_cache(maxsize=1024)
+def _parse_effect_string(effect_string):
+    """Parse an effect string for parse_effect; cached by the string"""
+    modifiers = []
+    seen = set()
+    for part in effect_string.split(","):
+        stat, sep, value = part.partition(":")
+        stat = stat.strip()
+        if not sep or not stat.isidentifier():
+            raise InvalidDataFormatError(f"Invalid item effect: {effect_string!r}")
+        try:
+            value = int(value)
+        except ValueError:
+            raise InvalidDataFormatError(
+                f"Item effect value must be an integer: {effect_string!r}"
+            )
+        if stat in seen:
+            raise InvalidDataFormatError(
+                f"Item effect repeats {stat}: {effect_string!r}"
+            )
+        seen.add(stat)
+        modifiers.append((stat, value))
+
+    return ItemEffect(modifiers)
+
+# ============================================================================
+# PROTOTYPE TABLES
+# ============================================================================
+
+# Loaded prototype tables, by (kind, filename)
+_prototype_tables = {}
+
+def get_class_prototypes(filename=CLASSES_FILE):
+    """
+    Get the class table as immutable prototypes, loading it on first use
+    
+    Returns: Read-only mapping {class_name: read-only class_data}
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    return _get_prototypes("classes", filename, load_classes)
+
+def get_enemy_prototypes(filename=ENEMIES_FILE):
+    """
+    Get the enemy table as immutable prototypes, loading it on first use
+    
+    Spawn an enemy with prototype.copy(); the prototypes themselves cannot
+    be changed by accident.
+    
+    Returns: Read-only mapping {enemy_id: read-only enemy_data}
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    return _get_prototypes("enemies", filename, load_enemies)
+
+def reload_prototypes():
+    """Forget loaded prototype tables so the next lookup rereads the files"""
+    _prototype_tables.clear()
+
+def _get_prototypes(kind, filename, loader):
+    table = _prototype_tables.get((kind, filename))
+    if table is None:
+        records = loader(filename)
+        table = types.MappingProxyType({
+            key: types.MappingProxyType(record) for key, record in records.items()
+        })
+        _prototype_tables[(kind, filename)] = table
+    return table
 
 def validate_quest_data(quest_dict):
     """
@@ -143,6 +1333,7 @@ def validate_item_data(item_dict):
     
     Required fields: item_id, name, type, effect, cost, description
     Valid types: weapon, armor, consumable
+    The effect must be an ItemEffect or a string parse_effect accepts
     
     Returns: True if valid
     Raises: InvalidDataFormatError if missing required fields or invalid type
@@ -161,13 +1352,62 @@ def validate_item_data(item_dict):
     except ValueError:
         raise InvalidDataFormatError("Item cost must be an integer")
 
+    if not isinstance(item_dict["effect"], ItemEffect):
+        parse_effect(item_dict["effect"])
+
     return True
     # TODO: Implement validation
 
+def validate_class_data(class_dict):
+    """
+    Validate that class dictionary has all required fields
+    
+    Required fields: class, health, strength, magic (health must be
+    positive, the stats cannot be negative)
+    
+    Returns: True if valid
+    Raises: InvalidDataFormatError if fields are missing or invalid
+    """
+    _validate_stat_record(class_dict, "class", ["class", "health", "strength", "magic"])
+    return True
+
+def validate_enemy_data(enemy_dict):
+    """
+    Validate that enemy dictionary has all required fields
+    
+    Required fields: enemy_id, name, health, strength, magic, xp_reward,
+                    gold_reward (health must be positive, the other
+                    numbers cannot be negative)
+    
+    Returns: True if valid
+    Raises: InvalidDataFormatError if fields are missing or invalid
+    """
+    _validate_stat_record(enemy_dict, "enemy", [
+        "enemy_id", "name", "health", "strength", "magic", "xp_reward", "gold_reward"
+    ])
+    return True
+
+def _validate_stat_record(record, label, required):
+    """Check required fields and numeric ranges of a class/enemy record"""
+    for key in required:
+        if key not in record:
+            raise InvalidDataFormatError(f"Missing {label} field: {key}")
+
+    for key in required:
+        value = record[key]
+        if key in _STAT_FIELDS:
+            if value < 0 or (key == "health" and value == 0):
+                raise InvalidDataFormatError(f"Invalid {label} {key}: {value}")
+        elif not value:
+            raise InvalidDataFormatError(f"Empty {label} field: {key}")
+
 def create_default_data_files():
     """
     Create default data files if they don't exist
     This helps with initial setup and testing
+    
+    quests.txt and items.txt go in data/ under the working directory;
+    classes.txt and enemies.txt go to CLASSES_FILE and ENEMIES_FILE.
     """
     os.makedirs("data", exist_ok=True)
 
@@ -223,6 +1463,16 @@ def create_default_data_files():
                 "COST: 80\n"
                 "DESCRIPTION: Light protective armor.\n"
             )
+    # Class and enemy tables are read from the game's own data directory
+    # (not the working directory), so write them where they are read
+    os.makedirs(DATA_DIRECTORY, exist_ok=True)
+    if not os.path.exists(CLASSES_FILE):
+        with open(CLASSES_FILE, "w", encoding="utf-8") as f:
+            f.write(DEFAULT_CLASSES)
+
+    if not os.path.exists(ENEMIES_FILE):
+        with open(ENEMIES_FILE, "w", encoding="utf-8") as f:
+            f.write(DEFAULT_ENEMIES)
     # TODO: Implement this function
     # Create data/ directory if it doesn't exist
     # Create default quests.txt and items.txt files
@@ -232,6 +1482,224 @@ def create_default_data_files():
 # HELPER FUNCTIONS
 # ============================================================================
 
+def _iter_blocks(filename, label):
+    """
+    Read a data file line by line and yield its blank-line separated blocks
+    
+    Args:
+        filename: Path to the data file
+        label: Record kind used in error messages ("quest" or "item")
+    
+    Yields: Tuples of (line number of first line, list of stripped lines)
+    Raises: MissingDataFileError, CorruptedDataError
+    """
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Missing file: {filename}")
+
+    try:
+        f = open(filename, "r", encoding="utf-8")
+    except OSError:
+        raise CorruptedDataError(f"Error reading {label}s file")
+
+    with f:
+        block = []
+        start_line = 0
+        line_number = 0
+        found = False
+
+        try:
+            for line_number, raw_line in enumerate(f, start=1):
+                line = raw_line.strip()
+                if line:
+                    if not block:
+                        start_line = line_number
+                    block.append(line)
+                elif block:
+                    found = True
+                    yield start_line, block
+                    block = []
+        except (OSError, UnicodeDecodeError):
+            raise CorruptedDataError(
+                f"Error reading {label}s file {filename} near line {line_number + 1}"
+            )
+
+        if block:
+            found = True
+            yield start_line, block
+
+    if not found:
+        raise CorruptedDataError(f"{label.capitalize()} file is empty or corrupted")
+
+def _iter_records(filename, label):
+    """
+    Stream the parsed records of a quest or item file
+    
+    Yields: Tuples of (line number of the block, record)
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    parse_block, validate, _ = _CATALOG_FORMATS[label]
+    for start_line, lines in _iter_blocks(filename, label):
+        yield start_line, _parse_record(
+            parse_block, validate, lines, filename, start_line
+        )
+
+def _index_catalog(records, filename, label):
+    """
+    Build a catalog dict from (line number, record) pairs
+    
+    Returns: Dictionary {record id: record}
+    Raises: InvalidDataFormatError if an id appears twice
+    """
+    id_field = _CATALOG_FORMATS[label][2]
+    catalog = {}
+    for start_line, record in records:
+        record_id = record[id_field]
+        if record_id in catalog:
+            raise InvalidDataFormatError(
+                f"{filename} line {start_line}: duplicate {label} {record_id}"
+            )
+        catalog[record_id] = record
+    return catalog
+
+def _parse_record(parse_block, validate, lines, filename, start_line):
+    """
+    Parse and validate one block, adding the file line number to errors
+    
+    Returns: Parsed record dictionary
+    Raises: InvalidDataFormatError with the offending line number
+    """
+    record, error = _try_parse_record(parse_block, validate, lines, start_line)
+    if error is not None:
+        line_number, message = error
+        raise InvalidDataFormatError(f"{filename} line {line_number}: {message}")
+    return record
+
+def _try_parse_record(parse_block, validate, lines, start_line):
+    """
+    Parse and validate one block without raising
+    
+    Returns: Tuple of (record, None), or (None, (line number, message))
+    """
+    try:
+        record = parse_block(lines)
+    except InvalidDataFormatError as e:
+        return None, (_find_bad_line(parse_block, lines, start_line), str(e))
+    except ValueError:
+        return None, (
+            _find_bad_line(parse_block, lines, start_line),
+            "numeric fields must be integers"
+        )
+
+    try:
+        validate(record)
+    except InvalidDataFormatError as e:
+        return None, (start_line, str(e))
+    except ValueError:
+        return None, (start_line, "numeric fields must be integers")
+
+    return record, None
+
+def _find_bad_line(parse_block, lines, start_line):
+    """
+    Get the line number of the line a block failed to parse at
+    
+    Only runs after parse_block raised. The block is parsed again one
+    more line at a time, so the first prefix that fails ends at the bad
+    line; this also finds errors that depend on earlier lines, such as a
+    repeated field. Block lines are consecutive in the file, so the index
+    of the line gives its position. Falls back to the first line.
+    """
+    for count in range(1, len(lines) + 1):
+        try:
+            parse_block(lines[:count])
+        except (InvalidDataFormatError, ValueError):
+            return start_line + count - 1
+    return start_line
+
+def _catalog_cache_key(filename, kind):
+    """
+    Build the freshness key for a data file's compiled cache
+    
+    Raises: OSError if the file cannot be read
+    """
+    stat = os.stat(filename)
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+
+    return {
+        "version": CATALOG_CACHE_VERSION,
+        "kind": kind,
+        "source": os.path.abspath(filename),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": digest.hexdigest()
+    }
+
+def _read_catalog_cache(cache_path, key, with_hashes=False):
+    """
+    Read a compiled catalog if its header matches key
+    
+    The header is pickled separately in front of the records, so a stale
+    cache is rejected without unpickling the whole catalog.
+    
+    With with_hashes, the CatalogWatcher block hashes stored after the
+    records are read too, and a cache without them counts as missing.
+    
+    Returns: Catalog dictionary, or (catalog, list of block hashes) with
+             with_hashes; None if missing, stale or unreadable
+    """
+    try:
+        with open(cache_path, "rb") as f:
+            if pickle.load(f) != key:
+                return None
+            catalog = pickle.load(f)
+            if with_hashes:
+                block_hashes = pickle.load(f)
+    except Exception:
+        return None
+
+    if not isinstance(catalog, dict):
+        return None
+    if with_hashes:
+        if not isinstance(block_hashes, list) or len(block_hashes) != len(catalog):
+            return None
+        return catalog, block_hashes
+    return catalog
+
+def _write_catalog_cache(cache_path, key, catalog, block_hashes=None):
+    """
+    Atomically replace the compiled cache file
+    
+    block_hashes (from a CatalogWatcher, in catalog order) are stored
+    after the records, where load_cached_catalog never reads them.
+    
+    The data is written to a temp file in the same directory and moved
+    into place with os.replace. Failures are ignored since the cache is
+    only an optimization.
+    """
+    directory = os.path.dirname(cache_path) or "."
+    try:
+        fd, temp_path = tempfile.mkstemp(
+            dir=directory, prefix=os.path.basename(cache_path) + ".", suffix=".tmp"
+        )
+    except OSError:
+        return
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(catalog, f, protocol=pickle.HIGHEST_PROTOCOL)
+            if block_hashes is not None:
+                pickle.dump(block_hashes, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
 def parse_quest_block(lines):
     """
     Parse a block of lines into a quest dictionary
@@ -273,6 +1741,8 @@ def parse_item_block(lines):
     Args:
         lines: List of strings representing one item
     
+    The effect is parsed into an ItemEffect.
+    
     Returns: Dictionary with item data
     Raises: InvalidDataFormatError if parsing fails
     """
@@ -288,12 +1758,56 @@ def parse_item_block(lines):
 
         if key == "cost":
             value = int(value)
+        elif key == "effect":
+            value = parse_effect(value)
 
         item[key] = value
 
     return item
     # TODO: Implement parsing logic
 
+# How each catalog is parsed: label -> (parse_block, validate, id field)
+_CATALOG_FORMATS = {
+    "quest": (parse_quest_block, validate_quest_data, "quest_id"),
+    "item": (parse_item_block, validate_item_data, "item_id")
+}
+
+# Integer fields of class and enemy records
+_STAT_FIELDS = frozenset([
+    "health", "strength", "magic", "xp_reward", "gold_reward"
+])
+
+def parse_stat_block(lines):
+    """
+    Parse a block of lines into a class or enemy dictionary
+    
+    Args:
+        lines: List of strings representing one class or enemy
+    
+    Returns: Dictionary with the record's fields
+    Raises:
+        InvalidDataFormatError if a line is malformed or a field repeats
+        ValueError if a stat is not an integer
+    """
+    record = {}
+
+    for line in lines:
+        if ": " not in line:
+            raise InvalidDataFormatError(f"Invalid line: {line}")
+
+        key, value = line.split(": ", 1)
+        key = key.lower().strip()
+        value = value.strip()
+
+        if key in _STAT_FIELDS:
+            value = int(value)
+        if key in record:
+            raise InvalidDataFormatError(f"Duplicate field: {key}")
+
+        record[key] = value
+
+    return record
+
 # ============================================================================
 # TESTING
 # ============================================================================
@@ -9,16 +9,184 @@ AI Usage: used to check for errors and correct formatting.
 This module handles inventory management, item usage, and equipment.
 """
 
+from game_data import ItemEffect, parse_effect
 from custom_exceptions import (
     InventoryFullError,
     ItemNotFoundError,
     InsufficientResourcesError,
-    InvalidItemTypeError
+    InvalidItemTypeError,
+    InvalidDataFormatError
 )
 
 # Maximum inventory size
 MAX_INVENTORY_SIZE = 20
 
+# An Inventory holding more items than this keeps a count per item ID;
+# smaller ones just scan their short list
+INVENTORY_INDEX_SIZE = 8
+
+# ============================================================================
+# INVENTORY TYPE
+# ============================================================================
+
+class Inventory:
+    """
+    Multiset of item IDs
+    
+    Membership, counting, adding and removing are all O(1). It iterates,
+    compares and prints like the list of item IDs it replaces (copies of
+    the same item are grouped together), so save_character/load_character
+    and code written for lists keep working.
+    
+    Up to INVENTORY_INDEX_SIZE items are kept in a plain list (an empty
+    inventory holds the shared empty tuple), and lookups scan at most
+    that many entries. Past that size the items are kept as a count per
+    item_id plus a running total.
+    
+    changes counts every modification, so callers can tell whether the
+    inventory changed since they last looked.
+    """
+
+    __slots__ = ("_held", "_size", "changes")
+
+    def __init__(self, item_ids=()):
+        self._held = ()
+        self._size = 0
+        self.changes = 0
+        self.extend(item_ids)
+
+    def __getstate__(self):
+        return self.counts(), self.changes
+
+    def __setstate__(self, state):
+        counts, changes = state
+        self._held = ()
+        self._size = 0
+        self._fill(counts)
+        self.changes = changes
+
+    @classmethod
+    def from_counts(cls, counts):
+        """
+        Build an inventory from {item_id: count} (or (item_id, count) pairs)
+        
+        The inverse of counts(); used by the binary save loader.
+        """
+        inventory = cls()
+        inventory._fill(dict(counts))
+        return inventory
+
+    def _fill(self, counts):
+        """Load an empty inventory from {item_id: count}"""
+        held = {item_id: count for item_id, count in counts.items() if count > 0}
+        size = sum(held.values())
+        if size > INVENTORY_INDEX_SIZE:
+            self._held = held
+        elif size:
+            self._held = [item_id for item_id, count in held.items() for _ in range(count)]
+        self._size = size
+
+    def _add(self, item_id):
+        """Add one copy of item_id, switching to counts past the list size"""
+        held = self._held
+        if type(held) is dict:
+            held[item_id] = held.get(item_id, 0) + 1
+        elif self._size < INVENTORY_INDEX_SIZE:
+            if not held:
+                held = self._held = []
+            held.append(item_id)
+        else:
+            self._held = self.counts()
+            self._held[item_id] = self._held.get(item_id, 0) + 1
+        self._size += 1
+
+    def append(self, item_id):
+        """Add one copy of item_id"""
+        self._add(item_id)
+        self.changes += 1
+
+    def extend(self, item_ids):
+        """Add one copy of each item_id in item_ids"""
+        for item_id in item_ids:
+            self._add(item_id)
+        self.changes += 1
+
+    def remove(self, item_id):
+        """
+        Remove one copy of item_id
+        
+        Raises: ValueError if item_id is not present (like list.remove)
+        """
+        held = self._held
+        if item_id not in held:
+            raise ValueError(f"{item_id!r} not in inventory")
+
+        if type(held) is dict:
+            count = held[item_id]
+            if count == 1:
+                del held[item_id]
+            else:
+                held[item_id] = count - 1
+        else:
+            # Take the last copy, so the first copy keeps the item's place
+            # in the grouped order, as with counts
+            del held[len(held) - 1 - held[::-1].index(item_id)]
+
+        self._size -= 1
+        if not self._size:
+            self._held = ()
+        self.changes += 1
+
+    def count(self, item_id):
+        """Return how many copies of item_id are held"""
+        held = self._held
+        if type(held) is dict:
+            return held.get(item_id, 0)
+        return held.count(item_id)
+
+    def counts(self):
+        """Return a dict of {item_id: count}"""
+        held = self._held
+        if type(held) is dict:
+            return dict(held)
+        counts = {}
+        for item_id in held:
+            counts[item_id] = counts.get(item_id, 0) + 1
+        return counts
+
+    def clear(self):
+        """Remove every item"""
+        self._held = ()
+        self._size = 0
+        self.changes += 1
+
+    def copy(self):
+        """Return a list of the held item IDs, like list.copy()"""
+        return list(self)
+
+    def __contains__(self, item_id):
+        return item_id in self._held
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for item_id, count in self.counts().items():
+            for _ in range(count):
+                yield item_id
+
+    def __eq__(self, other):
+        if isinstance(other, Inventory):
+            return self._size == other._size and self.counts() == other.counts()
+        if isinstance(other, list):
+            return len(other) == self._size and Inventory(other).counts() == self.counts()
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
 # ============================================================================
 # INVENTORY MANAGEMENT
 # ============================================================================
@@ -101,13 +269,58 @@ def clear_inventory(character):
     
     Returns: List of removed items
     """
-    removed_items = character.get("inventory", []).copy()
-    character["inventory"] = []
+    removed_items = list(character.get("inventory", []))
+    character["inventory"] = Inventory()
     return removed_items
     # TODO: Implement inventory clearing
     # Save current inventory before clearing
     # Clear character's inventory list
 
+def add_items_to_inventory(character, item_ids):
+    """
+    Add a batch of items (for example loot drops) in one step
+    
+    The capacity check is done once for the whole batch, so either every
+    item is added or none are. Cost is linear in the batch size.
+    
+    Returns: Number of items added
+    Raises: InventoryFullError if the batch does not fit
+    """
+    item_ids = list(item_ids)
+    inventory = _get_inventory(character)
+
+    if len(inventory) + len(item_ids) > MAX_INVENTORY_SIZE:
+        raise InventoryFullError(
+            f"Not enough space for {len(item_ids)} items."
+        )
+
+    inventory.extend(item_ids)
+    return len(item_ids)
+
+def remove_items_from_inventory(character, item_ids):
+    """
+    Remove a batch of items in one step
+    
+    Every item is checked before anything is removed, so either the whole
+    batch is removed or none of it is. Cost is linear in the batch size.
+    
+    Returns: Number of items removed
+    Raises: ItemNotFoundError if any item (or enough copies) is missing
+    """
+    item_ids = list(item_ids)
+    inventory = _get_inventory(character)
+
+    needed = {}
+    for item_id in item_ids:
+        needed[item_id] = needed.get(item_id, 0) + 1
+    for item_id, count in needed.items():
+        if inventory.count(item_id) < count:
+            raise ItemNotFoundError(f"Not enough '{item_id}' in inventory.")
+
+    for item_id in item_ids:
+        inventory.remove(item_id)
+    return len(item_ids)
+
 # ============================================================================
 # ITEM USAGE
 # ============================================================================
@@ -136,14 +349,14 @@ def use_item(character, item_id, item_data):
     if item_data["type"] != "consumable":
         raise InvalidItemTypeError(f"{item_id} is not a consumable.")
 
-    stat, value = parse_item_effect(item_data["effect"])
+    effect = get_item_effect(item_data)
 
-    apply_stat_effect(character, stat, value)
+    apply_item_effect(character, effect)
 
     remove_item_from_inventory(character, item_id)
 
     item_name = item_data.get("name", item_id)
-    return f"Used {item_name} and gained {value} {stat}."
+    return f"Used {item_name} and gained {effect.describe()}."
     # TODO: Implement item usage
     # Check if character has the item
     # Check if item type is 'consumable'
@@ -160,7 +373,8 @@ def equip_weapon(character, item_id, item_data):
         item_id: Weapon to equip
         item_data: Item information dictionary
     
-    Weapon effect format: "strength:5" (adds 5 to strength)
+    Weapon effect format: "strength:5" (adds 5 to strength), or several
+    modifiers separated by commas ("strength:5,magic:2")
     
     If character already has weapon equipped:
     - Unequip current weapon (remove bonus)
@@ -178,18 +392,10 @@ def equip_weapon(character, item_id, item_data):
         raise InvalidItemTypeError(f"{item_id} is not a weapon.")
 
     if character.get("equipped_weapon"):
-        old_weapon_id = character["equipped_weapon"]
-        old_weapon_data = character["item_data"][old_weapon_id]
-
-        stat, value = parse_item_effect(old_weapon_data["effect"])
-        apply_stat_effect(character, stat, -value)
-
+        old_weapon_id = _take_off(character, "equipped_weapon")
         add_item_to_inventory(character, old_weapon_id)
 
-    stat, value = parse_item_effect(item_data["effect"])
-    apply_stat_effect(character, stat, value)
-
-    character["equipped_weapon"] = item_id
+    _put_on(character, "equipped_weapon", item_id, item_data)
     remove_item_from_inventory(character, item_id)
 
     weapon_name = item_data.get("name", item_id)
@@ -210,7 +416,8 @@ def equip_armor(character, item_id, item_data):
         item_id: Armor to equip
         item_data: Item information dictionary
     
-    Armor effect format: "max_health:10" (adds 10 to max_health)
+    Armor effect format: "max_health:10" (adds 10 to max_health), or
+    several modifiers separated by commas
     
     If character already has armor equipped:
     - Unequip current armor (remove bonus)
@@ -229,19 +436,11 @@ def equip_armor(character, item_id, item_data):
 
     # Unequip current armor
     if character.get("equipped_armor"):
-        old_armor_id = character["equipped_armor"]
-        old_armor_data = character["item_data"][old_armor_id]
-
-        stat, value = parse_item_effect(old_armor_data["effect"])
-        apply_stat_effect(character, stat, -value)
-
+        old_armor_id = _take_off(character, "equipped_armor")
         add_item_to_inventory(character, old_armor_id)
 
         # Equip new armor
-    stat, value = parse_item_effect(item_data["effect"])
-    apply_stat_effect(character, stat, value)
-
-    character["equipped_armor"] = item_id
+    _put_on(character, "equipped_armor", item_id, item_data)
     remove_item_from_inventory(character, item_id)
 
     armor_name = item_data.get("name", item_id)
@@ -259,17 +458,11 @@ def unequip_weapon(character):
     if not character.get("equipped_weapon"):
         return None
 
-    weapon_id = character["equipped_weapon"]
-    weapon_data = character["item_data"][weapon_id]
-
-    stat, value = parse_item_effect(weapon_data["effect"])
-    apply_stat_effect(character, stat, -value)
-
     if get_inventory_space_remaining(character) == 0:
         raise InventoryFullError("No space to unequip weapon.")
 
+    weapon_id = _take_off(character, "equipped_weapon")
     add_item_to_inventory(character, weapon_id)
-    character["equipped_weapon"] = None
 
     return weapon_id
     # TODO: Implement weapon unequipping
@@ -288,17 +481,11 @@ def unequip_armor(character):
     if not character.get("equipped_armor"):
         return None
 
-    armor_id = character["equipped_armor"]
-    armor_data = character["item_data"][armor_id]
-
-    stat, value = parse_item_effect(armor_data["effect"])
-    apply_stat_effect(character, stat, -value)
-
     if get_inventory_space_remaining(character) == 0:
         raise InventoryFullError("No space to unequip armor.")
 
+    armor_id = _take_off(character, "equipped_armor")
     add_item_to_inventory(character, armor_id)
-    character["equipped_armor"] = None
 
     return armor_id
     # TODO: Implement armor unequipping
@@ -366,10 +553,100 @@ def sell_item(character, item_id, item_data):
     # Remove item from inventory
     # Add gold to character
 
+class ShopListing:
+    """
+    The shop's item lines, kept in step with the item catalog
+    
+    Each item's line is formatted once. After an item file reload,
+    apply_diff reformats only the added and changed items.
+    """
+
+    def __init__(self, item_data_dict):
+        self.item_data_dict = item_data_dict
+        self._lines = {
+            item_id: format_shop_line(item_id, item)
+            for item_id, item in item_data_dict.items()
+        }
+
+    def apply_diff(self, item_data_dict, diff):
+        """
+        Move the listing to a reloaded catalog
+        
+        Args:
+            item_data_dict: The reloaded item catalog
+            diff: game_data.CatalogDiff from the reload
+        """
+        lines = self._lines
+        for item_id in diff.removed:
+            lines.pop(item_id, None)
+        for item_id in diff.added + diff.changed:
+            lines[item_id] = format_shop_line(item_id, item_data_dict[item_id])
+
+        # Follow the catalog's order, which may have changed too
+        self._lines = {item_id: lines[item_id] for item_id in item_data_dict}
+        self.item_data_dict = item_data_dict
+
+    def lines(self):
+        """
+        Get the listing in catalog order
+        
+        Returns: List of (item_id, display line) tuples
+        """
+        return list(self._lines.items())
+
+def format_shop_line(item_id, item_data):
+    """Format one item for the shop listing"""
+    return f"{item_data['name']} (id: {item_id}) - Cost: {item_data.get('cost', 0)}"
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+def _get_inventory(character):
+    """
+    Get the character's inventory as an Inventory
+    
+    A plain list (from an older caller) is converted once and stored back
+    on the character, so later operations stay O(1).
+    """
+    inventory = character.get("inventory")
+    if not isinstance(inventory, Inventory):
+        inventory = Inventory(inventory or [])
+        character["inventory"] = inventory
+    return inventory
+
+def _put_on(character, slot, item_id, item_data):
+    """
+    Equip an item in slot ("equipped_weapon" or "equipped_armor")
+    
+    The applied ItemEffect is kept under slot + "_effect", so unequipping
+    takes back exactly that bonus even if the item catalog was reloaded
+    in between.
+    """
+    effect = get_item_effect(item_data)
+    apply_item_effect(character, effect)
+    character[slot] = item_id
+    character[slot + "_effect"] = effect
+
+def _take_off(character, slot):
+    """
+    Empty an equipment slot and take back the bonus its item gave
+    
+    A character loaded from a save has no recorded effect (it is not
+    saved), so the item's effect in character["item_data"] is used.
+    
+    Returns: Item ID that was equipped
+    """
+    item_id = character[slot]
+    effect = character.get(slot + "_effect")
+    if effect is None:
+        effect = get_item_effect(character["item_data"][item_id])
+
+    apply_item_effect(character, effect, -1)
+    character[slot] = None
+    character[slot + "_effect"] = None
+    return item_id
+
 def parse_item_effect(effect_string):
     """
     Parse item effect string into stat name and value
@@ -389,6 +666,49 @@ def parse_item_effect(effect_string):
     # Split on ":"
     # Convert value to integer
 
+def get_item_effect(item_data):
+    """
+    Get an item's effect as an ItemEffect
+    
+    Items loaded by game_data.load_items already hold a parsed ItemEffect.
+    An effect string (from an item dictionary built by hand) is parsed
+    with game_data.parse_effect, which caches the result.
+    
+    Returns: ItemEffect
+    Raises: InvalidItemTypeError if the effect string is malformed
+    """
+    effect = item_data["effect"]
+    if effect.__class__ is ItemEffect:
+        return effect
+    try:
+        return parse_effect(effect)
+    except InvalidDataFormatError:
+        raise InvalidItemTypeError("Invalid effect format.")
+
+def apply_item_effect(character, effect, sign=1):
+    """
+    Apply every modifier of an ItemEffect to a character
+    
+    Args:
+        character: Character dictionary
+        effect: ItemEffect
+        sign: 1 to apply the effect, -1 to take it back (unequipping)
+    
+    Same rules as apply_stat_effect: health cannot exceed max_health.
+    Health is changed last, so it is capped by the new max_health when
+    the effect changes both ("health:20,max_health:20").
+    """
+    health = None
+    for stat, value in effect:
+        if stat == "health":
+            health = value
+        else:
+            character[stat] = character.get(stat, 0) + sign * value
+
+    if health is not None:
+        character["health"] = min(character.get("health", 0) + sign * health,
+                                  character.get("max_health", 9999))
+
 def apply_stat_effect(character, stat_name, value):
     """
     Apply a stat modification to character
@@ -426,9 +746,12 @@ def display_inventory(character, item_data_dict):
         print("Inventory is empty.")
         return
     
-    counted = {}
-    for item in inventory:
-        counted[item] = counted.get(item, 0) + 1
+    if isinstance(inventory, Inventory):
+        counted = inventory.counts()
+    else:
+        counted = {}
+        for item in inventory:
+            counted[item] = counted.get(item, 0) + 1
 
     for item_id, qty in counted.items():
         item_name = item_data_dict[item_id]["name"]
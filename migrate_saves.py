@@ -0,0 +1,57 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Migration Tool
+
+Imports every {name}_save.txt/_save.bin file (with its journal) from a
+save directory into a single SQLite save store, or converts one save file
+between the text and binary formats.
+
+Usage (from the project root):
+    python migrate_saves.py [save_directory] [database]
+    python migrate_saves.py convert SOURCE DESTINATION
+
+Defaults: data/save_games -> data/save_games.db
+The save format of SOURCE and DESTINATION follows the extension
+(.bin is binary, .txt is text).
+"""
+
+import sys
+
+import character_manager
+
+def convert(args):
+    """Convert one save file; returns a process exit code"""
+    if len(args) != 2:
+        print("Usage: python migrate_saves.py convert SOURCE DESTINATION")
+        return 2
+
+    try:
+        character = character_manager.convert_save_file(args[0], args[1])
+    except Exception as e:
+        print(f"Conversion failed: {e}")
+        return 1
+
+    print(f"Converted {character['name']}: {args[0]} -> {args[1]}")
+    return 0
+
+def main(args):
+    """Run the migration; returns a process exit code"""
+    if args and args[0] == "convert":
+        return convert(args[1:])
+
+    save_directory = args[0] if len(args) > 0 else "data/save_games"
+    database = args[1] if len(args) > 1 else "data/save_games.db"
+
+    try:
+        imported, failed = character_manager.migrate_save_files(save_directory, database)
+    except Exception as e:
+        print(f"Migration failed: {e}")
+        return 1
+
+    print(f"Imported {imported} character(s) from {save_directory} into {database}")
+    for name in failed:
+        print(f"  Could not read save for {name}; skipped")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
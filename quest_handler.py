@@ -9,14 +9,194 @@ AI Usage: used to chcek for errors
 This module handles quest management, dependencies, and completion.
 """
 
+import weakref
+from collections import OrderedDict, deque
 from custom_exceptions import (
     QuestNotFoundError,
     QuestRequirementsNotMetError,
     QuestAlreadyCompletedError,
     QuestNotActiveError,
-    InsufficientLevelError
+    InsufficientLevelError,
+    InvalidDataFormatError
 )
 
+# ============================================================================
+# QUEST TRACKING TYPE
+# ============================================================================
+
+# A QuestSet with more IDs than this indexes their positions; smaller ones
+# just scan their short list
+QUEST_SET_INDEX_SIZE = 8
+
+class QuestSet:
+    """
+    List of quest IDs with O(1) membership checks and removal
+    
+    Used for a character's active_quests and completed_quests. Like the
+    list it replaces it keeps the IDs in the order they were added, and
+    keeps duplicates: a repeatable quest completed twice is listed twice
+    (which get_total_quest_rewards_earned relies on). It prints and
+    compares like that list. changes counts every modification.
+    
+    Up to QUEST_SET_INDEX_SIZE IDs are kept in a plain list (an empty
+    QuestSet holds the shared empty tuple), and lookups scan at most that
+    many entries. Past that size the position of each ID in the list is
+    recorded, with a deque of positions (oldest first) for repeated IDs,
+    so "quest_id in quests" does not scan the list. remove() then leaves
+    None in the removed slot instead of shifting the list; once more than
+    half of the slots are empty the list is compacted. Either way
+    membership and removal are O(1) (amortized for removal).
+    """
+
+    __slots__ = ("_ids", "_positions", "_removed", "changes")
+
+    def __init__(self, quest_ids=()):
+        self._ids = ()
+        self._positions = None
+        self._removed = 0
+        self.changes = 0
+        for quest_id in quest_ids:
+            self._add(quest_id)
+
+    def __getstate__(self):
+        return self.copy(), self.changes
+
+    def __setstate__(self, state):
+        quest_ids, changes = state
+        self.__init__(quest_ids)
+        self.changes = changes
+
+    def _add(self, quest_id):
+        """Put quest_id in a new slot at the end"""
+        ids = self._ids
+        if self._positions is None:
+            if len(ids) < QUEST_SET_INDEX_SIZE:
+                if not ids:
+                    ids = self._ids = []
+                ids.append(quest_id)
+                return
+            self._positions = {}
+            for position, known_id in enumerate(ids):
+                self._record(known_id, position)
+
+        self._record(quest_id, len(ids))
+        ids.append(quest_id)
+
+    def _record(self, quest_id, position):
+        """Add position to quest_id's recorded positions"""
+        positions = self._positions
+        known = positions.get(quest_id)
+        if known is None:
+            positions[quest_id] = position
+        elif type(known) is int:
+            positions[quest_id] = deque((known, position))
+        else:
+            known.append(position)
+
+    def append(self, quest_id):
+        """Add quest_id at the end"""
+        self._add(quest_id)
+        self.changes += 1
+
+    def extend(self, quest_ids):
+        """Add each quest_id in order"""
+        for quest_id in quest_ids:
+            self._add(quest_id)
+        self.changes += 1
+
+    def remove(self, quest_id):
+        """
+        Remove the first occurrence of quest_id
+        
+        Raises: ValueError if quest_id is not present (like list.remove)
+        """
+        positions = self._positions
+        if positions is None:
+            if quest_id not in self._ids:
+                raise ValueError(f"{quest_id!r} not in quest list")
+            self._ids.remove(quest_id)
+            if not self._ids:
+                self._ids = ()
+            self.changes += 1
+            return
+
+        known = positions.get(quest_id)
+        if known is None:
+            raise ValueError(f"{quest_id!r} not in quest list")
+        if type(known) is int:
+            position = known
+            del positions[quest_id]
+        else:
+            position = known.popleft()
+            if len(known) == 1:
+                positions[quest_id] = known[0]
+
+        self._ids[position] = None
+        self._removed += 1
+        if 2 * self._removed > len(self._ids):
+            self._compact()
+        self.changes += 1
+
+    def discard(self, quest_id):
+        """Remove the first occurrence of quest_id if present"""
+        if quest_id in self:
+            self.remove(quest_id)
+
+    def _compact(self):
+        """Drop the empty slots, going back to a plain list if few are left"""
+        ids = [quest_id for quest_id in self._ids if quest_id is not None]
+        self._ids = ()
+        self._positions = None
+        self._removed = 0
+        for quest_id in ids:
+            self._add(quest_id)
+
+    def count(self, quest_id):
+        """Number of times quest_id is listed"""
+        if self._positions is None:
+            return self._ids.count(quest_id)
+        known = self._positions.get(quest_id)
+        if known is None:
+            return 0
+        return 1 if type(known) is int else len(known)
+
+    def clear(self):
+        """Remove every quest"""
+        self._ids = ()
+        self._positions = None
+        self._removed = 0
+        self.changes += 1
+
+    def copy(self):
+        """Return a list of the quest IDs, like list.copy()"""
+        if not self._removed:
+            return list(self._ids)
+        return [quest_id for quest_id in self._ids if quest_id is not None]
+
+    def __contains__(self, quest_id):
+        positions = self._positions
+        if positions is None:
+            return quest_id in self._ids
+        return quest_id in positions
+
+    def __len__(self):
+        return len(self._ids) - self._removed
+
+    def __iter__(self):
+        return iter(self.copy())
+
+    def __eq__(self, other):
+        if isinstance(other, QuestSet):
+            return self.copy() == other.copy()
+        if isinstance(other, list):
+            return self.copy() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.copy())
+
 # ============================================================================
 # QUEST MANAGEMENT
 # ============================================================================
@@ -104,6 +284,7 @@ def complete_quest(character, quest_id, quest_data_dict):
 
     character["active_quests"].remove(quest_id)
     character["completed_quests"].append(quest_id)
+    _notify_quest_completed(character, quest_id, quest_data_dict)
 
     xp_reward = quest["reward_xp"]
     gold_reward = quest["reward_gold"]
@@ -164,28 +345,12 @@ def get_available_quests(character, quest_data_dict):
     
     Available = meets level req + prerequisite done + not completed + not active
     
+    Uses the cached QuestIndex for quest_data_dict, so only quests whose
+    prerequisite is already met are looked at.
+    
     Returns: List of quest dictionaries
     """
-    available = []
-
-    for qid, quest in quest_data_dict.items():
-        # Skip completed
-        if qid in character["completed_quests"]:
-            continue
-
-        if qid in character["active_quests"]:
-            continue
-
-        if character["level"] < quest["required_level"]:
-            continue
-
-        prereq = quest["prerequisite"]
-        if prereq != "NONE" and prereq not in character["completed_quests"]:
-            continue
-
-        available.append(quest)
-
-    return available
+    return get_quest_index(quest_data_dict).get_available_quests(character)
 
     # TODO: Implement available quest search
     # Filter all quests by requirements
@@ -252,28 +417,15 @@ def get_quest_prerequisite_chain(quest_id, quest_data_dict):
     Example: If Quest C requires Quest B, which requires Quest A:
              Returns ["quest_a", "quest_b", "quest_c"]
     
+    Chains come from the cached QuestGraph, so repeated lookups are O(1).
+    
     Raises: QuestNotFoundError if quest doesn't exist
+            InvalidDataFormatError if the prerequisites form a cycle
     """
     if quest_id not in quest_data_dict:
         raise QuestNotFoundError(f"Quest '{quest_id}' does not exist.")
 
-    chain = []
-    current = quest_id
-
-    while True:
-        if current not in quest_data_dict:
-            raise QuestNotFoundError(f"Quest '{current}' in chain does not exist.")
-
-        chain.append(current)
-
-        prereq = quest_data_dict[current]["prerequisite"]
-        if prereq == "NONE":
-            break
-
-        current = prereq
-
-    chain.reverse()
-    return chain
+    return list(get_quest_graph(quest_data_dict).get_chain(quest_id))
 
     # TODO: Implement prerequisite chain tracing
     # Follow prerequisite links backwards
@@ -389,6 +541,403 @@ def display_character_quest_progress(character, quest_data_dict):
     print(f"Total Rewards Earned: {rewards['total_xp']} XP, {rewards['total_gold']} Gold")
     # TODO: Implement progress display
 
+# ============================================================================
+# QUEST INDEX
+# ============================================================================
+
+# Characters whose unlocked quests a QuestIndex remembers at once
+MAX_TRACKED_CHARACTERS = 1024
+
+class QuestIndex:
+    """
+    Precomputed lookup tables for quest availability
+    
+    Built once from a quest catalog:
+    - by_level: {required_level: [quest_id, ...]}
+    - unlocks: {prerequisite_id: [quest_ids it unlocks]}
+    - roots: quests with no prerequisite
+    
+    For each character the index remembers which quests are unlocked
+    (prerequisite done, not completed yet), bucketed by required level.
+    Availability is then answered with set lookups instead of scanning
+    the whole catalog, and quest_completed only touches the quests the
+    finished quest unlocks.
+    
+    Characters are remembered through weak references, so the index does
+    not keep them alive; objects that cannot be weakly referenced (plain
+    dicts) are not remembered and get their unlocked quests worked out on
+    every lookup. A remembered entry is rebuilt when the completed quests
+    object is replaced or changes (QuestSet.changes, or the contents of a
+    list). The catalog itself must not be edited in place; reloads build
+    a new catalog (see apply_diff and invalidate_quest_caches).
+    """
+
+    def __init__(self, quest_data_dict):
+        self.quest_data_dict = quest_data_dict
+        self.catalog_size = len(quest_data_dict)
+        self.order = {}
+        self.by_level = {}
+        self.unlocks = {}
+        self.roots = []
+        self._tracked = OrderedDict()
+
+        for position, (qid, quest) in enumerate(quest_data_dict.items()):
+            self.order[qid] = position
+            self.by_level.setdefault(quest["required_level"], []).append(qid)
+
+            prereq = quest["prerequisite"]
+            if prereq == "NONE":
+                self.roots.append(qid)
+            else:
+                self.unlocks.setdefault(prereq, []).append(qid)
+
+    def get_available_quests(self, character):
+        """
+        Get quests that character can currently accept
+        
+        Returns: List of quest dictionaries, in catalog order
+        """
+        unlocked = self._get_unlocked(character)
+        active = character["active_quests"]
+        level = character["level"]
+
+        available = []
+        for required_level, quest_ids in unlocked.items():
+            if required_level > level:
+                continue
+            for qid in quest_ids:
+                if qid not in active:
+                    available.append(qid)
+
+        available.sort(key=self.order.__getitem__)
+        return [self.quest_data_dict[qid] for qid in available]
+
+    def quest_completed(self, character, quest_id):
+        """
+        Update a tracked character's unlocked quests after a completion
+        
+        Call it right after quest_id was appended to the character's
+        completed quests. Only quest_id and the quests it unlocks are
+        touched. Characters the index is not tracking are left alone;
+        they are built on their next lookup. If the completed quests
+        changed in some other way since the entry was cached, the entry
+        is dropped instead, so the next lookup rebuilds it.
+        """
+        entry = self._tracked.get(id(character))
+        if entry is None or entry[0]() is not character:
+            return
+
+        unlocked = entry[3]
+        completed = character["completed_quests"]
+        if entry[1] is not completed or entry[2] != _state_before_append(completed):
+            self.forget(character)
+            return
+
+        if quest_id in self.quest_data_dict:
+            bucket = unlocked.get(self.quest_data_dict[quest_id]["required_level"])
+            if bucket is not None:
+                bucket.discard(quest_id)
+
+        for qid in self.unlocks.get(quest_id, ()):
+            if qid not in completed:
+                level = self.quest_data_dict[qid]["required_level"]
+                unlocked.setdefault(level, set()).add(qid)
+
+        entry[2] = _completed_state(completed)
+
+    def forget(self, character):
+        """Drop the cached unlocked quests for character"""
+        self._tracked.pop(id(character), None)
+
+    def apply_diff(self, quest_data_dict, diff):
+        """
+        Move the index to a reloaded catalog
+        
+        Only the quests in diff (a game_data.CatalogDiff) are taken out
+        of and put back into the lookup tables and the tracked
+        characters' unlocked quests; everything else is kept.
+        """
+        old_quests = self.quest_data_dict
+        gone = diff.removed + diff.changed
+        new = diff.added + diff.changed
+
+        for qid in gone:
+            quest = old_quests[qid]
+            self.by_level[quest["required_level"]].remove(qid)
+            prereq = quest["prerequisite"]
+            if prereq == "NONE":
+                self.roots.remove(qid)
+            else:
+                self.unlocks[prereq].remove(qid)
+
+        for qid in new:
+            quest = quest_data_dict[qid]
+            self.by_level.setdefault(quest["required_level"], []).append(qid)
+            prereq = quest["prerequisite"]
+            if prereq == "NONE":
+                self.roots.append(qid)
+            else:
+                self.unlocks.setdefault(prereq, []).append(qid)
+
+        self.quest_data_dict = quest_data_dict
+        self.catalog_size = len(quest_data_dict)
+        self.order = {qid: position for position, qid in enumerate(quest_data_dict)}
+
+        for entry in list(self._tracked.values()):
+            character = entry[0]()
+            if character is None:
+                continue
+            unlocked = entry[3]
+            completed = character["completed_quests"]
+            for qid in gone:
+                bucket = unlocked.get(old_quests[qid]["required_level"])
+                if bucket is not None:
+                    bucket.discard(qid)
+            for qid in new:
+                quest = quest_data_dict[qid]
+                prereq = quest["prerequisite"]
+                if qid not in completed and (prereq == "NONE" or prereq in completed):
+                    unlocked.setdefault(quest["required_level"], set()).add(qid)
+
+    def _get_unlocked(self, character):
+        """
+        Get {required_level: set of quest_ids} unlocked for character
+        
+        The cached entry is rebuilt if it belongs to another object or
+        the completed quests changed without going through quest_completed.
+        """
+        key = id(character)
+        completed = character["completed_quests"]
+        entry = self._tracked.get(key)
+
+        if (
+            entry is not None
+            and entry[0]() is character
+            and entry[1] is completed
+            and entry[2] == _completed_state(completed)
+        ):
+            self._tracked.move_to_end(key)
+            return entry[3]
+
+        done = completed if isinstance(completed, QuestSet) else set(completed)
+        unlocked = {}
+        candidates = list(self.roots)
+        for qid in done:
+            candidates.extend(self.unlocks.get(qid, ()))
+
+        for qid in candidates:
+            if qid not in done:
+                level = self.quest_data_dict[qid]["required_level"]
+                unlocked.setdefault(level, set()).add(qid)
+
+        try:
+            ref = weakref.ref(character, _untrack_callback(self._tracked, key))
+        except TypeError:
+            return unlocked
+
+        self._tracked[key] = [ref, completed, _completed_state(completed), unlocked]
+        self._tracked.move_to_end(key)
+        if len(self._tracked) > MAX_TRACKED_CHARACTERS:
+            self._tracked.popitem(last=False)
+        return unlocked
+
+def _completed_state(completed):
+    """Value that changes whenever a completed quests collection changes"""
+    if isinstance(completed, QuestSet):
+        return completed.changes
+    return tuple(completed)
+
+def _state_before_append(completed):
+    """_completed_state of completed as it was before its last append"""
+    if isinstance(completed, QuestSet):
+        return completed.changes - 1
+    return tuple(completed[:-1])
+
+def _untrack_callback(tracked, key):
+    """Weakref callback dropping a collected character's QuestIndex entry"""
+    def untrack(ref):
+        entry = tracked.get(key)
+        if entry is not None and entry[0] is ref:
+            del tracked[key]
+    return untrack
+
+# The index for the most recently used catalog
+_quest_index = None
+
+def get_quest_index(quest_data_dict):
+    """
+    Get the QuestIndex for a quest catalog, building it if needed
+    
+    The index is cached for the most recent catalog object and rebuilt
+    when a different (or resized) catalog is passed in.
+    
+    Returns: QuestIndex
+    """
+    global _quest_index
+
+    index = _quest_index
+    if (
+        index is None
+        or index.quest_data_dict is not quest_data_dict
+        or index.catalog_size != len(quest_data_dict)
+    ):
+        index = QuestIndex(quest_data_dict)
+        _quest_index = index
+    return index
+
+def apply_quest_catalog_diff(old_quest_data, quest_data_dict, diff):
+    """
+    Update the cached quest lookups after a quest file reload
+    
+    If the cached QuestIndex belongs to old_quest_data it is moved to the
+    new catalog with only the quests in diff re-indexed. The QuestGraph
+    is compiled for the new catalog if it is not already.
+    
+    Args:
+        old_quest_data: The catalog before the reload
+        quest_data_dict: The reloaded quest catalog
+        diff: game_data.CatalogDiff from the reload
+    
+    Raises: InvalidDataFormatError if the prerequisites form a cycle
+    """
+    get_quest_graph(quest_data_dict)
+
+    index = _quest_index
+    if index is not None and index.quest_data_dict is old_quest_data:
+        index.apply_diff(quest_data_dict, diff)
+
+def _notify_quest_completed(character, quest_id, quest_data_dict):
+    """Let the cached QuestIndex for this catalog update incrementally"""
+    index = _quest_index
+    if index is not None and index.quest_data_dict is quest_data_dict:
+        index.quest_completed(character, quest_id)
+
+# ============================================================================
+# QUEST GRAPH
+# ============================================================================
+
+class QuestGraph:
+    """
+    Compiled prerequisite graph for a quest catalog
+    
+    Built once per catalog:
+    - topological_order: every quest after its prerequisite
+    - depth: {quest_id: number of prerequisites above it}
+    
+    Prerequisite chains are memoized as tuples the first time they are
+    asked for, and each chain reuses its parent's, so later lookups are
+    O(1). A prerequisite cycle is rejected when the graph is built.
+    """
+
+    def __init__(self, quest_data_dict):
+        self.quest_data_dict = quest_data_dict
+        self.catalog_size = len(quest_data_dict)
+        self.topological_order = []
+        self.depth = {}
+        self._chains = {}
+        self._build()
+
+    def _build(self):
+        """
+        Walk every prerequisite path once, recording order and depth
+        
+        Raises: InvalidDataFormatError with the cycle path if one is found
+        """
+        quests = self.quest_data_dict
+        depth = self.depth
+
+        for start in quests:
+            if start in depth:
+                continue
+
+            path = []
+            on_path = {}
+            current = start
+            while current in quests and current not in depth:
+                if current in on_path:
+                    cycle = path[on_path[current]:] + [current]
+                    raise InvalidDataFormatError(
+                        "Quest prerequisite cycle: " + " -> ".join(cycle)
+                    )
+                on_path[current] = len(path)
+                path.append(current)
+
+                prereq = quests[current]["prerequisite"]
+                if prereq == "NONE":
+                    break
+                current = prereq
+
+            # current is now a finished quest, a root, or a missing quest
+            base = depth.get(current, -1) if current not in on_path else -1
+            for qid in reversed(path):
+                base += 1
+                depth[qid] = base
+                self.topological_order.append(qid)
+
+    def get_chain(self, quest_id):
+        """
+        Get the prerequisite chain ending at quest_id
+        
+        Returns: Tuple of quest IDs (earliest_prereq, ..., quest_id)
+        Raises: QuestNotFoundError if a quest in the chain doesn't exist
+        """
+        chains = self._chains
+        chain = chains.get(quest_id)
+        if chain is not None:
+            return chain
+
+        # Walk up to the nearest memoized chain (or a root), then build down
+        quests = self.quest_data_dict
+        pending = []
+        current = quest_id
+        parent_chain = ()
+        while True:
+            if current not in quests:
+                raise QuestNotFoundError(f"Quest '{current}' in chain does not exist.")
+            pending.append(current)
+
+            prereq = quests[current]["prerequisite"]
+            if prereq == "NONE":
+                break
+            if prereq in chains:
+                parent_chain = chains[prereq]
+                break
+            current = prereq
+
+        for qid in reversed(pending):
+            parent_chain = parent_chain + (qid,)
+            chains[qid] = parent_chain
+        return parent_chain
+
+# The graph for the most recently used catalog
+_quest_graph = None
+
+def get_quest_graph(quest_data_dict):
+    """
+    Get the QuestGraph for a quest catalog, compiling it if needed
+    
+    Returns: QuestGraph
+    Raises: InvalidDataFormatError if the prerequisites form a cycle
+    """
+    global _quest_graph
+
+    graph = _quest_graph
+    if (
+        graph is None
+        or graph.quest_data_dict is not quest_data_dict
+        or graph.catalog_size != len(quest_data_dict)
+    ):
+        graph = QuestGraph(quest_data_dict)
+        _quest_graph = graph
+    return graph
+
+def invalidate_quest_caches():
+    """Drop the cached QuestIndex and QuestGraph (call after reloading quests)"""
+    global _quest_index, _quest_graph
+
+    _quest_index = None
+    _quest_graph = None
+
 # ============================================================================
 # VALIDATION
 # ============================================================================
@@ -398,9 +947,11 @@ def validate_quest_prerequisites(quest_data_dict):
     Validate that all quest prerequisites exist
     
     Checks that every prerequisite (that's not "NONE") refers to a real quest
+    and that no prerequisites form a cycle
     
     Returns: True if all valid
     Raises: QuestNotFoundError if invalid prerequisite found
+            InvalidDataFormatError if the prerequisites form a cycle
     """
     for qid, quest in quest_data_dict.items():
         prereq = quest["prerequisite"]
@@ -409,6 +960,7 @@ def validate_quest_prerequisites(quest_data_dict):
                 f"Quest '{qid}' has invalid prerequisite '{prereq}'."
             )
 
+    get_quest_graph(quest_data_dict)
     return True
     # TODO: Implement prerequisite validation
     # Check each quest's prerequisite
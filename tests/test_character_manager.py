@@ -0,0 +1,571 @@
+"""
+Test Character Manager
+Tests the character record and save/load helpers in character_manager
+"""
+
+import pytest
+import sys
+import os
+import pickle
+import random
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+
+# ============================================================================
+# CHARACTER RECORD TESTS
+# ============================================================================
+
+def test_character_record_acts_like_dict():
+    """Test that Character supports the mapping protocol"""
+    char = character_manager.create_character("RecordTest", "Warrior")
+
+    assert isinstance(char, character_manager.Character)
+    assert char["health"] == char.health == 120
+    assert char.get("equipped_weapon") is None
+    assert "equipped_weapon" not in char
+
+    char.setdefault("equipped_weapon", None)
+    char["item_data"] = {}
+    assert "equipped_weapon" in char
+    assert "item_data" in char
+
+    as_dict = dict(char)
+    assert char == as_dict
+    assert list(char) == list(as_dict)
+
+def test_character_record_has_no_instance_dict():
+    """Test that Character stores fields in slots"""
+    char = character_manager.create_character("SlotTest", "Mage")
+
+    assert not hasattr(char, "__dict__")
+
+def test_character_record_round_trips_through_pickle():
+    """Test that Character can be copied between processes"""
+    char = character_manager.create_character("PickleTest", "Rogue")
+    char["item_data"] = {"x": 1}
+
+    copy = pickle.loads(pickle.dumps(char))
+    assert copy == char
+    assert isinstance(copy, character_manager.Character)
+
+def test_missing_field_raises_key_error():
+    """Test that unset fields behave like missing dict keys"""
+    char = character_manager.create_character("KeyTest", "Cleric")
+    del char["gold"]
+
+    with pytest.raises(KeyError):
+        char["gold"]
+    with pytest.raises(KeyError):
+        del char["unknown"]
+
+# ============================================================================
+# ATOMIC SAVE TESTS
+# ============================================================================
+
+def test_failed_save_keeps_previous_file(tmp_path, monkeypatch):
+    """Test that a crash before the rename leaves the old save intact"""
+    char = character_manager.create_character("AtomicTest", "Warrior")
+    character_manager.save_character(char, str(tmp_path))
+    original = (tmp_path / "AtomicTest_save.txt").read_text()
+
+    def crash(src, dst):
+        raise OSError("killed mid-save")
+
+    char['gold'] = 999
+    monkeypatch.setattr(character_manager.os, "replace", crash)
+    with pytest.raises(SaveFileCorruptedError):
+        character_manager.save_character(char, str(tmp_path))
+
+    assert (tmp_path / "AtomicTest_save.txt").read_text() == original
+    assert os.listdir(tmp_path) == ["AtomicTest_save.txt"]
+
+def test_save_permissions_follow_umask_and_existing_file(tmp_path):
+    """Test that new saves honour the umask and rewrites keep the mode"""
+    char = character_manager.create_character("ModeTest", "Rogue")
+    path = tmp_path / "ModeTest_save.txt"
+
+    old_mask = os.umask(0o077)
+    try:
+        character_manager.save_character(char, str(tmp_path))
+    finally:
+        os.umask(old_mask)
+    assert path.stat().st_mode & 0o777 == 0o600
+
+    os.chmod(path, 0o640)
+    character_manager.save_character(char, str(tmp_path))
+    assert path.stat().st_mode & 0o777 == 0o640
+
+def test_batch_save_syncs_directory_once(tmp_path, monkeypatch):
+    """Test that save_characters fsyncs the directory a single time"""
+    synced = []
+    monkeypatch.setattr(character_manager, "_fsync_directory", synced.append)
+    chars = [character_manager.create_character(f"Batch{i}", "Mage") for i in range(5)]
+
+    assert character_manager.save_characters(chars, str(tmp_path)) == 5
+    assert synced == [str(tmp_path)]
+    assert sorted(character_manager.list_saved_characters(str(tmp_path))) == [
+        f"Batch{i}" for i in range(5)
+    ]
+
+# ============================================================================
+# BACKGROUND SAVE TESTS
+# ============================================================================
+
+def test_save_writer_writes_snapshots(tmp_path):
+    """Test that queued saves reach the disk after flush"""
+    writer = character_manager.SaveWriter()
+    char = character_manager.create_character("WriterTest", "Warrior")
+
+    writer.submit(char, str(tmp_path))
+    char['gold'] = 5  # changes after submit are not part of the snapshot
+    writer.flush()
+    writer.close()
+
+    assert character_manager.load_character("WriterTest", str(tmp_path))['gold'] == 100
+
+def test_save_writer_coalesces_pending_snapshots():
+    """Test that only the newest pending snapshot of a character is written"""
+    started = threading.Event()
+    gate = threading.Event()
+    written = []
+
+    def slow_save(character, save_directory, sync_directory=True):
+        started.set()
+        gate.wait()
+        written.append((character['name'], character['gold']))
+
+    writer = character_manager.SaveWriter(slow_save)
+    hero = character_manager.create_character("Hero", "Mage")
+    other = character_manager.create_character("Other", "Rogue")
+
+    writer.submit(other, "unused")  # keeps the thread busy until gate opens
+    started.wait()
+    for gold in range(10):
+        hero['gold'] = gold
+        writer.submit(hero, "unused")
+    gate.set()
+    writer.close()
+
+    assert written == [("Other", 100), ("Hero", 9)]
+
+def test_save_writer_reports_errors_on_next_call():
+    """Test that a failed background write is raised to the caller"""
+    gate = threading.Event()
+
+    def failing_save(character, save_directory, sync_directory=True):
+        gate.wait()
+        raise SaveFileCorruptedError("disk full")
+
+    writer = character_manager.SaveWriter(failing_save)
+    char = character_manager.create_character("ErrorTest", "Cleric")
+
+    writer.submit(char, "unused")
+    gate.set()
+    with pytest.raises(SaveFileCorruptedError, match="disk full"):
+        writer.flush()
+    writer.flush()  # the error is reported once
+
+# ============================================================================
+# SAVE JOURNAL TESTS
+# ============================================================================
+
+def play_a_little(char):
+    """Make the kind of small changes the game makes between saves"""
+    character_manager.add_gold(char, 25)
+    char['inventory'].append("health_potion")
+    if "goblin_hunter" not in char['active_quests']:
+        char['active_quests'].append("goblin_hunter")
+
+def test_journal_appends_deltas(tmp_path):
+    """Test that saves after the first only append changed fields"""
+    journal = character_manager.SaveJournal()
+    char = character_manager.create_character("JournalTest", "Rogue")
+    journal.save(char, str(tmp_path))
+    snapshot = (tmp_path / "JournalTest_save.txt").read_text()
+
+    play_a_little(char)
+    char['active_quests'].remove("goblin_hunter")
+    char['completed_quests'].append("goblin_hunter")
+    journal.save(char, str(tmp_path))
+
+    assert (tmp_path / "JournalTest_save.txt").read_text() == snapshot
+    lines = (tmp_path / "JournalTest_save.journal").read_text().splitlines()
+    assert [line.split(" ", 1)[1] for line in lines[1:]] == [
+        "gold +25", "inv +health_potion", "quest_done +goblin_hunter"
+    ]
+    assert character_manager.load_character("JournalTest", str(tmp_path)) == char
+
+def test_journal_ignores_torn_record(tmp_path):
+    """Test that a partly written last record is dropped and overwritten"""
+    journal = character_manager.SaveJournal()
+    char = character_manager.create_character("TornTest", "Mage")
+    journal.save(char, str(tmp_path))
+    play_a_little(char)
+    journal.save(char, str(tmp_path))
+
+    with open(tmp_path / "TornTest_save.journal", "a") as f:
+        f.write("0badc0de gold +10")  # crashed before the newline
+    assert character_manager.load_character("TornTest", str(tmp_path)) == char
+
+    # A new journal object (e.g. after a restart) cuts off the torn record
+    character_manager.add_gold(char, -5)
+    character_manager.SaveJournal().save(char, str(tmp_path))
+    assert "0badc0de" not in (tmp_path / "TornTest_save.journal").read_text()
+    assert character_manager.load_character("TornTest", str(tmp_path)) == char
+
+def test_journal_compacts_into_snapshot(tmp_path):
+    """Test that a full journal is folded into a new snapshot"""
+    journal = character_manager.SaveJournal(compact_every=3)
+    char = character_manager.create_character("CompactTest", "Cleric")
+    journal.save(char, str(tmp_path))
+
+    for _ in range(3):
+        play_a_little(char)
+        journal.save(char, str(tmp_path))
+
+    journal_text = (tmp_path / "CompactTest_save.journal").read_text()
+    assert journal_text.startswith("JOURNAL ")
+    assert journal_text.splitlines()[1:] == [
+        "fe9fc206 gold +25", "f2540994 inv +health_potion"
+    ]  # only the save after compaction
+    assert "GOLD: 150" in (tmp_path / "CompactTest_save.txt").read_text()
+    assert character_manager.load_character("CompactTest", str(tmp_path)) == char
+
+def test_stale_journal_is_not_replayed(tmp_path):
+    """Test that a snapshot written by save_character ignores an old journal"""
+    journal = character_manager.SaveJournal()
+    char = character_manager.create_character("StaleTest", "Warrior")
+    journal.save(char, str(tmp_path))
+    play_a_little(char)
+    journal.save(char, str(tmp_path))
+
+    character_manager.save_character(char, str(tmp_path))
+    assert character_manager.load_character("StaleTest", str(tmp_path)) == char
+
+    # The journal notices the rewritten snapshot and starts over
+    character_manager.add_gold(char, 5)
+    journal.save(char, str(tmp_path))
+    assert character_manager.load_character("StaleTest", str(tmp_path)) == char
+
+    character_manager.delete_character("StaleTest", str(tmp_path))
+    assert not os.path.exists(tmp_path / "StaleTest_save.journal")
+
+# ============================================================================
+# SAVE STORE TESTS
+# ============================================================================
+
+def test_sqlite_store_round_trip(tmp_path):
+    """Test the save functions against a .db location"""
+    database = str(tmp_path / "saves.db")
+    char = character_manager.create_character("StoreTest", "Mage")
+    play_a_little(char)
+
+    assert character_manager.save_character(char, database)
+    assert character_manager.load_character("StoreTest", database) == char
+    assert character_manager.list_saved_characters(database) == ["StoreTest"]
+    assert not list(tmp_path.glob("*_save.txt"))
+
+    assert character_manager.delete_character("StoreTest", database)
+    assert character_manager.list_saved_characters(database) == []
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("StoreTest", database)
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.delete_character("StoreTest", database)
+
+def test_sqlite_store_uses_wal_and_batches(tmp_path):
+    """Test that the store is in WAL mode and saves batches together"""
+    store = character_manager.SQLiteSaveStore(str(tmp_path / "batch.db"))
+    chars = [character_manager.create_character(f"Hero{i}", "Warrior") for i in range(50)]
+
+    assert character_manager.save_characters(chars, store) == 50
+    assert store._connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert len(character_manager.list_saved_characters(store)) == 50
+    store.close()
+
+def test_save_writer_saves_into_store(tmp_path):
+    """Test that the background writer and journal work with a store"""
+    database = str(tmp_path / "writer.db")
+    writer = character_manager.SaveWriter(character_manager.SaveJournal().save)
+    char = character_manager.create_character("StoreWriter", "Cleric")
+
+    writer.submit(char, database)
+    writer.close()
+    assert character_manager.load_character("StoreWriter", database) == char
+
+def test_migrate_save_files(tmp_path):
+    """Test importing save files (and their journals) into a store"""
+    save_directory = str(tmp_path / "saves")
+    journal = character_manager.SaveJournal()
+    chars = [character_manager.create_character(f"Old{i}", "Rogue") for i in range(3)]
+    for char in chars:
+        journal.save(char, save_directory)
+        play_a_little(char)
+        journal.save(char, save_directory)
+    (tmp_path / "saves" / "Broken_save.txt").write_text("not a save file\n")
+
+    database = str(tmp_path / "migrated.db")
+    imported, failed = character_manager.migrate_save_files(save_directory, database)
+
+    assert (imported, failed) == (3, ["Broken"])
+    for char in chars:
+        assert character_manager.load_character(char['name'], database) == char
+
+# ============================================================================
+# SAVE FORMAT TESTS
+# ============================================================================
+
+OLD_SAVE = (
+    "NAME: OldSave\n"
+    "CLASS: Warrior\n"
+    "LEVEL: 3\n"
+    "HEALTH: 100\n"
+    "MAX_HEALTH: 140\n"
+    "STRENGTH: 19\n"
+    "MAGIC: 9\n"
+    "EXPERIENCE: 20\n"
+    "GOLD: 75\n"
+    "INVENTORY: ['health_potion', 'health_potion']\n"
+    "ACTIVE_QUESTS: []\n"
+    "COMPLETED_QUESTS: ['first_steps']\n"
+    "EQUIPPED_WEAPON: iron_sword\n"
+    "EQUIPPED_ARMOR: None\n"
+    "ITEM_DATA: {'iron_sword': {'type': 'weapon'}}\n"
+)
+
+def test_save_round_trips_every_field(tmp_path):
+    """Test that load_character returns exactly what was saved"""
+    char = character_manager.create_character("RoundTrip", "Rogue")
+    play_a_little(char)
+    char['completed_quests'].append("first_steps")
+    char['equipped_weapon'] = "iron_sword"
+    char['equipped_armor'] = None
+    char['item_data'] = {"iron_sword": {"type": "weapon"}}
+
+    character_manager.save_character(char, str(tmp_path))
+    saved = (tmp_path / "RoundTrip_save.txt").read_text()
+    assert "INVENTORY: health_potion\n" in saved
+    assert "ITEM_DATA" not in saved
+
+    loaded = character_manager.load_character("RoundTrip", str(tmp_path))
+    del char['item_data']
+    assert loaded == char
+    assert isinstance(loaded['inventory'], character_manager.Inventory)
+
+@pytest.mark.parametrize("location, save_format", [
+    ("saves", "text"), ("saves", "binary"), ("saves.db", None), ("journal", None)
+])
+def test_extra_stats_survive_save_and_load(tmp_path, location, save_format):
+    """Test that a stat added by an item is saved, so unequipping restores it"""
+    import inventory_system
+
+    char = character_manager.create_character("LuckTest", "Rogue")
+    char['item_data'] = {"charm": {"type": "weapon", "effect": "luck:3,strength:1"}}
+    inventory_system.add_item_to_inventory(char, "charm")
+    directory = str(tmp_path / location)
+
+    if location == "journal":
+        journal = character_manager.SaveJournal()
+        journal.save(char, directory)
+        inventory_system.equip_weapon(char, "charm", char['item_data']['charm'])
+        journal.save(char, directory)
+    else:
+        inventory_system.equip_weapon(char, "charm", char['item_data']['charm'])
+        character_manager.save_character(char, directory, save_format=save_format)
+
+    loaded = character_manager.load_character("LuckTest", directory)
+    assert loaded['luck'] == 3
+    loaded['item_data'] = char['item_data']
+    inventory_system.unequip_weapon(loaded)
+    assert loaded['luck'] == 0
+    assert loaded['strength'] == char['strength'] - 1
+    character_manager.close_save_stores()
+
+def test_old_list_repr_saves_still_load(tmp_path):
+    """Test that saves written with str(list) load their lists correctly"""
+    (tmp_path / "OldSave_save.txt").write_text(OLD_SAVE)
+
+    loaded = character_manager.load_character("OldSave", str(tmp_path))
+    assert loaded['inventory'] == ["health_potion", "health_potion"]
+    assert list(loaded['active_quests']) == []
+    assert list(loaded['completed_quests']) == ["first_steps"]
+    assert loaded['equipped_weapon'] == "iron_sword"
+    assert loaded['equipped_armor'] is None
+    assert "item_data" not in loaded
+
+@pytest.mark.parametrize("old, new", [
+    ("GOLD: 75\n", ""),
+    ("GOLD: 75\n", "GOLD: lots\n"),
+    ("INVENTORY: ['health_potion', 'health_potion']\n", "INVENTORY: [1, 2]\n"),
+    ("LEVEL: 3\n", "LEVEL 3\n")
+])
+def test_bad_save_raises_invalid_save_data(tmp_path, old, new):
+    """Test that missing or malformed fields raise InvalidSaveDataError"""
+    (tmp_path / "OldSave_save.txt").write_text(OLD_SAVE.replace(old, new))
+
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.load_character("OldSave", str(tmp_path))
+
+# ============================================================================
+# BINARY SAVE TESTS
+# ============================================================================
+
+def make_veteran():
+    """Character with a big inventory and quest history"""
+    char = character_manager.create_character("Veteran", "Warrior")
+    char['inventory'].extend(f"item_{i % 7}" for i in range(300))
+    char['completed_quests'].extend(f"quest_{i}" for i in range(200))
+    char['active_quests'].append("dragon_slayer")
+    char['equipped_weapon'] = "iron_sword"
+    char['equipped_armor'] = None
+    char['health'] = -5
+    return char
+
+def test_binary_save_round_trip(tmp_path):
+    """Test that binary saves load back exactly and are much smaller"""
+    char = make_veteran()
+    character_manager.save_character(char, str(tmp_path), save_format="binary")
+    text_size = len(character_manager._format_save_text(char).encode("utf-8"))
+
+    assert os.listdir(tmp_path) == ["Veteran_save.bin"]
+    assert os.path.getsize(tmp_path / "Veteran_save.bin") * 5 <= text_size
+    assert character_manager.load_character("Veteran", str(tmp_path)) == char
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Veteran"]
+
+def test_switching_format_replaces_old_file(tmp_path):
+    """Test that saving in the other format removes the old save file"""
+    char = make_veteran()
+    character_manager.save_character(char, str(tmp_path))
+    character_manager.add_gold(char, 50)
+    character_manager.save_character(char, str(tmp_path), save_format="binary")
+
+    assert os.listdir(tmp_path) == ["Veteran_save.bin"]
+    assert character_manager.load_character("Veteran", str(tmp_path))['gold'] == 150
+
+    character_manager.delete_character("Veteran", str(tmp_path))
+    assert os.listdir(tmp_path) == []
+
+def test_convert_save_file(tmp_path):
+    """Test converting text -> binary -> text"""
+    char = make_veteran()
+    character_manager.save_character(char, str(tmp_path))
+    text_path = str(tmp_path / "Veteran_save.txt")
+    original = (tmp_path / "Veteran_save.txt").read_text()
+
+    binary_path = str(tmp_path / "converted_save.bin")
+    character_manager.convert_save_file(text_path, binary_path)
+    assert open(binary_path, "rb").read(4) == character_manager.BINARY_SAVE_MAGIC
+
+    os.remove(text_path)
+    character_manager.convert_save_file(binary_path, text_path)
+    assert (tmp_path / "Veteran_save.txt").read_text() == original
+
+def test_corrupt_binary_save_raises_invalid_save_data():
+    """Test that truncated or foreign data is rejected"""
+    data = character_manager.encode_binary_save(make_veteran())
+
+    for bad in (data[:len(data) // 2], data + b"x", b"NOPE" + data[4:]):
+        with pytest.raises(InvalidSaveDataError):
+            character_manager.decode_binary_save(bad)
+
+# ============================================================================
+# BULK LOAD TESTS
+# ============================================================================
+
+def write_bulk_saves(save_directory, count):
+    """Save count characters and add one corrupted save"""
+    chars = [character_manager.create_character(f"Bulk{i}", "Rogue") for i in range(count)]
+    for i, char in enumerate(chars):
+        character_manager.add_gold(char, i)
+    character_manager.save_characters(chars, save_directory)
+    with open(os.path.join(save_directory, "Broken_save.txt"), "w") as f:
+        f.write("NAME: Broken\n")
+    return {char['name']: char for char in chars}
+
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_load_characters_reports_errors_per_name(tmp_path, use_processes):
+    """Test that bad saves are reported without stopping the batch"""
+    chars = write_bulk_saves(str(tmp_path), 150)
+    names = list(chars) + ["Broken", "Missing"]
+
+    results = list(character_manager.load_characters(
+        names, str(tmp_path), workers=2, use_processes=use_processes, chunk_size=16
+    ))
+
+    assert sorted(name for name, _, _ in results) == sorted(names)
+    loaded = {name: char for name, char, error in results if error is None}
+    errors = {name: error for name, char, error in results if char is None}
+    assert loaded == chars
+    assert isinstance(errors["Broken"], InvalidSaveDataError)
+    assert isinstance(errors["Missing"], CharacterNotFoundError)
+
+def test_load_characters_from_store(tmp_path):
+    """Test bulk loading from a save store"""
+    database = str(tmp_path / "bulk.db")
+    chars = [character_manager.create_character(f"Bulk{i}", "Mage") for i in range(5)]
+    character_manager.save_characters(chars, database)
+
+    results = list(character_manager.load_characters(["Bulk0", "Bulk4", "Nobody"], database))
+    assert [(name, error is None) for name, _, error in results] == [
+        ("Bulk0", True), ("Bulk4", True), ("Nobody", False)
+    ]
+
+# ============================================================================
+# EXPERIENCE TESTS
+# ============================================================================
+
+def loop_gain_experience(character, xp_amount):
+    """The one-level-at-a-time gain_experience, kept as the reference"""
+    character["experience"] += xp_amount
+    leveled_up = False
+    while character["experience"] >= character["level"] * 100:
+        character["experience"] -= character["level"] * 100
+        character["level"] += 1
+        character["max_health"] += 10
+        character["strength"] += 2
+        character["magic"] += 2
+        character["health"] = character["max_health"]
+        leveled_up = True
+    return leveled_up
+
+def test_gain_experience_matches_loop():
+    """Property test: closed-form leveling equals the level-by-level loop"""
+    rng = random.Random(18)
+    for _ in range(3000):
+        char = character_manager.create_character("XPTest", rng.choice(["Warrior", "Mage"]))
+        char['level'] = rng.randint(1, 300)
+        char['experience'] = rng.randrange(char['level'] * 100)
+        char['health'] = rng.randint(1, char['max_health'])
+        xp = rng.choice([
+            rng.randint(0, 500),
+            rng.randint(0, 10 ** 6),
+            level_cost_boundary(char, rng)
+        ])
+
+        expected = dict(char)
+        expected_result = loop_gain_experience(expected, xp)
+
+        assert character_manager.gain_experience(char, xp) == expected_result
+        assert dict(char) == expected
+
+def level_cost_boundary(char, rng):
+    """XP that lands exactly on (or one short of) a level threshold"""
+    levels = rng.randint(1, 50)
+    cost = character_manager.level_up_cost(char['level'], levels) - char['experience']
+    return cost - rng.randint(0, 1)
+
+def test_gain_experience_handles_huge_grants():
+    """Test a grant worth thousands of levels"""
+    char = character_manager.create_character("BigGrant", "Cleric")
+    xp = character_manager.level_up_cost(1, 5000) + 123
+
+    assert character_manager.gain_experience(char, xp)
+    assert (char['level'], char['experience']) == (5001, 123)
+    assert char['strength'] == 10 + 2 * 5000
+    assert char['health'] == char['max_health'] == 100 + 10 * 5000
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
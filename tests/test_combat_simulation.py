@@ -0,0 +1,81 @@
+"""
+Test Combat Simulation
+Cross-checks the vectorized simulator against the scalar reference
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import combat_simulation
+
+np = pytest.importorskip("numpy")
+
+# ============================================================================
+# CROSS-CHECK TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("character_class", ["Warrior", "Mage", "Cleric"])
+def test_deterministic_battles_match_exactly(character_class):
+    """Test that battles without chance give identical results"""
+    fast = combat_simulation.simulate(character_class, "orc", 3, 500, action="attack")
+    slow = combat_simulation.simulate_reference(character_class, "orc", 3, 50, action="attack")
+
+    for key in ("win_rate", "loss_rate", "mean_turns", "xp_per_minute"):
+        assert fast[key] == slow[key]
+
+@pytest.mark.parametrize("character_class", ["Rogue", "Mage"])
+def test_random_battles_agree_statistically(character_class):
+    """Test that escape and critical-strike battles agree within tolerance"""
+    options = {"action": "special", "flee_below": 0.5, "max_turns": 60, "seed": 7}
+    fast = combat_simulation.simulate(character_class, "dragon", 4, 100000, **options)
+    slow = combat_simulation.simulate_reference(character_class, "dragon", 4, 4000, **options)
+
+    assert abs(fast["win_rate"] - slow["win_rate"]) < 0.03
+    assert abs(fast["escape_rate"] - slow["escape_rate"]) < 0.03
+    assert abs(fast["mean_turns"] - slow["mean_turns"]) < 0.3
+
+def test_result_totals_are_consistent():
+    """Test that outcome rates and the turn histogram add up"""
+    result = combat_simulation.simulate("Rogue", "goblin", 1, 10000, flee_below=0.3, seed=1)
+
+    rates = ("win_rate", "loss_rate", "escape_rate", "timeout_rate")
+    assert sum(result[key] for key in rates) == pytest.approx(1.0)
+    assert sum(result["turn_histogram"]) == result["battles"]
+
+def test_grid_matches_single_simulations():
+    """Test that one grid run gives each combination's own results"""
+    classes = ["Warrior", "Mage", "Rogue", "Cleric"]
+    grid = combat_simulation.simulate_grid(
+        classes, ["goblin", "dragon"], [1, 4], 2000, action="attack", max_turns=40
+    )
+
+    assert len(grid) == 16
+    for (character_class, enemy_type, level), result in grid.items():
+        single = combat_simulation.simulate(
+            character_class, enemy_type, level, 2000, action="attack", max_turns=40
+        )
+        assert result == single
+
+def test_random_grid_agrees_with_single_simulations():
+    """Test that random battles in a grid keep their own class's odds"""
+    options = {"flee_below": 0.5, "max_turns": 60, "seed": 3}
+    grid = combat_simulation.simulate_grid(["Rogue", "Mage"], ["orc"], [2], 50000, **options)
+
+    for character_class in ("Rogue", "Mage"):
+        single = combat_simulation.simulate(character_class, "orc", 2, 50000, **options)
+        result = grid[(character_class, "orc", 2)]
+        assert abs(result["win_rate"] - single["win_rate"]) < 0.02
+        assert abs(result["escape_rate"] - single["escape_rate"]) < 0.02
+
+def test_cleric_healing_times_out():
+    """Test that endless healing battles stop at max_turns"""
+    result = combat_simulation.simulate("Cleric", "goblin", 1, 1000, max_turns=30)
+
+    assert result["timeout_rate"] == 1.0
+    assert result["mean_turns"] == 30
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
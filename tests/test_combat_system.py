@@ -0,0 +1,99 @@
+"""
+Test Combat System
+Tests headless battles and their equivalence to interactive battles
+"""
+
+import pytest
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import combat_system
+
+ACTIONS = ["special", "run", "attack", "special"] * 10
+
+def play_interactive(seed, monkeypatch, capsys):
+    """Play a Rogue vs orc battle through input() after seeding random"""
+    char = character_manager.create_character("Interactive", "Rogue")
+    enemy = combat_system.create_enemy("orc")
+    actions = iter(ACTIONS)
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(actions))
+
+    random.seed(seed)
+    result = combat_system.SimpleBattle(char, enemy).start_battle()
+    capsys.readouterr()
+    return result, char['health'], enemy['health']
+
+def play_headless(seed):
+    """Play the same battle through a scripted policy"""
+    char = character_manager.create_character("Headless", "Rogue")
+    enemy = combat_system.create_enemy("orc")
+
+    result = combat_system.run_headless_battle(char, enemy, ACTIONS, seed=seed)
+    return result, char['health'], enemy['health']
+
+# ============================================================================
+# HEADLESS BATTLE TESTS
+# ============================================================================
+
+def test_headless_matches_interactive(monkeypatch, capsys):
+    """Test that headless battles give identical results for the same seed"""
+    for seed in range(25):
+        assert play_headless(seed) == play_interactive(seed, monkeypatch, capsys)
+
+def test_headless_battle_prints_nothing(capsys):
+    """Test that a headless battle produces no output"""
+    play_headless(1)
+
+    assert capsys.readouterr().out == ""
+
+def test_event_sink_receives_battle_events():
+    """Test that battle events are routed to the event sink"""
+    char = character_manager.create_character("Events", "Warrior")
+    enemy = combat_system.create_enemy("goblin")
+    events = []
+
+    result = combat_system.run_headless_battle(
+        char, enemy, ["attack"], seed=0, event_sink=events.append
+    )
+
+    assert events[0]["value"] == "Battle begins!"
+    assert events[-1] == {
+        "type": "end",
+        "turn": events[-1]["turn"],
+        "value": result["winner"],
+        "player_health": char['health'],
+        "enemy_health": enemy['health']
+    }
+
+def test_successful_escape_ends_battle():
+    """Test that escaping returns an 'escaped' result"""
+    char = character_manager.create_character("Runner", "Mage")
+    enemy = combat_system.create_enemy("dragon")
+
+    policy = combat_system.ScriptedPolicy([], default="run")
+    result = combat_system.run_headless_battle(char, enemy, policy, seed=3)
+
+    # random.Random(3).random() is below 0.5, so the first attempt succeeds
+    assert result == {"winner": "escaped", "xp_gained": 0, "gold_gained": 0}
+
+def test_character_records_fight_like_dicts():
+    """Test that the attribute fast path matches dict characters"""
+    record = character_manager.create_character("Fast", "Warrior")
+    plain = dict(record)
+    version = record.version
+
+    for char in (record, plain):
+        enemy = combat_system.create_enemy("dragon")
+        result = combat_system.run_headless_battle(char, enemy, ["attack"] * 50, seed=5)
+        assert result["winner"] == "enemy"
+
+    assert record["health"] == plain["health"] == 0
+    assert record.version != version
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
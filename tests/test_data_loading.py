@@ -0,0 +1,553 @@
+"""
+Test Data Loading
+Tests streaming loaders and catalog helpers in game_data
+"""
+
+import pytest
+import sys
+import os
+import struct
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import game_data
+
+QUEST_BLOCK = (
+    "QUEST_ID: {qid}\n"
+    "TITLE: Quest {qid}\n"
+    "DESCRIPTION: A test quest\n"
+    "REWARD_XP: 10\n"
+    "REWARD_GOLD: 5\n"
+    "REQUIRED_LEVEL: 1\n"
+    "PREREQUISITE: NONE\n"
+)
+
+def write_quests(path, quest_ids):
+    """Write a quest file with one block per id"""
+    path.write_text("\n".join(QUEST_BLOCK.format(qid=qid) for qid in quest_ids))
+    return str(path)
+
+# ============================================================================
+# STREAMING LOADER TESTS
+# ============================================================================
+
+def test_iter_quests_is_lazy(tmp_path):
+    """Test that iter_quests yields records one at a time"""
+    filename = write_quests(tmp_path / "quests.txt", ["a", "b", "c"])
+
+    quests = game_data.iter_quests(filename)
+    assert next(quests)["quest_id"] == "a"
+    assert [q["quest_id"] for q in quests] == ["b", "c"]
+
+def test_load_quests_matches_stream(tmp_path):
+    """Test that load_quests builds the same dict as the stream"""
+    filename = write_quests(tmp_path / "quests.txt", ["a", "b"])
+
+    loaded = game_data.load_quests(filename)
+    assert loaded == {q["quest_id"]: q for q in game_data.iter_quests(filename)}
+
+def test_extra_blank_lines_are_ignored(tmp_path):
+    """Test that runs of blank lines still separate blocks cleanly"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_BLOCK.format(qid="a") + "\n\n\n\n" + QUEST_BLOCK.format(qid="b"))
+
+    assert list(game_data.load_quests(str(path))) == ["a", "b"]
+
+def test_whitespace_only_lines_separate_blocks(tmp_path):
+    """Test that a line of spaces ends a block, unlike the old split on blank lines"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_BLOCK.format(qid="a") + "   \t\n" + QUEST_BLOCK.format(qid="b"))
+
+    assert list(game_data.load_quests(str(path))) == ["a", "b"]
+
+def test_bad_number_reports_its_own_line(tmp_path):
+    """Test that a non-integer value is reported at its line, not the block's"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_BLOCK.format(qid="a") + "\n"
+                    + QUEST_BLOCK.format(qid="b").replace("LEVEL: 1", "LEVEL: one"))
+
+    with pytest.raises(InvalidDataFormatError, match="line 14: numeric"):
+        game_data.load_quests(str(path))
+
+def test_invalid_line_reports_line_number(tmp_path):
+    """Test that format errors include the line where they happened"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_BLOCK.format(qid="a") + "\nQUEST_ID: b\nTITLE without colon\n")
+
+    with pytest.raises(InvalidDataFormatError, match="line 10"):
+        game_data.load_quests(str(path))
+
+def test_empty_item_file_is_corrupted(tmp_path):
+    """Test that an empty file raises CorruptedDataError"""
+    path = tmp_path / "items.txt"
+    path.write_text("\n\n")
+
+    with pytest.raises(CorruptedDataError):
+        game_data.load_items(str(path))
+
+# ============================================================================
+# COMPILED CACHE TESTS
+# ============================================================================
+
+def test_cache_is_used_when_fresh(tmp_path, monkeypatch):
+    """Test that a fresh cache is returned without parsing the text file"""
+    filename = write_quests(tmp_path / "quests.txt", ["a", "b"])
+    first = game_data.load_quests(filename, use_cache=True)
+    assert os.path.exists(filename + game_data.CATALOG_CACHE_SUFFIX)
+
+    def fail(filename, label):
+        raise AssertionError("text file should not be parsed")
+
+    monkeypatch.setattr(game_data, "_iter_blocks", fail)
+    assert game_data.load_quests(filename, use_cache=True) == first
+
+def test_cache_is_rebuilt_when_source_changes(tmp_path):
+    """Test that editing the data file invalidates the cache"""
+    filename = write_quests(tmp_path / "quests.txt", ["a"])
+    game_data.load_quests(filename, use_cache=True)
+
+    write_quests(tmp_path / "quests.txt", ["a", "b", "c"])
+    assert list(game_data.load_quests(filename, use_cache=True)) == ["a", "b", "c"]
+
+def test_corrupt_cache_falls_back_to_text(tmp_path):
+    """Test that a truncated cache is ignored instead of raising"""
+    filename = write_quests(tmp_path / "quests.txt", ["a", "b"])
+    game_data.load_quests(filename, use_cache=True)
+
+    cache_path = filename + game_data.CATALOG_CACHE_SUFFIX
+    with open(cache_path, "r+b") as f:
+        f.truncate(os.path.getsize(cache_path) // 2)
+
+    assert list(game_data.load_quests(filename, use_cache=True)) == ["a", "b"]
+
+# ============================================================================
+# CLASS AND ENEMY TABLE TESTS
+# ============================================================================
+
+def test_shipped_tables_match_defaults(tmp_path):
+    """Test that data/classes.txt and data/enemies.txt hold the defaults"""
+    (tmp_path / "classes.txt").write_text(game_data.DEFAULT_CLASSES)
+    (tmp_path / "enemies.txt").write_text(game_data.DEFAULT_ENEMIES)
+
+    assert game_data.load_classes() == game_data.load_classes(str(tmp_path / "classes.txt"))
+    assert game_data.load_enemies() == game_data.load_enemies(str(tmp_path / "enemies.txt"))
+    assert game_data.load_enemies()["dragon"] == {
+        "name": "Dragon", "health": 200, "max_health": 200, "strength": 25,
+        "magic": 15, "xp_reward": 200, "gold_reward": 100
+    }
+
+def test_default_tables_are_written_where_they_are_read(tmp_path, monkeypatch):
+    """Test that create_default_data_files writes the module's table paths"""
+    data = tmp_path / "game" / "data"
+    monkeypatch.setattr(game_data, "DATA_DIRECTORY", str(data))
+    monkeypatch.setattr(game_data, "CLASSES_FILE", str(data / "classes.txt"))
+    monkeypatch.setattr(game_data, "ENEMIES_FILE", str(data / "enemies.txt"))
+    monkeypatch.chdir(tmp_path)
+
+    game_data.create_default_data_files()
+    assert game_data.load_classes(game_data.CLASSES_FILE) == game_data.load_classes()
+    assert (data / "enemies.txt").read_text() == game_data.DEFAULT_ENEMIES
+    assert not (tmp_path / "data" / "classes.txt").exists()
+    assert (tmp_path / "data" / "quests.txt").exists()
+
+def test_prototypes_are_read_only():
+    """Test that prototype tables cannot be changed and spawn copies"""
+    import combat_system
+
+    enemies = game_data.get_enemy_prototypes()
+    assert game_data.get_enemy_prototypes() is enemies
+    with pytest.raises(TypeError):
+        enemies["goblin"]["health"] = 1
+    with pytest.raises(TypeError):
+        game_data.get_class_prototypes()["Mage"] = {}
+
+    goblin = combat_system.create_enemy("Goblin")
+    goblin["health"] -= 10
+    assert combat_system.create_enemy("goblin")["health"] == 50
+
+@pytest.mark.parametrize("loader, text, line", [
+    ("load_classes", "CLASS: Knight\nHEALTH: 100\nSTRENGTH: 9\n", 1),
+    ("load_classes", "CLASS: Knight\nHEALTH: lots\nSTRENGTH: 9\nMAGIC: 1\n", 2),
+    ("load_classes", "CLASS: Knight\nHEALTH: 9\nMAGIC: 1\nHEALTH: 9\n", 4),
+    ("load_classes", "CLASS: Knight\nHEALTH: 0\nSTRENGTH: 9\nMAGIC: 1\n", 1),
+    ("load_enemies", game_data.DEFAULT_ENEMIES + "\nENEMY_ID: Orc\nNAME: Orc\n"
+     "HEALTH: 1\nSTRENGTH: 1\nMAGIC: 1\nXP_REWARD: 1\nGOLD_REWARD: 1\n", 25),
+    ("load_enemies", "ENEMY_ID: imp\nNAME: Imp\nHEALTH 5\n", 3)
+])
+def test_invalid_table_entries(tmp_path, loader, text, line):
+    """Test that bad class/enemy entries raise InvalidDataFormatError"""
+    path = tmp_path / "table.txt"
+    path.write_text(text)
+
+    with pytest.raises(InvalidDataFormatError, match=f"line {line}"):
+        getattr(game_data, loader)(str(path))
+
+# ============================================================================
+# PARALLEL LOADING TESTS
+# ============================================================================
+
+def load_both(path, loader="quests"):
+    """Load a file sequentially and in parallel with tiny chunks"""
+    results = []
+    for load in [getattr(game_data, f"load_{loader}"),
+                 lambda f: getattr(game_data, f"load_{loader}_parallel")(
+                     f, workers=2, chunk_size=64)]:
+        try:
+            results.append(load(str(path)))
+        except Exception as e:
+            results.append((type(e), str(e)))
+    return results
+
+def test_parallel_load_matches_sequential(tmp_path):
+    """Test that chunked parsing returns the same catalog in file order"""
+    path = tmp_path / "quests.txt"
+    blocks = [QUEST_BLOCK.format(qid=f"q{i}") for i in range(40)]
+    path.write_text("\n\n\n".join(blocks) + "\n\n")
+
+    sequential, parallel = load_both(path)
+    assert list(parallel) == [f"q{i}" for i in range(40)]
+    assert parallel == sequential
+
+    items = tmp_path / "items.txt"
+    items.write_text(
+        "\n".join(f"ITEM_ID: i{i}\nNAME: Item\nTYPE: weapon\nEFFECT: strength:1\n"
+                  f"COST: {i}\nDESCRIPTION: x\n" for i in range(30)),
+        newline="\r\n"
+    )
+    sequential, parallel = load_both(items, "items")
+    assert parallel == sequential and len(parallel) == 30
+
+SEVEN_QUESTS = "".join(QUEST_BLOCK.format(qid=qid) + "\n" for qid in "abcdefg")
+
+@pytest.mark.parametrize("text, match", [
+    (SEVEN_QUESTS + QUEST_BLOCK.format(qid="a"), "line 57: duplicate quest a"),
+    (SEVEN_QUESTS + "QUEST_ID: h\nTITLE\n", "line 58"),
+    (SEVEN_QUESTS + QUEST_BLOCK.format(qid="h").replace("10", "ten"), "line 60: numeric"),
+    ("\n\n\n", "empty or corrupted")
+])
+def test_parallel_errors_match_sequential(tmp_path, text, match):
+    """Test that errors in later chunks keep their original line numbers"""
+    path = tmp_path / "quests.txt"
+    path.write_text(text)
+
+    sequential, parallel = load_both(path)
+    assert parallel == sequential
+    assert match in parallel[1]
+
+def test_parallel_load_reports_bad_bytes(tmp_path):
+    """Test that undecodable bytes raise CorruptedDataError"""
+    filename = write_quests(tmp_path / "quests.txt", ["a", "b", "c"])
+    with open(filename, "ab") as f:
+        f.write(b"\n\xff\xfe\n")
+
+    with pytest.raises(CorruptedDataError, match="near line 25"):
+        game_data.load_quests_parallel(filename, workers=2, chunk_size=64)
+
+def test_parallel_load_reports_unreadable_chunks(tmp_path, monkeypatch):
+    """Test that a chunk the workers cannot read raises CorruptedDataError"""
+    filename = write_quests(tmp_path / "quests.txt", ["a", "b", "c"])
+    chunks = game_data._chunk_ranges(filename, 64)
+
+    def remove_after_split(name, chunk_size):
+        os.remove(name)
+        return chunks
+
+    monkeypatch.setattr(game_data, "_chunk_ranges", remove_after_split)
+    with pytest.raises(CorruptedDataError, match="near line 1"):
+        game_data.load_quests_parallel(filename, workers=2, chunk_size=64)
+
+# ============================================================================
+# LAZY CATALOG TESTS
+# ============================================================================
+
+def write_quest_chain(path, count):
+    """Write quests q0..q(count-1) where each requires the one before"""
+    blocks = []
+    for i in range(count):
+        prereq = f"q{i - 1}" if i else "NONE"
+        blocks.append(QUEST_BLOCK.format(qid=f"q{i}").replace("NONE", prereq))
+    path.write_text("\n".join(blocks), newline="\r\n")
+    return str(path)
+
+def test_lazy_catalog_matches_load_quests(tmp_path):
+    """Test that a LazyCatalog holds the same quests in the same order"""
+    filename = write_quest_chain(tmp_path / "quests.txt", 30)
+    catalog = game_data.load_quests(filename, lazy=True)
+
+    assert isinstance(catalog, game_data.LazyCatalog)
+    assert len(catalog) == 30 and "q29" in catalog and "q30" not in catalog
+    assert catalog.cached_count() == 0
+    assert list(catalog.items()) == list(game_data.load_quests(filename).items())
+
+def test_lazy_catalog_cache_is_bounded(tmp_path):
+    """Test that only recently used records stay parsed"""
+    filename = write_quest_chain(tmp_path / "quests.txt", 30)
+    catalog = game_data.LazyCatalog(filename, "quest", cache_size=3)
+
+    first = catalog["q5"]
+    assert catalog["q5"] is first
+    for qid in ["q1", "q2", "q3"]:
+        catalog[qid]
+    assert catalog.cached_count() == 3
+    assert catalog["q5"] == first and catalog["q5"] is not first
+
+    with pytest.raises(KeyError):
+        catalog["missing"]
+    assert catalog.get("missing") is None
+
+def test_lazy_catalog_works_with_game_modules(tmp_path):
+    """Test quest and item functions with lazy catalogs"""
+    import character_manager
+    import inventory_system
+    import quest_handler
+
+    quests = game_data.LazyCatalog(write_quest_chain(tmp_path / "quests.txt", 5))
+    char = character_manager.create_character("Lazy", "Mage")
+
+    available = quest_handler.get_available_quests(char, quests)
+    assert [quest["quest_id"] for quest in available] == ["q0"]
+    quest_handler.accept_quest(char, "q0", quests)
+    quest_handler.complete_quest(char, "q0", quests)
+    assert quest_handler.get_quest_prerequisite_chain("q3", quests) == ["q0", "q1", "q2", "q3"]
+
+    items_path = tmp_path / "items.txt"
+    items_path.write_text(
+        "ITEM_ID: potion\nNAME: Potion\nTYPE: consumable\nEFFECT: health:20\n"
+        "COST: 5\nDESCRIPTION: Heals\n"
+    )
+    items = game_data.load_items(str(items_path), lazy=True)
+    inventory_system.add_item_to_inventory(char, "potion")
+    char['health'] = 10
+    inventory_system.use_item(char, "potion", items["potion"])
+    assert char['health'] == 30
+
+def test_lazy_catalog_errors(tmp_path):
+    """Test that bad records fail on first use, duplicates on open"""
+    path = tmp_path / "quests.txt"
+    path.write_text(SEVEN_QUESTS + QUEST_BLOCK.format(qid="h").replace("10", "ten"))
+    catalog = game_data.LazyCatalog(str(path))
+
+    assert catalog["g"]["quest_id"] == "g"
+    with pytest.raises(InvalidDataFormatError, match="line 60: numeric"):
+        catalog["h"]
+
+    path.write_text(SEVEN_QUESTS + QUEST_BLOCK.format(qid="a"))
+    with pytest.raises(InvalidDataFormatError, match="line 57: duplicate quest a"):
+        game_data.LazyCatalog(str(path))
+
+    path.write_text(SEVEN_QUESTS + "TITLE: No id\n")
+    with pytest.raises(InvalidDataFormatError, match="line 57: Missing quest field"):
+        game_data.LazyCatalog(str(path))
+
+# ============================================================================
+# MAPPED CATALOG TESTS
+# ============================================================================
+
+def test_mapped_catalog_matches_load_quests(tmp_path):
+    """Test that a compiled catalog decodes to the same records"""
+    import character_manager
+    import quest_handler
+
+    filename = write_quest_chain(tmp_path / "quests.txt", 50)
+    expected = game_data.load_quests(filename)
+
+    with game_data.open_mapped_catalog(filename) as catalog:
+        assert os.path.exists(filename + game_data.MAPPED_CATALOG_SUFFIX)
+        assert len(catalog) == 50
+        assert list(catalog) == list(expected)
+        assert all(catalog[qid] == quest for qid, quest in expected.items())
+        assert "q49" in catalog and "q50" not in catalog and 49 not in catalog
+        with pytest.raises(KeyError):
+            catalog["q50"]
+
+        char = character_manager.create_character("Mapped", "Rogue")
+        assert quest_handler.get_quest_prerequisite_chain("q2", catalog) == ["q0", "q1", "q2"]
+        assert quest_handler.get_available_quests(char, catalog) == [expected["q0"]]
+
+def test_mapped_catalog_items_and_unicode(tmp_path):
+    """Test item catalogs, non-ASCII text and extra fields"""
+    path = tmp_path / "items.txt"
+    path.write_text(
+        "ITEM_ID: café_sword\nNAME: Épée\nTYPE: weapon\nEFFECT: strength:5\n"
+        "COST: 9000000000\nDESCRIPTION: Sharp\nRARITY: rare\n\n"
+        "ITEM_ID: potion\nNAME: Potion\nTYPE: consumable\nEFFECT: health:20\n"
+        "COST: 5\nDESCRIPTION: Sharp\n",
+        encoding="utf-8"
+    )
+
+    with game_data.open_mapped_catalog(str(path), "item") as catalog:
+        assert dict(catalog.items()) == game_data.load_items(str(path))
+        assert catalog["café_sword"]["rarity"] == "rare"
+        assert "rarity" not in catalog["potion"]
+        assert catalog["potion"]["effect"] is game_data.parse_effect("health:20")
+
+def test_mapped_catalog_is_rebuilt(tmp_path):
+    """Test that stale or corrupt compiled files are rebuilt"""
+    filename = write_quest_chain(tmp_path / "quests.txt", 3)
+    game_data.open_mapped_catalog(filename).close()
+
+    write_quest_chain(tmp_path / "quests.txt", 4)
+    os.utime(filename, ns=(0, 0))
+    with game_data.open_mapped_catalog(filename) as catalog:
+        assert list(catalog) == ["q0", "q1", "q2", "q3"]
+
+    compiled = filename + game_data.MAPPED_CATALOG_SUFFIX
+    with open(compiled, "r+b") as f:
+        f.truncate(os.path.getsize(compiled) - 1)
+    with pytest.raises(CorruptedDataError):
+        game_data.MappedCatalog(compiled)
+    with game_data.open_mapped_catalog(filename) as catalog:
+        assert catalog["q3"]["prerequisite"] == "q2"
+
+@pytest.mark.parametrize("entry", [0xFFFFFFFF, 4, 1])
+def test_mapped_catalog_rejects_corrupt_table(tmp_path, entry):
+    """Test that bad or full hash table slots raise CorruptedDataError"""
+    filename = write_quest_chain(tmp_path / "quests.txt", 3)
+    game_data.open_mapped_catalog(filename).close()
+    compiled = filename + game_data.MAPPED_CATALOG_SUFFIX
+
+    with game_data.MappedCatalog(compiled) as catalog:
+        table, table_size = catalog._table, catalog._table_size
+    with open(compiled, "r+b") as f:
+        f.seek(table)
+        f.write(struct.pack(f"<{table_size}I", *[entry] * table_size))
+
+    with game_data.MappedCatalog(compiled) as catalog:
+        with pytest.raises(CorruptedDataError):
+            "missing" in catalog
+
+# ============================================================================
+# ITEM EFFECT TESTS
+# ============================================================================
+
+def test_parse_effect_with_several_modifiers():
+    """Test that effects are parsed once into shared, immutable objects"""
+    effect = game_data.parse_effect("strength:5, magic:-2")
+    assert effect == (("strength", 5), ("magic", -2))
+    assert str(effect) == "strength:5,magic:-2"
+    assert effect.describe() == "5 strength and -2 magic"
+    assert game_data.parse_effect("strength:5, magic:-2") is effect
+    with pytest.raises(AttributeError):
+        effect.extra = 1
+
+    for bad in ["strength", "strength:five", "strength:5,", ":5",
+                "strength:5,strength:1", None]:
+        with pytest.raises(InvalidDataFormatError):
+            game_data.parse_effect(bad)
+
+def test_load_items_parses_and_checks_effects(tmp_path):
+    """Test that load_items stores ItemEffects and rejects bad effects"""
+    path = tmp_path / "items.txt"
+    item = ("ITEM_ID: {iid}\nNAME: Item\nTYPE: weapon\nEFFECT: {effect}\n"
+            "COST: 5\nDESCRIPTION: Test\n")
+    path.write_text(item.format(iid="a", effect="strength:5,magic:2") + "\n"
+                    + item.format(iid="b", effect="strength:5,magic:2"))
+
+    items = game_data.load_items(str(path))
+    assert isinstance(items["a"]["effect"], game_data.ItemEffect)
+    assert items["a"]["effect"] is items["b"]["effect"]
+    assert game_data.load_items(str(path), lazy=True)["b"] == items["b"]
+
+    path.write_text(item.format(iid="a", effect="strength:5") + "\n"
+                    + item.format(iid="b", effect="strength:lots"))
+    with pytest.raises(InvalidDataFormatError, match="line 11"):
+        game_data.load_items(str(path))
+
+# ============================================================================
+# HOT RELOAD TESTS
+# ============================================================================
+
+def rewrite(path, text):
+    """Replace a data file and move its mtime forward"""
+    stat = os.stat(path)
+    path.write_text(text)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+
+def test_watcher_reparses_only_changed_blocks(tmp_path, monkeypatch):
+    """Test that unchanged records keep their identity across a reload"""
+    path = tmp_path / "quests.txt"
+    filename = write_quests(path, ["a", "b", "c"])
+    watcher = game_data.CatalogWatcher(filename)
+    before = watcher.catalog
+    seen = []
+    watcher.subscribe(lambda catalog, diff: seen.append((catalog, diff)))
+
+    assert watcher.poll() is None
+
+    parsed = []
+    parse = game_data.parse_quest_block
+    monkeypatch.setitem(game_data._CATALOG_FORMATS, "quest", (
+        lambda lines: parsed.append(lines[0]) or parse(lines),
+        game_data.validate_quest_data, "quest_id"
+    ))
+    blocks = [QUEST_BLOCK.format(qid=qid) for qid in ["a", "c", "d"]]
+    blocks[1] = blocks[1].replace("REWARD_XP: 10", "REWARD_XP: 99")
+    rewrite(path, "\n".join(blocks))
+
+    diff = watcher.poll()
+    assert diff == game_data.CatalogDiff(("d",), ("b",), ("c",))
+    assert parsed == ["QUEST_ID: c", "QUEST_ID: d"]
+    assert watcher.catalog is not before
+    assert watcher.catalog["a"] is before["a"]
+    assert watcher.catalog["c"]["reward_xp"] == 99
+    assert before["c"]["reward_xp"] == 10
+    assert seen == [(watcher.catalog, diff)]
+
+def test_watcher_keeps_catalog_on_bad_edit(tmp_path):
+    """Test that a broken file or failed validation keeps the old catalog"""
+    path = tmp_path / "quests.txt"
+    filename = write_quests(path, ["a", "b"])
+
+    def no_c(catalog):
+        if "c" in catalog:
+            raise InvalidDataFormatError("c is not allowed")
+
+    watcher = game_data.CatalogWatcher(filename, validate=no_c)
+    before = watcher.catalog
+
+    rewrite(path, QUEST_BLOCK.format(qid="a") + "\nQUEST_ID: b\nbroken\n")
+    with pytest.raises(InvalidDataFormatError, match="line 10"):
+        watcher.poll()
+    assert watcher.poll() is None
+    assert watcher.catalog is before
+
+    rewrite(path, "\n".join(QUEST_BLOCK.format(qid=qid) for qid in "abc"))
+    with pytest.raises(InvalidDataFormatError, match="not allowed"):
+        watcher.poll()
+    assert watcher.catalog is before
+
+    rewrite(path, QUEST_BLOCK.format(qid="b") + "\n" + QUEST_BLOCK.format(qid="a"))
+    assert watcher.poll() == game_data.CatalogDiff((), (), ())
+    assert list(watcher.catalog) == ["b", "a"]
+    assert watcher.catalog["a"] is before["a"]
+
+def test_watcher_starts_from_the_cache(tmp_path, monkeypatch):
+    """Test that a cached watcher skips parsing and still reloads by block"""
+    path = tmp_path / "quests.txt"
+    filename = write_quests(path, ["a", "b", "c"])
+    plain = game_data.load_quests(filename, use_cache=True)
+    game_data.CatalogWatcher(filename, use_cache=True)
+    assert game_data.load_quests(filename, use_cache=True) == plain
+
+    parsed = []
+    parse = game_data.parse_quest_block
+    monkeypatch.setitem(game_data._CATALOG_FORMATS, "quest", (
+        lambda lines: parsed.append(lines[0]) or parse(lines),
+        game_data.validate_quest_data, "quest_id"
+    ))
+    watcher = game_data.CatalogWatcher(filename, use_cache=True)
+    before = watcher.catalog
+    assert before == plain and parsed == []
+    assert watcher.poll() is None
+
+    blocks = [QUEST_BLOCK.format(qid=qid) for qid in "abc"]
+    blocks[1] = blocks[1].replace("REWARD_XP: 10", "REWARD_XP: 99")
+    rewrite(path, "\n".join(blocks))
+
+    assert watcher.poll() == game_data.CatalogDiff((), (), ("b",))
+    assert parsed == ["QUEST_ID: b"]
+    assert watcher.catalog["a"] is before["a"]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
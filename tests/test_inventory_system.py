@@ -0,0 +1,155 @@
+"""
+Test Inventory System
+Tests the Inventory multiset, bulk inventory operations and item effects
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import game_data
+import inventory_system
+from inventory_system import Inventory
+
+# ============================================================================
+# INVENTORY TYPE TESTS
+# ============================================================================
+
+def test_inventory_counts_and_removes():
+    """Test that Inventory tracks counts like a list would"""
+    inventory = Inventory(["potion", "sword", "potion"])
+
+    assert len(inventory) == 3
+    assert inventory.count("potion") == 2
+    assert "sword" in inventory
+
+    inventory.remove("potion")
+    inventory.remove("sword")
+    assert inventory == ["potion"]
+    assert "sword" not in inventory
+
+    with pytest.raises(ValueError):
+        inventory.remove("sword")
+
+def test_inventory_serializes_like_list():
+    """Test that Inventory prints and iterates like a list"""
+    inventory = Inventory(["potion", "potion", "sword"])
+
+    assert list(inventory) == ["potion", "potion", "sword"]
+    assert repr(inventory) == repr(["potion", "potion", "sword"])
+
+def test_small_and_counted_inventories_agree():
+    """Test that the short list and the per-item counts behave the same"""
+    import pickle
+
+    limit = inventory_system.INVENTORY_INDEX_SIZE
+    small = Inventory(["potion", "sword", "potion"])
+    large = Inventory(["potion", "sword", "potion"] + ["gem"] * limit)
+    assert type(small._held) is list and type(large._held) is dict
+    assert Inventory()._held == ()
+
+    for inventory in (small, large):
+        inventory.remove("potion")
+        inventory.append("shield")
+        inventory.append("potion")
+        held = [item_id for item_id in inventory if item_id != "gem"]
+        assert held == ["potion", "potion", "sword", "shield"]
+        assert pickle.loads(pickle.dumps(inventory)) == inventory
+
+    for item_id in list(small):
+        small.remove(item_id)
+    assert small._held == () and len(small) == 0
+
+def test_new_characters_use_inventory():
+    """Test that created characters get an Inventory"""
+    char = character_manager.create_character("InvTest", "Warrior")
+
+    assert isinstance(char["inventory"], Inventory)
+    assert character_manager.validate_character_data(char)
+
+# ============================================================================
+# BULK OPERATION TESTS
+# ============================================================================
+
+def test_bulk_add_and_remove(monkeypatch):
+    """Test adding and removing loot in batches"""
+    monkeypatch.setattr(inventory_system, "MAX_INVENTORY_SIZE", 1000)
+    char = character_manager.create_character("LootTest", "Rogue")
+
+    drops = ["coin"] * 400 + ["gem"] * 100
+    assert inventory_system.add_items_to_inventory(char, drops) == 500
+    assert inventory_system.count_item(char, "coin") == 400
+
+    assert inventory_system.remove_items_from_inventory(char, ["coin"] * 200) == 200
+    assert inventory_system.count_item(char, "coin") == 200
+    assert inventory_system.get_inventory_space_remaining(char) == 700
+
+def test_bulk_operations_are_all_or_nothing():
+    """Test that a failing batch leaves the inventory unchanged"""
+    char = {'inventory': ['potion'], 'gold': 100}
+
+    with pytest.raises(ItemNotFoundError):
+        inventory_system.remove_items_from_inventory(char, ['potion', 'potion'])
+    assert inventory_system.count_item(char, 'potion') == 1
+
+    with pytest.raises(InventoryFullError):
+        inventory_system.add_items_to_inventory(
+            char, ['gem'] * inventory_system.MAX_INVENTORY_SIZE
+        )
+    assert len(char['inventory']) == 1
+
+# ============================================================================
+# ITEM EFFECT TESTS
+# ============================================================================
+
+def test_multi_modifier_equipment():
+    """Test equipping and unequipping an item with several modifiers"""
+    char = character_manager.create_character("EffectTest", "Mage")
+    strength, magic = char['strength'], char['magic']
+    char['item_data'] = {
+        'staff': {'type': 'weapon', 'name': 'Staff',
+                  'effect': game_data.parse_effect("magic:6,strength:-1")},
+        'wand': {'type': 'weapon', 'name': 'Wand', 'effect': "magic:2"}
+    }
+    inventory_system.add_items_to_inventory(char, ['staff', 'wand'])
+
+    inventory_system.equip_weapon(char, 'staff', char['item_data']['staff'])
+    assert (char['strength'], char['magic']) == (strength - 1, magic + 6)
+
+    inventory_system.equip_weapon(char, 'wand', char['item_data']['wand'])
+    assert (char['strength'], char['magic']) == (strength, magic + 2)
+    assert inventory_system.unequip_weapon(char) == 'wand'
+    assert (char['strength'], char['magic']) == (strength, magic)
+
+def test_use_item_applies_every_modifier():
+    """Test consumables with several modifiers and malformed effects"""
+    char = {'inventory': ['tonic', 'bad'], 'health': 50, 'max_health': 60, 'magic': 1}
+    tonic = {'type': 'consumable', 'name': 'Tonic', 'effect': "health:20,magic:3"}
+
+    result = inventory_system.use_item(char, 'tonic', tonic)
+    assert result == "Used Tonic and gained 20 health and 3 magic."
+    assert (char['health'], char['magic']) == (60, 4)
+
+    with pytest.raises(InvalidItemTypeError):
+        inventory_system.use_item(char, 'bad', {'type': 'consumable', 'effect': 'health'})
+    assert char['inventory'] == ['bad']
+
+    for effect in [['health', 20], {'health': 20}, "max health:5", "1st:5"]:
+        with pytest.raises(InvalidItemTypeError):
+            inventory_system.use_item(char, 'bad', {'type': 'consumable', 'effect': effect})
+
+def test_max_health_is_raised_before_health():
+    """Test that an effect raising both lets health use the new maximum"""
+    char = {'inventory': ['elixir'], 'health': 60, 'max_health': 60}
+    elixir = {'type': 'consumable', 'name': 'Elixir',
+              'effect': "health:20,max_health:20"}
+
+    inventory_system.use_item(char, 'elixir', elixir)
+    assert (char['health'], char['max_health']) == (80, 80)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
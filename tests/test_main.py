@@ -0,0 +1,216 @@
+"""
+Test Main Module
+Tests the dirty-tracking autosave and data hot reload in main
+"""
+
+import pytest
+import sys
+import os
+import shutil
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import inventory_system
+import quest_handler
+import main
+
+class FakeWriter:
+    """Stand-in for the background save writer that records saved gold"""
+
+    def __init__(self, saved):
+        self.saved = saved
+
+    def submit(self, character):
+        self.saved.append(character['gold'])
+
+    def flush(self):
+        self.saved.append("flushed")
+
+@pytest.fixture
+def game(monkeypatch):
+    """Set up main with a fresh character and a fake saver"""
+    saved = []
+    monkeypatch.setattr(main.character_manager, "get_save_writer",
+                        lambda: FakeWriter(saved))
+    monkeypatch.setattr(main, "autosave_stats", {"saves_written": 0, "saves_skipped": 0})
+    monkeypatch.setattr(main, "autosave_state", dict.fromkeys(main.autosave_state))
+    monkeypatch.setattr(main, "current_character",
+                        character_manager.create_character("AutoTest", "Warrior"))
+    main.reset_autosave()
+    return saved
+
+# ============================================================================
+# CHANGE TRACKING TESTS
+# ============================================================================
+
+def test_character_version_changes_on_game_actions():
+    """Test that gameplay functions change the character's version"""
+    char = character_manager.create_character("VersionTest", "Rogue")
+    quests = {'q': {'quest_id': 'q', 'required_level': 1, 'prerequisite': 'NONE',
+                    'reward_xp': 5, 'reward_gold': 5}}
+    actions = [
+        lambda: character_manager.add_gold(char, 10),
+        lambda: character_manager.gain_experience(char, 10),
+        lambda: inventory_system.add_item_to_inventory(char, "potion"),
+        lambda: inventory_system.remove_item_from_inventory(char, "potion"),
+        lambda: quest_handler.accept_quest(char, 'q', quests),
+        lambda: quest_handler.complete_quest(char, 'q', quests)
+    ]
+
+    for action in actions:
+        before = character_manager.get_character_version(char)
+        action()
+        assert character_manager.get_character_version(char) != before
+
+    before = character_manager.get_character_version(char)
+    str(char['health'])
+    assert character_manager.get_character_version(char) == before
+
+# ============================================================================
+# AUTOSAVE TESTS
+# ============================================================================
+
+def test_unchanged_character_is_not_saved(game):
+    """Test that looking at stats does not rewrite the save"""
+    saved = game
+
+    for _ in range(5):
+        assert main.autosave() is False
+
+    assert saved == []
+    assert main.autosave_stats == {"saves_written": 0, "saves_skipped": 5}
+
+def test_each_change_is_saved_right_away(game):
+    """Test that the action that changes the character is saved at once"""
+    saved = game
+
+    character_manager.add_gold(main.current_character, 5)
+    assert main.autosave() is True
+    assert main.autosave() is False
+
+    character_manager.add_gold(main.current_character, 1)
+    assert main.autosave() is True
+    assert saved == [105, 106]
+
+def test_flush_waits_for_pending_changes(game):
+    """Test that leaving the game waits for the write"""
+    saved = game
+
+    character_manager.add_gold(main.current_character, 1)
+    assert main.autosave(flush=True) is True
+    assert saved == [101, "flushed"]
+    assert main.autosave_stats["saves_written"] == 1
+
+def test_new_game_reports_failed_first_save(game, monkeypatch, capsys):
+    """Test that new_game only says saved once the write succeeded"""
+    def broken_flush():
+        raise SaveFileCorruptedError("disk full")
+
+    answers = iter(["Newbie", "Warrior"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    monkeypatch.setattr(main, "game_loop", lambda: None)
+    writer = FakeWriter([])
+    writer.flush = broken_flush
+    monkeypatch.setattr(main.character_manager, "get_save_writer", lambda: writer)
+
+    main.new_game()
+    out = capsys.readouterr().out
+    assert "created and saved" not in out
+    assert "failed to save game: disk full" in out
+
+# ============================================================================
+# HOT RELOAD TESTS
+# ============================================================================
+
+@pytest.fixture
+def data_copy(tmp_path, monkeypatch):
+    """Run main on a copy of the data directory; returns items.txt's path"""
+    project = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    shutil.copytree(os.path.join(project, "data"), tmp_path / "data",
+                    ignore=shutil.ignore_patterns("save_games*", "*.cache", "*.mcat"))
+    monkeypatch.chdir(tmp_path)
+    for name in ["all_quests", "all_items", "shop_listing", "current_character"]:
+        monkeypatch.setattr(main, name, getattr(main, name))
+    monkeypatch.setattr(main, "data_watchers", [])
+    return tmp_path / "data" / "items.txt"
+
+def edit_file(path, text):
+    """Rewrite a file and move its mtime forward so the watcher notices"""
+    stat = os.stat(path)
+    path.write_text(text)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+
+def test_edited_items_reach_the_shop(data_copy, capsys):
+    """Test that editing items.txt updates all_items and the shop listing"""
+    assert main.load_game_data() is True
+    quests = main.all_quests
+    sword = main.all_items["iron_sword"]
+    assert main.reload_game_data() == 0
+
+    edit_file(data_copy, data_copy.read_text().replace("COST: 25", "COST: 30", 1)
+              + "\nITEM_ID: rope\nNAME: Rope\nTYPE: armor\n"
+              "EFFECT: max_health:1\nCOST: 3\nDESCRIPTION: Rope\n")
+
+    assert main.reload_game_data() == 1
+    assert "1 added, 0 removed, 1 changed" in capsys.readouterr().out
+    assert main.all_quests is quests
+    assert main.all_items["iron_sword"] is sword
+    assert main.all_items["health_potion"]["cost"] == 30
+
+    lines = dict(main.get_shop_listing().lines())
+    assert lines["health_potion"] == "Health Potion (id: health_potion) - Cost: 30"
+    assert lines["rope"] == "Rope (id: rope) - Cost: 3"
+    assert list(lines) == list(main.all_items)
+
+def test_unequip_after_reload_takes_back_the_old_bonus(data_copy):
+    """Test that a reload updates item_data and unequip reverses what was applied"""
+    main.load_game_data()
+    char = character_manager.create_character("Reloader", "Warrior")
+    char["item_data"] = main.all_items
+    main.current_character = char
+    base = dict(char)
+
+    for item_id in ["iron_sword", "leather_armor"]:
+        inventory_system.add_item_to_inventory(char, item_id)
+    inventory_system.equip_weapon(char, "iron_sword", main.all_items["iron_sword"])
+    inventory_system.equip_armor(char, "leather_armor", main.all_items["leather_armor"])
+    assert char["strength"] == base["strength"] + 5
+
+    edit_file(data_copy, data_copy.read_text()
+              .replace("EFFECT: strength:5", "EFFECT: strength:9")
+              .replace("EFFECT: max_health:10", "EFFECT: max_health:30"))
+    assert main.reload_game_data() == 1
+    assert char["item_data"] is main.all_items
+    assert str(char["item_data"]["iron_sword"]["effect"]) == "strength:9"
+
+    inventory_system.unequip_weapon(char)
+    inventory_system.unequip_armor(char)
+    assert char["strength"] == base["strength"]
+    assert char["max_health"] == base["max_health"]
+
+    inventory_system.equip_weapon(char, "iron_sword", char["item_data"]["iron_sword"])
+    assert char["strength"] == base["strength"] + 9
+    inventory_system.unequip_weapon(char)
+    assert char["strength"] == base["strength"]
+
+def test_item_reload_does_not_trigger_autosave(data_copy, game):
+    """Test that swapping in reloaded item_data is not a character change"""
+    main.load_game_data()
+    char = main.current_character
+    char["item_data"] = main.all_items
+    main.autosave()
+    version = character_manager.get_character_version(char)
+
+    edit_file(data_copy, data_copy.read_text().replace("COST: 25", "COST: 30", 1))
+    assert main.reload_game_data() == 1
+    assert char["item_data"] is main.all_items
+    assert character_manager.get_character_version(char) == version
+    assert main.autosave() is False
+
+    with pytest.raises(KeyError):
+        char.set_unsaved("gold", 0)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
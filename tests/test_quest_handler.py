@@ -0,0 +1,331 @@
+"""
+Test Quest Handler
+Tests the quest availability index against a brute-force scan
+"""
+
+import pytest
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import quest_handler
+
+def make_quests(count, seed=0):
+    """Build a random catalog where each quest may require an earlier one"""
+    rng = random.Random(seed)
+    quests = {}
+    for i in range(count):
+        prereq = f"q{rng.randrange(i)}" if i and rng.random() < 0.7 else "NONE"
+        quests[f"q{i}"] = {
+            'quest_id': f"q{i}",
+            'title': f"Quest {i}",
+            'description': 'Generated',
+            'reward_xp': 10,
+            'reward_gold': 5,
+            'required_level': rng.randint(1, 5),
+            'prerequisite': prereq
+        }
+    return quests
+
+def brute_force_available(char, quests):
+    """The original scan over every quest"""
+    return [
+        quest for qid, quest in quests.items()
+        if qid not in char['completed_quests']
+        and qid not in char['active_quests']
+        and char['level'] >= quest['required_level']
+        and (quest['prerequisite'] == "NONE"
+             or quest['prerequisite'] in char['completed_quests'])
+    ]
+
+# ============================================================================
+# QUEST SET TESTS
+# ============================================================================
+
+def test_quest_set_keeps_insertion_order():
+    """Test that QuestSet iterates in the order quests were added"""
+    quests = quest_handler.QuestSet(["c", "a"])
+    quests.append("b")
+    quests.append("a")
+    quests.remove("c")
+
+    assert list(quests) == ["a", "b", "a"]
+    assert quests == ["a", "b", "a"]
+    assert repr(quests) == repr(["a", "b", "a"])
+    assert "a" in quests and "c" not in quests
+    assert quests.count("a") == 2
+
+    quests.remove("a")
+    assert quests == ["b", "a"] and "a" in quests
+
+    with pytest.raises(ValueError):
+        quests.remove("c")
+
+def test_quest_set_removes_without_shifting():
+    """Test that removal leaves a hole and compacts once half are holes"""
+    quests = quest_handler.QuestSet(f"q{i}" for i in range(20))
+    quests.extend(["q3", "q3"])
+
+    quests.remove("q0")
+    assert quests._ids[0] is None and quests._positions["q1"] == 1
+    quests.remove("q3")
+    assert list(quests._positions["q3"]) == [20, 21]
+    assert quests.count("q3") == 2 and len(quests) == 20
+
+    for i in [1, 2, 4, 5, 6, 7, 8, 9, 10]:
+        quests.remove(f"q{i}")
+    assert len(quests._ids) == 22 and quests._removed == 11
+
+    quests.remove("q11")
+    expected = [f"q{i}" for i in range(12, 20)] + ["q3", "q3"]
+    assert quests._ids == expected and quests._removed == 0
+    assert list(quests._positions["q3"]) == [8, 9]
+    assert quests == expected
+
+def test_small_quest_sets_are_plain_lists():
+    """Test that short quest lists skip the position index"""
+    quests = quest_handler.QuestSet()
+    assert quests._ids == () and quests._positions is None
+
+    limit = quest_handler.QUEST_SET_INDEX_SIZE
+    quests.extend(f"q{i}" for i in range(limit))
+    quests.remove("q0")
+    assert quests._positions is None and "q0" not in quests and "q1" in quests
+
+    quests.extend(["q1", "q9"])
+    assert quests._positions is not None and quests.count("q1") == 2
+    for quest_id in list(quests):
+        quests.remove(quest_id)
+    assert quests._ids == () and quests._positions is None and quests.changes == 12
+
+def test_characters_track_quests_in_sets(tmp_path):
+    """Test that quest progress uses QuestSet and saves in order"""
+    quests = make_quests(30, seed=4)
+    char = character_manager.create_character("SetTest", "Cleric")
+    char['level'] = 5
+    assert isinstance(char['completed_quests'], quest_handler.QuestSet)
+
+    done = []
+    for quest in quest_handler.get_available_quests(char, quests)[:5]:
+        quest_handler.accept_quest(char, quest['quest_id'], quests)
+        quest_handler.complete_quest(char, quest['quest_id'], quests)
+        done.append(quest['quest_id'])
+
+    assert list(char['completed_quests']) == done
+    assert not char['active_quests']
+
+    character_manager.save_character(char, str(tmp_path))
+    saved = (tmp_path / "SetTest_save.txt").read_text()
+    assert f"COMPLETED_QUESTS: {','.join(done)}" in saved
+
+def test_repeated_completions_are_kept(tmp_path):
+    """Test that a quest completed twice counts twice and saves twice"""
+    quests = make_quests(5, seed=2)
+    qid = next(q for q in quests if quests[q]['prerequisite'] == 'NONE')
+    char = character_manager.create_character("RepeatTest", "Warrior")
+
+    char['active_quests'].extend([qid, qid])
+    quest_handler.complete_quest(char, qid, quests)
+    quest_handler.complete_quest(char, qid, quests)
+
+    assert char['completed_quests'] == [qid, qid]
+    assert char['completed_quests'].count(qid) == 2
+    rewards = quest_handler.get_total_quest_rewards_earned(char, quests)
+    assert rewards['total_xp'] == 2 * quests[qid]['reward_xp']
+
+    character_manager.save_character(char, str(tmp_path))
+    loaded = character_manager.load_character("RepeatTest", str(tmp_path))
+    assert loaded['completed_quests'] == [qid, qid]
+
+# ============================================================================
+# QUEST INDEX TESTS
+# ============================================================================
+
+def test_index_matches_brute_force_while_playing():
+    """Test that availability stays correct through accepts and completions"""
+    quests = make_quests(200)
+    char = character_manager.create_character("IndexTest", "Warrior")
+    rng = random.Random(1)
+
+    for step in range(150):
+        available = quest_handler.get_available_quests(char, quests)
+        assert available == brute_force_available(char, quests)
+        if not available:
+            char['level'] += 1
+            continue
+
+        qid = rng.choice(available)['quest_id']
+        quest_handler.accept_quest(char, qid, quests)
+        if rng.random() < 0.8:
+            quest_handler.complete_quest(char, qid, quests)
+        if step % 20 == 0:
+            char['level'] += 1
+
+def test_index_notices_direct_list_changes():
+    """Test that editing completed_quests directly still works"""
+    quests = make_quests(50, seed=3)
+    char = character_manager.create_character("DirectTest", "Mage")
+    char['level'] = 5
+
+    quest_handler.get_available_quests(char, quests)
+    char['completed_quests'].append(quest_handler.get_available_quests(char, quests)[0]['quest_id'])
+
+    assert quest_handler.get_available_quests(char, quests) == brute_force_available(char, quests)
+
+def test_index_notices_replaced_lists_and_drops_dead_characters():
+    """Test same-length replacements and that tracking does not leak"""
+    import gc
+
+    quests = make_quests(50, seed=4)
+    index = quest_handler.get_quest_index(quests)
+    char = character_manager.create_character("SwapTest", "Cleric")
+    char['level'] = 5
+
+    first = quest_handler.get_available_quests(char, quests)[0]['quest_id']
+    char['completed_quests'] = [first]
+    quest_handler.get_available_quests(char, quests)
+    second = [q for q in quests if quests[q]['prerequisite'] == 'NONE' and q != first][0]
+    char['completed_quests'] = [second]
+    assert quest_handler.get_available_quests(char, quests) == brute_force_available(char, quests)
+
+    plain = dict(char)
+    quest_handler.get_available_quests(plain, quests)
+    plain['completed_quests'] = [first]
+    assert quest_handler.get_available_quests(plain, quests) == brute_force_available(plain, quests)
+
+    assert len(index._tracked) == 1
+    del char
+    gc.collect()
+    assert len(index._tracked) == 0
+
+def test_completion_after_outside_change_rebuilds_index():
+    """Test that quest_completed does not mark a stale entry as fresh"""
+    quests = {
+        qid: {'quest_id': qid, 'title': qid, 'description': 'x', 'reward_xp': 1,
+              'reward_gold': 1, 'required_level': 1, 'prerequisite': prereq}
+        for qid, prereq in [('a', 'NONE'), ('b', 'NONE'), ('c', 'a')]
+    }
+    char = character_manager.create_character("StaleTest", "Warrior")
+    assert [q['quest_id'] for q in quest_handler.get_available_quests(char, quests)] == ['a', 'b']
+
+    char['completed_quests'].append('a')
+    quest_handler.accept_quest(char, 'b', quests)
+    quest_handler.complete_quest(char, 'b', quests)
+
+    assert [q['quest_id'] for q in quest_handler.get_available_quests(char, quests)] == ['c']
+    assert quest_handler.get_available_quests(char, quests) == brute_force_available(char, quests)
+
+def test_index_is_rebuilt_for_new_catalog():
+    """Test that a different catalog gets its own index"""
+    first = make_quests(10, seed=1)
+    second = make_quests(10, seed=2)
+
+    assert quest_handler.get_quest_index(first) is quest_handler.get_quest_index(first)
+    assert quest_handler.get_quest_index(second).quest_data_dict is second
+
+def test_index_follows_catalog_reloads():
+    """Test that a diffed index matches a rebuilt one after reloads"""
+    import game_data
+
+    quests = make_quests(200, seed=6)
+    template = quests["q0"]
+    char = character_manager.create_character("ReloadTest", "Rogue")
+    char['level'] = 3
+    rng = random.Random(6)
+    for quest in quest_handler.get_available_quests(char, quests)[:10]:
+        quest_handler.accept_quest(char, quest['quest_id'], quests)
+        quest_handler.complete_quest(char, quest['quest_id'], quests)
+
+    for reload in range(10):
+        index = quest_handler.get_quest_index(quests)
+        reloaded = dict(quests)
+        for qid in rng.sample(sorted(reloaded), 10):
+            del reloaded[qid]
+        for qid in rng.sample(sorted(reloaded), 10):
+            quest = dict(reloaded[qid], required_level=rng.randint(1, 5))
+            if rng.random() < 0.5:
+                quest['prerequisite'] = rng.choice(["NONE"] + list(char['completed_quests']))
+            reloaded[qid] = quest
+        for i in range(5):
+            reloaded[f"new{reload}_{i}"] = dict(
+                template, quest_id=f"new{reload}_{i}",
+                prerequisite=rng.choice(["NONE", "q1", "q2"])
+            )
+
+        diff = game_data.CatalogDiff(
+            tuple(qid for qid in reloaded if qid not in quests),
+            tuple(qid for qid in quests if qid not in reloaded),
+            tuple(qid for qid in reloaded
+                  if qid in quests and reloaded[qid] is not quests[qid])
+        )
+        quest_handler.apply_quest_catalog_diff(quests, reloaded, diff)
+        quests = reloaded
+
+        assert quest_handler.get_quest_index(quests) is index
+        expected = brute_force_available(char, quests)
+        assert quest_handler.get_available_quests(char, quests) == expected
+        assert quest_handler.QuestIndex(quests).get_available_quests(char) == expected
+
+# ============================================================================
+# QUEST GRAPH TESTS
+# ============================================================================
+
+def brute_force_chain(quest_id, quests):
+    """Follow prerequisite links one hop at a time"""
+    chain = [quest_id]
+    while quests[chain[-1]]['prerequisite'] != "NONE":
+        chain.append(quests[chain[-1]]['prerequisite'])
+    return chain[::-1]
+
+def test_chains_match_brute_force():
+    """Test memoized chains against walking the links"""
+    quests = make_quests(300, seed=5)
+
+    for qid in reversed(list(quests)):
+        assert quest_handler.get_quest_prerequisite_chain(qid, quests) == brute_force_chain(qid, quests)
+
+def test_graph_order_and_depth():
+    """Test that prerequisites come first and depth counts ancestors"""
+    quests = make_quests(300, seed=6)
+    graph = quest_handler.get_quest_graph(quests)
+
+    position = {qid: i for i, qid in enumerate(graph.topological_order)}
+    assert sorted(position) == sorted(quests)
+    for qid, quest in quests.items():
+        assert graph.depth[qid] == len(brute_force_chain(qid, quests)) - 1
+        if quest['prerequisite'] != "NONE":
+            assert position[quest['prerequisite']] < position[qid]
+
+def test_prerequisite_cycle_is_rejected():
+    """Test that a cycle raises with the offending path"""
+    quests = make_quests(5, seed=1)
+    quests['a'] = {'quest_id': 'a', 'required_level': 1, 'prerequisite': 'c'}
+    quests['b'] = {'quest_id': 'b', 'required_level': 1, 'prerequisite': 'a'}
+    quests['c'] = {'quest_id': 'c', 'required_level': 1, 'prerequisite': 'b'}
+
+    with pytest.raises(InvalidDataFormatError, match="a -> c -> b -> a"):
+        quest_handler.validate_quest_prerequisites(quests)
+    with pytest.raises(InvalidDataFormatError):
+        quest_handler.get_quest_prerequisite_chain('a', quests)
+
+def test_missing_prerequisite_in_chain():
+    """Test that a dangling prerequisite still raises QuestNotFoundError"""
+    quests = {'a': {'quest_id': 'a', 'required_level': 1, 'prerequisite': 'ghost'}}
+
+    with pytest.raises(QuestNotFoundError):
+        quest_handler.get_quest_prerequisite_chain('a', quests)
+
+def test_graph_is_rebuilt_after_invalidate():
+    """Test that invalidating drops the compiled graph"""
+    quests = make_quests(10)
+    graph = quest_handler.get_quest_graph(quests)
+
+    quest_handler.invalidate_quest_caches()
+    assert quest_handler.get_quest_graph(quests) is not graph
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])